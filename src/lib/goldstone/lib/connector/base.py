@@ -17,6 +17,12 @@ class Node(object):
     def type(self):
         return str(self.node.type())
 
+    def basetype(self):
+        return self.node.type().basename()
+
+    def keyword(self):
+        return self.node.keyword()
+
     def enums(self):
         return [e.name() for e in self.node.type().all_enums()]
 
@@ -82,6 +88,10 @@ class Connector(object):
         fname = sys._getframe().f_code.co_name
         raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
 
+    def edit_batch(self, data, model):
+        fname = sys._getframe().f_code.co_name
+        raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
+
     def delete(self, xpath):
         fname = sys._getframe().f_code.co_name
         raise UnsupportedError(f"{fname}() not supported by {self.type} connector")
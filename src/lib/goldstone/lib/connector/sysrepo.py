@@ -103,6 +103,11 @@ class Session(BaseSession):
         else:
             return self.session.set_item(xpath, value)
 
+    @wrap_sysrepo_error
+    def edit_batch(self, data, model):
+        # unknown nodes must fail instead of being skipped silently
+        return self.session.edit_batch(data, model, strict=True)
+
     @wrap_sysrepo_error
     def copy_config(self, datastore, model):
         return self.session.copy_config(datastore, model)
@@ -191,6 +196,9 @@ class Connector(BaseConnector):
     def set(self, xpath, value):
         return self.running_session.set(xpath, value)
 
+    def edit_batch(self, data, model):
+        return self.running_session.edit_batch(data, model)
+
     def delete(self, xpath):
         return self.running_session.delete(xpath)
 
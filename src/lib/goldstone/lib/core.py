@@ -1,7 +1,7 @@
-import libyang
 import logging
 import asyncio
 import os
+import re
 import time
 
 from .server_connector import create_server_connector
@@ -12,6 +12,24 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_REVERT_TIMEOUT = int(os.getenv("GOLDSTONE_DEFAULT_REVERT_TIMEOUT", 6))
 
+# the maximum number of cached operational data responses of a server
+OPER_CACHE_SIZE = 1024
+# interval in seconds to log statistics of the operational data cache
+OPER_CACHE_STATS_INTERVAL = 60
+OPER_CACHE_STATS = [
+    "hits",
+    "misses",
+    "invalidations",
+    "coalesced",
+    "hit-time",
+    "miss-time",
+]
+
+# list key predicates. quoted values may contain ']'
+KEY_PREDICATE = re.compile(r"\[(?:[^\]'\"]|'[^']*'|\"[^\"]*\")*\]")
+# a node of a data path and its key predicates
+PATH_ELEMENT = re.compile(r"/([^/\[]+)((?:\[(?:[^\]'\"]|'[^']*'|\"[^\"]*\")*\])*)")
+
 
 class ChangeHandler(object):
     def __init__(self, server, change):
@@ -35,6 +53,11 @@ class ChangeHandler(object):
     def revert(self, user):
         pass
 
+    def resource_key(self):
+        # handlers with different resource keys are independent and may be applied concurrently.
+        # None means the handler may touch any resource and must be applied alone.
+        return None
+
 
 NoOp = ChangeHandler
 
@@ -46,6 +69,16 @@ class ServerBase(object):
         self._current_handlers = None  # (req_id, handlers, user)
         self._stop_event = asyncio.Event()
         self.revert_timeout = revert_timeout
+        # the number of handlers applied concurrently. see apply_handlers()
+        self.apply_concurrency = 1
+        # TTL in seconds of cached operational data by subtree. see _oper_cb()
+        self.oper_cache_ttl = {}
+        self.oper_cache_size = OPER_CACHE_SIZE
+        self.oper_cache_stats_interval = OPER_CACHE_STATS_INTERVAL
+        self._oper_cache_stats_logged = time.monotonic()
+        self._oper_cache = {}  # request xpath: (expiry, data)
+        self._oper_inflight = {}  # request xpath: (path elements, task)
+        self._oper_cache_stats = dict.fromkeys(OPER_CACHE_STATS, 0)
         self.lock = asyncio.Lock()
 
     def get_running_data(
@@ -68,11 +101,42 @@ class ServerBase(object):
             include_implicit_defaults=include_implicit_defaults,
         )
 
+    @property
+    def handlers(self):
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers):
+        self._handlers = handlers
+        # resolved handlers memoized by node names of the schema path
+        self._handler_cache = {}
+
     def get_handler(self, xpath):
-        xpath = libyang.xpath_split(xpath)
+        """Get a handler class for a data path.
+
+        Args:
+            xpath (str or list): Data path, or its elements split by libyang.xpath_split().
+
+        Returns:
+            type: ChangeHandler class. NoOp if the path is an intermediate node. None if the path is not handled.
+        """
+        if isinstance(xpath, str):
+            path = KEY_PREDICATE.sub("", xpath)
+            names = tuple(e.rsplit(":", 1)[-1] for e in path.split("/")[1:])
+        else:
+            names = tuple(x[1] for x in xpath)
+        try:
+            return self._handler_cache[names]
+        except KeyError:
+            pass
+        cls = self._lookup_handler(names)
+        self._handler_cache[names] = cls
+        return cls
+
+    def _lookup_handler(self, names):
         cursor = self.handlers
-        for x in xpath:
-            v = cursor.get(x[1])
+        for name in names:
+            v = cursor.get(name)
             if v == None:
                 return None
             if type(v) == type and issubclass(v, ChangeHandler):
@@ -149,6 +213,8 @@ class ServerBase(object):
                     for done in reversed(handlers):
                         await call(done.revert, user)
                 self._current_handlers = None
+                # operational data may depend on the configuration
+                self.invalidate_oper_cache()
                 return
 
             if self._current_handlers != None:
@@ -180,13 +246,7 @@ class ServerBase(object):
                 await call(h.validate, user)
                 handlers.append(h)
 
-            for i, handler in enumerate(handlers):
-                try:
-                    await call(handler.apply, user)
-                except Exception as e:
-                    for done in reversed(handlers[:i]):
-                        await call(done.revert, user)
-                    raise e
+            await self.apply_handlers(handlers, user)
 
             await call(self.post, user)
 
@@ -196,25 +256,219 @@ class ServerBase(object):
                 for done in reversed(handlers):
                     await call(done.revert, user)
                 self._current_handlers = None
+                self.invalidate_oper_cache()
 
             revert_task = asyncio.create_task(do_revert())
             self._current_handlers = (req_id, handlers, user, revert_task)
 
+    # Handlers are applied one by one by default. If apply_concurrency is more than 1, handlers with different
+    # resource keys are applied concurrently up to apply_concurrency at a time. Handlers with the same resource key are
+    # applied in the order of the changes. A handler without a resource key is applied alone after the preceding
+    # handlers and before the following handlers.
+    #
+    # If a handler fails, the following handlers are not applied. Handlers already applied are reverted in the reverse
+    # order of their completion, so handlers with the same resource key are reverted in the reverse order.
+    async def apply_handlers(self, handlers, user):
+        if self.apply_concurrency <= 1:
+            for i, handler in enumerate(handlers):
+                try:
+                    await call(handler.apply, user)
+                except Exception as e:
+                    for done in reversed(handlers[:i]):
+                        await call(done.revert, user)
+                    raise e
+            return
+
+        applied = []
+        for groups in self._handler_batches(handlers):
+            try:
+                await self._apply_batch(groups, user, applied)
+            except Exception as e:
+                for done in reversed(applied):
+                    await call(done.revert, user)
+                raise e
+
+    def _handler_batches(self, handlers):
+        groups = {}
+        for handler in handlers:
+            key = handler.resource_key()
+            if key == None:
+                if groups:
+                    yield list(groups.values())
+                    groups = {}
+                yield [[handler]]
+            else:
+                groups.setdefault(key, []).append(handler)
+        if groups:
+            yield list(groups.values())
+
+    async def _apply_batch(self, groups, user, applied):
+        semaphore = asyncio.Semaphore(self.apply_concurrency)
+        errors = []
+
+        async def apply_group(group):
+            async with semaphore:
+                for handler in group:
+                    if errors:
+                        return
+                    try:
+                        await call(handler.apply, user)
+                    except Exception as e:
+                        errors.append(e)
+                        return
+                    applied.append(handler)
+
+        await asyncio.gather(*(apply_group(group) for group in groups))
+        if errors:
+            raise errors[0]
+
     def pre(self, user):
         pass
 
     def post(self, user):
         pass
 
+    # Responses of oper_cb() are cached by request xpath if oper_cache_ttl is set. oper_cache_ttl maps a subtree
+    # xpath without list keys (e.g. "/goldstone-interfaces:interfaces/interface/state/counters") to the TTL of its
+    # data in seconds. A request is cached only if it is in one of the subtrees. The TTL of the response is the one of
+    # the deepest subtree containing the request, or shorter if the response contains subtrees with shorter TTLs.
+    #
+    # Cached responses are invalidated by the 'done' or 'abort' event of change_cb() since operational data may
+    # depend on the configuration. Servers may also call invalidate_oper_cache() when they know operational data has
+    # changed, e.g. on a notification from the hardware. Statistics of the cache are logged at the debug level every
+    # oper_cache_stats_interval seconds while the cache is used.
+    #
+    # Concurrent requests are coalesced. If a request for the same xpath, or for an ancestor with the same or fewer list
+    # keys, is in progress, its response is awaited instead of calling oper_cb() again. The response of the ancestor
+    # contains the requested data.
     async def _oper_cb(self, xpath, priv):
         logger.debug(f"xpath: {xpath}")
         time_start = time.perf_counter_ns()
-        data = await call(self.oper_cb, xpath, priv)
+        ttl = self._oper_cache_ttl(xpath)
+        stats = self._oper_cache_stats
+        if self.oper_cache_ttl:
+            now = time.monotonic()
+            if now - self._oper_cache_stats_logged >= self.oper_cache_stats_interval:
+                self._oper_cache_stats_logged = now
+                logger.debug(f"oper cache stats: {self.get_oper_cache_stats()}")
+        if ttl != None:
+            v = self._oper_cache.get(xpath)
+            if v != None and v[0] > time.monotonic():
+                elapsed = time.perf_counter_ns() - time_start
+                stats["hits"] += 1
+                stats["hit-time"] += elapsed
+                logger.debug(f"xpath: {xpath}, cached")
+                return v[1]
+        data, coalesced = await self._oper_single_flight(xpath, priv)
+        if coalesced:
+            stats["coalesced"] += 1
+            logger.debug(f"xpath: {xpath}, coalesced")
+            return data
         time_end = time.perf_counter_ns()
+        if ttl != None:
+            stats["misses"] += 1
+            stats["miss-time"] += time_end - time_start
+            self._cache_oper_data(xpath, data, time.monotonic() + ttl)
         elapsed = (time_end - time_start) / 1000_1000_10
         logger.debug(f"xpath: {xpath}, elapsed: {elapsed}sec")
         return data
 
+    async def _oper_single_flight(self, xpath, priv):
+        elements = PATH_ELEMENT.findall(xpath)
+        for v, task in self._oper_inflight.values():
+            if self._covers(v, elements):
+                return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(call(self.oper_cb, xpath, priv))
+        self._oper_inflight[xpath] = (elements, task)
+
+        def done(t):
+            if self._oper_inflight.get(xpath, (None, None))[1] is t:
+                del self._oper_inflight[xpath]
+            # the exception is retrieved by the callers. avoid a warning if all of them are cancelled
+            if not t.cancelled():
+                t.exception()
+
+        task.add_done_callback(done)
+        return await asyncio.shield(task), False
+
+    def _covers(self, ancestor, elements):
+        if len(ancestor) > len(elements):
+            return False
+        for (name, keys), (n, k) in zip(ancestor, elements):
+            if name.rsplit(":", 1)[-1] != n.rsplit(":", 1)[-1]:
+                return False
+            if keys and not set(KEY_PREDICATE.findall(keys)) <= set(
+                KEY_PREDICATE.findall(k)
+            ):
+                return False
+        return True
+
+    def _oper_cache_ttl(self, xpath):
+        if not self.oper_cache_ttl:
+            return None
+        path = KEY_PREDICATE.sub("", xpath)
+        depth = -1
+        ttl = None
+        for subtree, v in self.oper_cache_ttl.items():
+            if path == subtree or path.startswith(subtree + "/"):
+                if len(subtree) > depth:
+                    depth = len(subtree)
+                    ttl = v
+        if ttl == None:
+            return None
+        for subtree, v in self.oper_cache_ttl.items():
+            if subtree.startswith(path + "/"):
+                ttl = min(ttl, v)
+        return ttl
+
+    def _cache_oper_data(self, xpath, data, expiry):
+        cache = self._oper_cache
+        cache.pop(xpath, None)
+        if len(cache) >= self.oper_cache_size:
+            now = time.monotonic()
+            for k in [k for k, v in cache.items() if v[0] <= now]:
+                del cache[k]
+            # drop the oldest one
+            if len(cache) >= self.oper_cache_size:
+                del cache[next(iter(cache))]
+        cache[xpath] = (expiry, data)
+
+    def invalidate_oper_cache(self, xpath=None):
+        """Invalidate cached operational data.
+
+        Args:
+            xpath (str): Data path. Cached responses of requests for its ancestors, itself, and its descendants are
+                invalidated regardless of list keys. All cached responses are invalidated if it is None.
+        """
+        if not self._oper_cache:
+            return
+        if xpath == None:
+            self._oper_cache_stats["invalidations"] += len(self._oper_cache)
+            self._oper_cache.clear()
+            return
+        path = KEY_PREDICATE.sub("", xpath)
+        v = []
+        for k in self._oper_cache:
+            p = KEY_PREDICATE.sub("", k)
+            if (p + "/").startswith(path + "/") or (path + "/").startswith(p + "/"):
+                v.append(k)
+        for k in v:
+            del self._oper_cache[k]
+        self._oper_cache_stats["invalidations"] += len(v)
+
+    def get_oper_cache_stats(self):
+        """Get statistics of the operational data cache.
+
+        Returns:
+            dict: The number of "hits", "misses" and "invalidations", the number of cached "entries", the number of
+                requests "coalesced" with one in progress, and the total time to respond to the hits and misses in
+                "hit-time" and "miss-time" in nanoseconds.
+        """
+        stats = dict(self._oper_cache_stats)
+        stats["entries"] = len(self._oper_cache)
+        return stats
+
     def oper_cb(self, xpath, priv):
         pass
 
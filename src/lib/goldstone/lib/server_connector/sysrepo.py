@@ -1,11 +1,23 @@
+import copy
 import json
+import logging
 import inspect
+import libyang
 import sysrepo
 
 from .base import ServerConnector as BaseServerConnector
 import goldstone.lib.errors
 from goldstone.lib.errors import *
 
+logger = logging.getLogger(__name__)
+
+
+def _key_str(value):
+    # canonical string of a list key value in a path
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
 
 class Change:
     def __init__(self, change):
@@ -53,6 +65,8 @@ class ServerConnector(BaseServerConnector):
         self.module = module
         self.top = f"/{self.module}:{v[0]}"
         self.change_cb = None
+        # mirror of the running config of the module. see get_config_cache()
+        self._running = None
 
     @property
     def type(self):
@@ -76,11 +90,25 @@ class ServerConnector(BaseServerConnector):
         )
 
     async def _change_cb(self, event, req_id, changes, priv):
+        if event == "done":
+            self._update_running(changes)
         try:
             await self.change_cb(event, req_id, [Change(c) for c in changes], priv)
         except Error as e:
             raise convert2sysrepo(e) from None
 
+    def subscribe_module_change_done(self, module, cb, priv=None):
+        asyncio_register = inspect.iscoroutinefunction(cb)
+        return self.session.session.subscribe_module_change(
+            module,
+            None,
+            cb,
+            passive=True,
+            done_only=True,
+            asyncio_register=asyncio_register,
+            private_data=priv,
+        )
+
     def subscribe_oper_data_request(self, oper_cb):
         asyncio_register = inspect.iscoroutinefunction(oper_cb)
         self.session.session.subscribe_oper_data_request(
@@ -91,16 +119,86 @@ class ServerConnector(BaseServerConnector):
             asyncio_register=asyncio_register,
         )
 
+    # The running config of the module is read once and kept as a mirror. It is updated with the changes of each
+    # committed transaction instead of being read again.
+    #
+    # A config cache for a transaction is an overlay of the mirror with the changes applied. Only the containers and
+    # lists on the paths of the changes are copied, and the other subtrees are shared with the mirror. So the cache
+    # must not be modified by handlers.
+    #
+    # If an existing list entry on the path of a change cannot be found in the mirror, applying the change would
+    # modify an entry shared with the mirror. Then the cache is a deep copy of the mirror, and the mirror is dropped
+    # when the transaction is done.
     def get_config_cache(self, changes):
-        cache = self.get(
-            self.top,
-            default={},
-            strip=False,
-            include_implicit_defaults=True,
-        )
-        sysrepo.update_config_cache(cache, [c._raw for c in changes])
+        if self._running is None:
+            self._running = self.get(
+                self.top,
+                default={},
+                strip=False,
+                include_implicit_defaults=True,
+            )
+        changes = [c._raw for c in changes]
+        cache = self._overlay(self._running, changes)
+        if cache is None:
+            cache = copy.deepcopy(self._running)
+            sysrepo.update_config_cache(cache, changes)
         return cache
 
+    def _update_running(self, changes):
+        if self._running is None:
+            return
+        changes = list(changes)
+        # a deleted leaf may fall back to its default value which is not in the changes. read the config again
+        if any(isinstance(c, sysrepo.ChangeDeleted) for c in changes):
+            self._running = None
+            return
+        try:
+            self._running = self._overlay(self._running, changes)
+        except Exception as e:
+            logger.warning(f"failed to update the running config mirror: {e}")
+            self._running = None
+
+    def _overlay(self, tree, changes):
+        copied = set()
+
+        def own(node):
+            if id(node) in copied:
+                return node
+            node = copy.copy(node)
+            copied.add(id(node))
+            return node
+
+        tree = own(tree)
+        for change in changes:
+            node = tree
+            for prefix, name, keys in libyang.xpath_split(change.xpath):
+                if not isinstance(node, dict):
+                    break
+                name = name if name in node else f"{prefix}:{name}"
+                child = node.get(name)
+                if isinstance(child, (dict, list)):
+                    child = own(child)
+                    node[name] = child
+                if not isinstance(child, list) or not keys:
+                    node = child
+                    continue
+                for i, entry in enumerate(child):
+                    if isinstance(entry, dict) and all(
+                        _key_str(entry.get(k)) == v for k, v in keys
+                    ):
+                        node = child[i] = own(entry)
+                        break
+                else:
+                    # a new entry or a leaf-list item is added to the copied list
+                    if isinstance(change, sysrepo.ChangeCreated) or not any(
+                        isinstance(entry, dict) for entry in child
+                    ):
+                        break
+                    logger.debug(f"{change.xpath} is not found in the mirror")
+                    return None
+        sysrepo.update_config_cache(tree, changes)
+        return tree
+
     def subscribe_notification(self, module, xpath, cb, priv=None):
         asyncio_register = inspect.iscoroutinefunction(cb)
         return self.session.session.subscribe_notification(
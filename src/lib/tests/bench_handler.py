@@ -0,0 +1,111 @@
+"""Micro-benchmark for handler dispatch of ServerBase.
+
+It runs a transaction of 5000 changes through ServerBase.change_cb(), like a bulk VLAN membership change, and
+compares memoized handler lookups with splitting and walking each path.
+
+    cd src/lib
+    python -m tests.bench_handler
+"""
+
+
+import argparse
+import asyncio
+import logging
+from unittest import mock
+
+import libyang
+
+from goldstone.lib.core import ServerBase, ChangeHandler, NoOp
+
+
+logger = logging.getLogger(__name__)
+
+
+class Handler(ChangeHandler):
+    pass
+
+
+HANDLERS = {
+    "vlans": {
+        "vlan": {
+            "vlan-id": NoOp,
+            "config": NoOp,
+            "members": {"member": Handler},
+        }
+    },
+    "interfaces": {
+        "interface": {
+            "name": NoOp,
+            "config": {"name": NoOp, "admin-status": Handler, "mtu": Handler},
+        }
+    },
+}
+
+
+class Change:
+    type = "created"
+
+    def __init__(self, xpath):
+        self.xpath = xpath
+
+
+class Server(ServerBase):
+    def __init__(self):
+        with mock.patch("goldstone.lib.core.create_server_connector"):
+            super().__init__(mock.MagicMock(), "goldstone-vlan")
+        self.handlers = HANDLERS
+
+
+class SplitServer(Server):
+    """ServerBase.get_handler() without memoization."""
+
+    def get_handler(self, xpath):
+        return self._lookup_handler([x[1] for x in libyang.xpath_split(xpath)])
+
+
+def changes(num):
+    v = []
+    for i in range(num):
+        if i % 2:
+            prefix = f"/goldstone-vlan:vlans/vlan[vlan-id='{i % 4094 + 1}']"
+            v.append(Change(f"{prefix}/members/member[ifname='Ethernet{i}_1']"))
+        else:
+            prefix = f"/goldstone-interfaces:interfaces/interface[name='Ethernet{i}_1']"
+            v.append(Change(f"{prefix}/config/admin-status"))
+    return v
+
+
+async def transaction(server, changes):
+    await server.change_cb("change", 1, changes, None)
+    await server.change_cb("done", 1, changes, None)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--changes", type=int, default=5000)
+    parser.add_argument("-n", "--number", type=int, default=20)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    v = changes(args.changes)
+    results = {}
+
+    async def run():
+        for cls in [SplitServer, Server]:
+            server = cls()
+            loop = asyncio.get_running_loop()
+            elapsed = 0
+            for _ in range(args.number):
+                start = loop.time()
+                await transaction(server, v)
+                elapsed += loop.time() - start
+            elapsed = elapsed / args.number
+            results[cls.__name__] = elapsed
+            logger.info(f"{cls.__name__ + ':':12} {elapsed * 1000:.1f} ms/transaction")
+
+    asyncio.run(run())
+    logger.info(f"{results['SplitServer'] / results['Server']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,27 @@ class TestSysrepoConnector(unittest.TestCase):
         test(["SPEED_10G"])
         test(["SPEED_40G", "SPEED_100G"])
 
+    def test_edit_batch_unknown_node(self):
+        conn = SRConnector()
+        conn.delete_all("goldstone-interfaces")
+        conn.apply()
+        ifname = "eth0"
+        data = {
+            "interfaces": {
+                "interface": [
+                    {
+                        "name": ifname,
+                        # leaf "typo" does not exist in the schema
+                        "config": {"name": ifname, "typo": "UP"},
+                    }
+                ]
+            }
+        }
+        with self.assertRaises(Error):
+            conn.edit_batch(data, "goldstone-interfaces")
+        conn.apply()
+        self.assertEqual(conn.get("/goldstone-interfaces:interfaces/interface"), None)
+
 
 class TestCLI(unittest.TestCase):
     def test_sysrepo_connector_notification(self):
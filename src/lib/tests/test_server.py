@@ -33,6 +33,28 @@ class Server(ServerBase):
         self.handled_changes = []
 
 
+class KeyedHandler(ChangeHandler):
+    def __init__(self, name, key, fail=False):
+        self.name = name
+        self.key = key
+        self.fail = fail
+
+    def resource_key(self):
+        return self.key
+
+    async def apply(self, user):
+        if self.fail:
+            raise InvalArgError(f"{self.name} failed")
+        user["running"] += 1
+        user["max-running"] = max(user["max-running"], user["running"])
+        await asyncio.sleep(0.01)
+        user["running"] -= 1
+        user["log"].append(("apply", self.name))
+
+    async def revert(self, user):
+        user["log"].append(("revert", self.name))
+
+
 class TestServerBase(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         logging.basicConfig(level=logging.DEBUG)
@@ -50,6 +72,183 @@ class TestServerBase(unittest.IsolatedAsyncioTestCase):
         self.server.stop()
         await self.stop_event
 
+    async def test_get_handler(self):
+        prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        for _ in range(2):
+            self.assertEqual(
+                self.server.get_handler(prefix + "/config/admin-status"), Handler
+            )
+            self.assertEqual(self.server.get_handler(prefix + "/config"), NoOp)
+            self.assertEqual(
+                self.server.get_handler(prefix + "/config/interface-type"), None
+            )
+            self.assertEqual(
+                self.server.get_handler(
+                    prefix + "/ethernet/auto-negotiate/config/enabled"
+                ),
+                Handler,
+            )
+        # pre-split paths share the memoized handlers
+        xpath = [
+            ("goldstone-interfaces", "interfaces", []),
+            ("", "interface", [("name", "Interface1/0/2")]),
+            ("", "config", []),
+            ("", "prbs-mode", []),
+        ]
+        self.assertEqual(self.server.get_handler(xpath), Handler)
+
+        # replacing handlers discards memoized handlers
+        self.server.handlers = {"interfaces": {"interface": NoOp}}
+        self.assertEqual(self.server.get_handler(prefix + "/config/admin-status"), NoOp)
+
+    async def test_apply_handlers_concurrently(self):
+        self.server.apply_concurrency = 2
+        handlers = [
+            KeyedHandler("a1", "a"),
+            KeyedHandler("b1", "b"),
+            KeyedHandler("c1", "c"),
+            KeyedHandler("a2", "a"),
+            KeyedHandler("all", None),
+            KeyedHandler("b2", "b"),
+        ]
+        user = {"log": [], "running": 0, "max-running": 0}
+        await self.server.apply_handlers(handlers, user)
+        applied = [name for _, name in user["log"]]
+        self.assertEqual(sorted(applied), ["a1", "a2", "all", "b1", "b2", "c1"])
+        # the same key is applied in order
+        self.assertLess(applied.index("a1"), applied.index("a2"))
+        # a handler without a key is applied alone
+        self.assertEqual(applied[4:], ["all", "b2"])
+        self.assertEqual(user["max-running"], 2)
+
+    async def test_apply_handlers_concurrently_failure(self):
+        self.server.apply_concurrency = 4
+        handlers = [
+            KeyedHandler("a1", "a"),
+            KeyedHandler("b1", "b"),
+            KeyedHandler("a2", "a"),
+            KeyedHandler("b2", "b", fail=True),
+            KeyedHandler("a3", "a"),
+            KeyedHandler("c1", None),
+        ]
+        user = {"log": [], "running": 0, "max-running": 0}
+        with self.assertRaises(InvalArgError):
+            await self.server.apply_handlers(handlers, user)
+        log = user["log"]
+        applied = [name for op, name in log if op == "apply"]
+        reverted = [name for op, name in log if op == "revert"]
+        # no handler is applied after the failure
+        self.assertEqual(sorted(applied), ["a1", "a2", "b1"])
+        # applied handlers are reverted in the reverse order
+        self.assertEqual(reverted, list(reversed(applied)))
+
+    async def test_oper_cache(self):
+        prefix = "/goldstone-interfaces:interfaces/interface"
+        calls = []
+
+        def oper_cb(xpath, priv):
+            calls.append(xpath)
+            return {"xpath": xpath, "call": len(calls)}
+
+        self.server.oper_cb = oper_cb
+        self.server.oper_cache_ttl = {
+            "/goldstone-interfaces:interfaces": 60,
+            f"{prefix}/state/counters": 0.05,
+        }
+        state = f"{prefix}[name='Interface1/0/1']/state"
+        counters = f"{state}/counters"
+        config = f"{prefix}[name='Interface1/0/1']/config"
+
+        for xpath in [state, counters, config]:
+            data = await self.server._oper_cb(xpath, None)
+            self.assertEqual(await self.server._oper_cb(xpath, None), data)
+        self.assertEqual(calls, [state, counters, config])
+
+        # the response of state contains counters and expires with them
+        await asyncio.sleep(0.1)
+        for xpath in [state, counters, config]:
+            await self.server._oper_cb(xpath, None)
+        self.assertEqual(calls[3:], [state, counters])
+
+        # requests out of the subtrees are not cached
+        xpath = "/goldstone-platform:components"
+        await self.server._oper_cb(xpath, None)
+        await self.server._oper_cb(xpath, None)
+        self.assertEqual(calls[5:], [xpath, xpath])
+
+        # invalidation regardless of list keys
+        self.server.invalidate_oper_cache(f"{prefix}[name='Interface1/0/2']/state")
+        for xpath in [state, counters, config]:
+            await self.server._oper_cb(xpath, None)
+        self.assertEqual(calls[7:], [state, counters])
+
+        stats = self.server.get_oper_cache_stats()
+        self.assertEqual(stats["hits"], 5)
+        self.assertEqual(stats["misses"], 7)
+        self.assertEqual(stats["invalidations"], 2)
+        self.assertEqual(stats["entries"], 3)
+
+        self.server.invalidate_oper_cache()
+        self.assertEqual(self.server.get_oper_cache_stats()["entries"], 0)
+
+        # statistics are logged periodically
+        self.server.oper_cache_stats_interval = 0
+        with self.assertLogs("goldstone.lib.core", level="DEBUG") as cm:
+            await self.server._oper_cb(state, None)
+        stats = [o for o in cm.output if "oper cache stats" in o]
+        self.assertEqual(len(stats), 1)
+        self.assertIn("{'hits': 5, 'misses': 7", stats[0])
+
+    async def test_oper_coalescing(self):
+        prefix = "/goldstone-interfaces:interfaces/interface"
+        calls = []
+
+        async def oper_cb(xpath, priv):
+            calls.append(xpath)
+            await asyncio.sleep(0.05)
+            if xpath.endswith("/config"):
+                raise InvalArgError("failed")
+            return {"xpath": xpath}
+
+        self.server.oper_cb = oper_cb
+        intf1 = f"{prefix}[name='Interface1/0/1']"
+        intf2 = f"{prefix}[name='Interface1/0/2']"
+        xpaths = [
+            intf1,
+            intf1,
+            f"{intf1}/state/counters",
+            intf2,
+            f"{intf2}/state",
+        ]
+        v = await asyncio.gather(*(self.server._oper_cb(x, None) for x in xpaths))
+        # requests for the same path or for descendants share the response
+        self.assertEqual(calls, [intf1, intf2])
+        self.assertEqual(v, [{"xpath": x} for x in [intf1, intf1, intf1, intf2, intf2]])
+        self.assertEqual(self.server.get_oper_cache_stats()["coalesced"], 3)
+
+        # a request for all interfaces is not covered by one for an interface
+        calls.clear()
+        await asyncio.gather(
+            self.server._oper_cb(intf1, None), self.server._oper_cb(prefix, None)
+        )
+        self.assertEqual(calls, [intf1, prefix])
+
+        # errors are raised to all callers
+        calls.clear()
+        xpath = f"{intf1}/config"
+        v = await asyncio.gather(
+            self.server._oper_cb(xpath, None),
+            self.server._oper_cb(xpath, None),
+            return_exceptions=True,
+        )
+        self.assertEqual(calls, [xpath])
+        self.assertTrue(all(isinstance(e, InvalArgError) for e in v))
+
+        # completed requests are not reused
+        calls.clear()
+        await self.server._oper_cb(intf1, None)
+        self.assertEqual(calls, [intf1])
+
     async def test_basic_change_handling(self):
         def t():
             conn = Connector()
@@ -109,6 +109,58 @@ def update_xp():
         conn.apply()
 
 
+def update_admin_status():
+    conn = Connector()
+    name = "Ethernet1_1"
+    prefix = f"/goldstone-interfaces:interfaces/interface[name='{name}']/config"
+    for status in ["UP", "DOWN", "UP"]:
+        conn.set(f"{prefix}/name", name)
+        conn.set(f"{prefix}/admin-status", status)
+        conn.apply()
+    conn.delete_all("goldstone-interfaces")
+    conn.apply()
+    conn.set(f"{prefix}/name", name)
+    conn.set(f"{prefix}/admin-status", "DOWN")
+    conn.apply()
+
+
+class CacheAdminStatusHandler(ChangeHandler):
+    def apply(self, user):
+        if self.type == "deleted":
+            return
+        cache = self.setup_cache(user)
+        for intf in cache["goldstone-interfaces:interfaces"]["interface"]:
+            self.server.statuses.append(intf["config"]["admin-status"])
+
+
+class TestConfigCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.conn = Connector()
+        self.conn.delete_all("goldstone-interfaces")
+        self.conn.apply()
+
+    async def test_config_cache(self):
+        server = MockInterfaceServer(self.conn)
+        config = server.handlers["interfaces"]["interface"]["config"]
+        config["admin-status"] = CacheAdminStatusHandler
+        server.statuses = []
+
+        tasks = list(asyncio.create_task(c) for c in await server.start())
+
+        with mock.patch.object(server.conn, "get", wraps=server.conn.get) as get:
+            await to_subprocess(update_admin_status)
+            # the running config is read again only after the deletion
+            self.assertEqual(get.call_count, 2)
+
+        self.assertEqual(server.statuses, ["UP", "DOWN", "UP", "DOWN"])
+
+        server.stop()
+        await asyncio.gather(*tasks)
+
+    async def asyncTearDown(self):
+        self.conn.stop()
+
+
 class TestConcurrentAccess(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         logging.basicConfig(level=logging.DEBUG)
@@ -3,7 +3,15 @@
 
 import logging
 import argparse
-from .server import serve
+import asyncio
+from .server import (
+    serve,
+    serve_async,
+    SubscribeRequest,
+    NotificationQueue,
+    GetCache,
+    gNMIServicer,
+)
 from .repo.sysrepo import Sysrepo
 
 
@@ -13,6 +21,12 @@ logger = logging.getLogger(__name__)
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument(
+        "-s",
+        "--sync",
+        action="store_true",
+        help="serve with the thread pool based server instead of the asyncio based server",
+    )
     parser.add_argument("-p", "--secure-port", type=int, default=51051)
     parser.add_argument("-i", "--insecure-port", type=int)
     parser.add_argument(
@@ -27,6 +41,36 @@ def main():
         type=str,
         help="path to a PEM-encoded certificate chain file",
     )
+    parser.add_argument(
+        "--max-notifs",
+        type=int,
+        default=SubscribeRequest.DEFAULT_MAX_NOTIFS,
+        help="maximum number of notifications queued for each Subscribe stream",
+    )
+    parser.add_argument(
+        "--overflow-policy",
+        choices=NotificationQueue.OVERFLOW_POLICIES,
+        default=SubscribeRequest.DEFAULT_OVERFLOW_POLICY,
+        help="policy applied when a Subscribe stream's notification queue is full",
+    )
+    parser.add_argument(
+        "--get-cache-ttl",
+        type=float,
+        default=GetCache.DEFAULT_TTL,
+        help="seconds to cache Get results. 0 disables the cache",
+    )
+    parser.add_argument(
+        "--get-cache-max-entries",
+        type=int,
+        default=GetCache.DEFAULT_MAX_ENTRIES,
+        help="maximum number of Get results to cache",
+    )
+    parser.add_argument(
+        "--get-concurrency",
+        type=int,
+        default=gNMIServicer.DEFAULT_GET_CONCURRENCY,
+        help="maximum number of paths of a Get request retrieved concurrently",
+    )
     parser.add_argument(
         "supported_models_file",
         metavar="supported_models_file",
@@ -40,14 +84,22 @@ def main():
     else:
         logging.basicConfig(level=logging.INFO, format=fmt)
 
-    serve(
-        Sysrepo,
-        secure_port=args.secure_port,
-        insecure_port=args.insecure_port,
-        private_key_file=args.private_key_file,
-        certificate_chain_file=args.certificate_chain_file,
-        supported_models_file=args.supported_models_file,
-    )
+    params = {
+        "secure_port": args.secure_port,
+        "insecure_port": args.insecure_port,
+        "private_key_file": args.private_key_file,
+        "certificate_chain_file": args.certificate_chain_file,
+        "supported_models_file": args.supported_models_file,
+        "max_notifs": args.max_notifs,
+        "overflow_policy": args.overflow_policy,
+        "get_cache_ttl": args.get_cache_ttl,
+        "get_cache_max_entries": args.get_cache_max_entries,
+        "get_concurrency": args.get_concurrency,
+    }
+    if args.sync:
+        serve(Sysrepo, **params)
+    else:
+        asyncio.run(serve_async(Sysrepo, **params))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+"""Pool of long-lived repository connections."""
+
+
+import logging
+import threading
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolClosedError(Exception):
+    def __init__(self):
+        super().__init__("Repository pool is already closed")
+
+
+class RepositoryPool:
+    """Bounded pool of started repositories.
+
+    Starting a repository (e.g. connecting to sysrepo and creating sessions) is expensive. RepositoryPool keeps
+    started repositories and lends them to requests instead of starting a new one for each request. Repositories are
+    started lazily up to `max_size`. When all of them are in use, acquire() blocks until one is released.
+
+        pool = RepositoryPool(Sysrepo, max_size=10)
+        with pool.acquire() as repo:
+            # something to do
+        pool.close()
+
+    Args:
+        repo (type): Repository class to instantiate.
+        max_size (int): Maximum number of repositories the pool holds.
+
+    Attributes:
+        repo (type): Repository class to instantiate.
+        max_size (int): Maximum number of repositories the pool holds.
+    """
+
+    DEFAULT_MAX_SIZE = 10
+
+    def __init__(self, repo, max_size=DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError(f"max_size should be larger than 0: {max_size}")
+        self.repo = repo
+        self.max_size = max_size
+        self._idle = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self):
+        """int: The number of repositories currently started by the pool."""
+        with self._cond:
+            return self._size
+
+    @property
+    def idle(self):
+        """int: The number of repositories ready to be borrowed."""
+        with self._cond:
+            return len(self._idle)
+
+    def _start(self):
+        try:
+            repo = self.repo()
+            repo.start()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return repo
+
+    def _stop(self, repo):
+        try:
+            repo.stop()
+        except Exception as e:
+            logger.warning("failed to stop a repository. %s", e)
+
+    def _drop(self, repo):
+        self._stop(repo)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _borrow(self, timeout):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolClosedError()
+                if len(self._idle) > 0:
+                    # Reuse the most recently released one. It is most likely to be healthy.
+                    repo = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    repo = None
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("no repository is available in the pool")
+        if repo is None:
+            return self._start()
+        if not repo.is_healthy():
+            logger.info("an unhealthy repository is found in the pool. restarting.")
+            # Restart it in the same slot.
+            self._stop(repo)
+            return self._start()
+        return repo
+
+    def _return(self, repo):
+        try:
+            # Never hand uncommitted changes of a request over to the next one.
+            repo.discard()
+        except Exception as e:
+            logger.warning("failed to reset a repository. %s", e)
+            self._drop(repo)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append(repo)
+                self._cond.notify()
+                return
+        self._drop(repo)
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """Borrow a started repository.
+
+        The repository is given back to the pool on exit from the `with` statement. Changes which have not been
+        applied are discarded at that time.
+
+        Args:
+            timeout (float): Seconds to wait for an available repository. None means waiting forever.
+
+        Raises:
+            TimeoutError: No repository became available within the timeout.
+            PoolClosedError: The pool has been closed.
+        """
+        repo = self._borrow(timeout)
+        try:
+            yield repo
+        finally:
+            self._return(repo)
+
+    def close(self):
+        """Stop all idle repositories and refuse further acquisitions.
+
+        Repositories in use are stopped when they are returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._cond.notify_all()
+        for repo in idle:
+            self._drop(repo)
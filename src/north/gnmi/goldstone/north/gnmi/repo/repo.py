@@ -30,6 +30,16 @@ class Repository:
         All reserved resources that the connection/session has will be released."""
         pass
 
+    def is_healthy(self):
+        """Check the connection/session is still usable.
+
+        It is used to decide whether a started repository can be reused for another request.
+
+        Returns:
+            bool: True if the connection/session is usable.
+        """
+        return True
+
     def get(self, xpath, strip=True):
         """Get a data tree from the xpath.
 
@@ -46,6 +56,23 @@ class Repository:
         """
         pass
 
+    def get_config(self, xpath):
+        """Get a configuration data tree from the xpath.
+
+        Unlike get(), it does not include operational state data.
+
+        Args:
+            xpath (str): XPath to get.
+
+        Returns:
+            dict: A data tree without the prefix specified as xpath.
+
+        Raises:
+            NotFoundError: Matched data is not found.
+            ValueError: 'xpath' is invalid.
+        """
+        pass
+
     def set(self, xpath, data):
         """Set a data to the xpath.
 
@@ -63,6 +90,22 @@ class Repository:
         """
         pass
 
+    def set_batch(self, module, data):
+        """Set a data tree in one batch.
+
+        Existing items are merged with the data tree. This just registers the changes. You need to call apply() to
+        apply them to the repository.
+
+        Args:
+            module (str): Name of the module the data tree belongs to.
+            data (dict): Data tree from the top node of the module.
+
+        Raises:
+            ValueError: 'data' is invalid.
+            NotImplementedError: The repository does not support batch editing. Use set() instead.
+        """
+        raise NotImplementedError("set_batch() is not supported")
+
     def delete(self, xpath):
         """Delete a data tree from the xpath.
 
@@ -96,6 +139,21 @@ class Repository:
         """
         pass
 
+    def get_schema(self, xpath):
+        """Get the schema of the node of the xpath.
+
+        Args:
+            xpath (str): XPath of the node. List keys may be included.
+
+        Returns:
+            SchemaEntry: The schema of the node. It provides `keyword`, `basetype`, `keys` and `child_entry()`.
+
+        Raises:
+            ValueError: 'xpath' is invalid.
+            NotImplementedError: The repository does not provide schemas.
+        """
+        raise NotImplementedError()
+
     def subscribe_notification(self, xpath, callback):
         """Subscribe a notification.
 
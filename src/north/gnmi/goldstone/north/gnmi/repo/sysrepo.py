@@ -32,6 +32,182 @@ def parse_xpath(xpath):
     return list(libyang.xpath_split(xpath))
 
 
+class SchemaEntry:
+    """Cached properties of a schema node.
+
+    Args:
+        node (Node): The schema node.
+
+    Attributes:
+        node (Node): The schema node.
+        keyword (str): YANG statement of the node, e.g. "container", "list" or "leaf".
+        basetype (str): Built-in base type of the node, e.g. "uint64". None if the node is neither a leaf nor a
+            leaf-list.
+        keys (list of str): Names of the list keys. Empty if the node is not a list.
+    """
+
+    __slots__ = (
+        "node",
+        "keyword",
+        "basetype",
+        "keys",
+        "key_set",
+        "_children",
+        "_child_entries",
+    )
+
+    def __init__(self, node):
+        self.node = node
+        self.keyword = node.keyword()
+        self.basetype = None
+        if self.keyword in ("leaf", "leaf-list"):
+            self.basetype = node.basetype()
+        self.keys = [key.name() for key in node.keys()]
+        self.key_set = frozenset(self.keys)
+        self._children = None
+        self._child_entries = {}
+
+    def child(self, name):
+        """Get the child schema node.
+
+        Args:
+            name (str): Name of the child node without prefix.
+
+        Returns:
+            Node: The child schema node. None if it is not found.
+        """
+        if self._children is None:
+            self._children = {c.name(): c for c in self.node.children()}
+        return self._children.get(name)
+
+    def child_entry(self, name):
+        """Get the entry of the child schema node.
+
+        Args:
+            name (str): Name of the child node without prefix.
+
+        Returns:
+            SchemaEntry: The entry of the child schema node. None if it is not found.
+        """
+        try:
+            return self._child_entries[name]
+        except KeyError:
+            pass
+        node = self.child(name)
+        entry = None if node is None else SchemaEntry(node)
+        self._child_entries[name] = entry
+        return entry
+
+
+class SchemaIndex:
+    """Memoized index of schema nodes.
+
+    Schema nodes are looked up by their key-stripped schema path, e.g. "/goldstone-interfaces:interfaces/interface"
+    for "/goldstone-interfaces:interfaces/interface[name='Ethernet1_1']". Each node is looked up in the schema only
+    once; the index is built lazily while paths are requested.
+
+    Nodes belong to a libyang context. Do not use the index after the context is released.
+
+    Args:
+        find_node (func): Function to find a top level schema node by its path.
+    """
+
+    def __init__(self, find_node):
+        self._find_node = find_node
+        self._entries = {}
+        self._single_results = {}
+
+    def _entry(self, schema_path, parent, elem):
+        entry = self._entries.get(schema_path)
+        if entry is not None:
+            return entry
+        if parent is None:
+            node = self._find_node(f"/{elem[0]}:{elem[1]}")
+            entry = None if node is None else SchemaEntry(node)
+        else:
+            entry = parent.child_entry(elem[1])
+        if entry is None:
+            msg = f"node '{elem}' not found."
+            raise ValueError(msg)
+        self._entries[schema_path] = entry
+        return entry
+
+    def lookup(self, elements):
+        """Look up the schema nodes of a parsed xpath.
+
+        Args:
+            elements (list of tupples): Parsed xpath. See parse_xpath().
+
+        Returns:
+            (tupple, list of SchemaEntry): The key-stripped schema path and schema entries for each element.
+
+        Raises:
+            ValueError: A node is not found in the schema.
+        """
+        schema_path = ()
+        parent = None
+        entries = []
+        for elem in elements:
+            if parent is None:
+                schema_path = ((elem[0], elem[1]),)
+            else:
+                schema_path = schema_path + (elem[1],)
+            parent = self._entry(schema_path, parent, elem)
+            entries.append(parent)
+        return schema_path, entries
+
+    def get_list_keys(self, elements):
+        """Get names of the list keys of the last element.
+
+        Args:
+            elements (list of tupples): Parsed xpath. See parse_xpath().
+
+        Returns:
+            list of str: Names of the list keys.
+
+        Raises:
+            ValueError: A node is not found in the schema.
+        """
+        _, entries = self.lookup(elements)
+        return list(entries[-1].keys)
+
+    def expect_single_result(self, elements):
+        """Check whether a path points to a single data node through list nodes.
+
+        If all keys defined by the data schema are specified for all list nodes in the path and at least one list
+        node is in the path, it returns True. It also returns True if only the last list node has no keys specified.
+
+        Args:
+            elements (list of tupples): Parsed xpath. See parse_xpath().
+
+        Returns:
+            bool: True if the path is expected to match a single data node.
+
+        Raises:
+            ValueError: A node is not found in the schema.
+        """
+        elem_keys = tuple(frozenset(key[0] for key in elem[2]) for elem in elements)
+        schema_path, entries = self.lookup(elements)
+        cache_key = (schema_path, elem_keys)
+        try:
+            return self._single_results[cache_key]
+        except KeyError:
+            pass
+        result = self._expect_single_result(elem_keys, entries)
+        self._single_results[cache_key] = result
+        return result
+
+    def _expect_single_result(self, elem_keys, entries):
+        key_defined = False
+        last = len(entries) - 1
+        for i, (keys, entry) in enumerate(zip(elem_keys, entries)):
+            if len(keys) > 0:
+                key_defined = True
+            if keys != entry.key_set:
+                return key_defined and i == last and len(keys) == 0
+        return key_defined
+
+
 class Sysrepo(Repository):
     """Allows to access the sysrepo datastore.
 
@@ -45,6 +221,7 @@ class Sysrepo(Repository):
 
     def __init__(self):
         self._connector = None
+        self._schema = None
 
     def __enter__(self):
         return self
@@ -54,54 +231,45 @@ class Sysrepo(Repository):
 
     def start(self):
         self._connector = Connector()
+        self._schema = SchemaIndex(self._find_node)
 
     def stop(self):
         self._connector.stop()
+        self._connector = None
+        self._schema = None
+
+    def is_healthy(self):
+        if self._connector is None:
+            return False
+        try:
+            # It fails if the session has been stopped or the connection has been broken.
+            self._connector.discard_changes()
+        except Exception as e:
+            logger.warning("sysrepo connection is unhealthy. %s", e)
+            return False
+        return True
 
     def _find_node(self, path):
         return self._connector.find_node(path)
 
-    def _next_node(self, node, target_name):
-        for c in node.children():
-            if c.name() == target_name:
-                return c
-
     def _expect_single_result_when_path_includes_list_node(self, path):
         # If all keys defined by the data schema are specified in the provided path, return True.
-        key_defined = False
-        elements = parse_xpath(path)
-        node = None
-        for i, elem in enumerate(elements):
-            prefix = elem[0]
-            name = elem[1]
-            if node is None:
-                # Find first node.
-                node = self._find_node(f"/{prefix}:{name}")
-            else:
-                node = self._next_node(node, name)
-            if node is None:
-                msg = f"node '{elem}' not found."
-                raise ValueError(msg)
-            elem_keys = set()
-            for key in elem[2]:
-                elem_keys.add(key[0])
-            node_keys = set()
-            for key in node.keys():
-                node_keys.add(key.name())
-            if len(elem_keys) > 0:
-                key_defined = True
-            if elem_keys != node_keys:
-                return key_defined and i == len(elements) - 1 and len(elem_keys) == 0
-        return key_defined
+        return self._schema.expect_single_result(parse_xpath(path))
 
     def get(self, xpath, strip=True):
+        # Goldstone xlate/south daemons enable the datastore layering.
+        # When you get data from the operational datastore, you may get data from the running datastore too.
+        # It means that you can get operational state and configuration state at same time.
+        return self._get(xpath, strip, "operational")
+
+    def get_config(self, xpath):
+        return self._get(xpath, True, "running")
+
+    def _get(self, xpath, strip, ds):
         try:
             one = self._expect_single_result_when_path_includes_list_node(xpath)
             logger.debug("one: %s", one)
-            # Goldstone xlate/south daemons enable the datastore layering.
-            # When you get data from the operational datastore, you may get data from the running datastore too.
-            # It means that you can get operational state and configuration state at same time.
-            r = self._connector.get(xpath, strip=strip, one=one, ds="operational")
+            r = self._connector.get(xpath, strip=strip, one=one, ds=ds)
         except ConnectorNotFound as e:
             logger.error("%s not found. %s", xpath, e)
             raise NotFoundError(xpath) from e
@@ -122,6 +290,14 @@ class Sysrepo(Repository):
             logger.debug(msg)
             raise ValueError(msg) from e
 
+    def set_batch(self, module, data):
+        try:
+            self._connector.edit_batch(data, module)
+        except ConnectorError as e:
+            msg = f"failed to set. module: {module}, value: {data}. {e}"
+            logger.debug(msg)
+            raise ValueError(msg) from e
+
     def delete(self, xpath):
         try:
             self._connector.delete(xpath)
@@ -146,22 +322,11 @@ class Sysrepo(Repository):
         self._connector.discard_changes()
 
     def get_list_keys(self, path):
-        elements = parse_xpath(path)
-        node = None
-        for elem in elements:
-            prefix = elem[0]
-            name = elem[1]
-            if node is None:
-                node = self._find_node(f"/{prefix}:{name}")
-            else:
-                node = self._next_node(node, name)
-                if node is None:
-                    msg = f"node '{elem}' not found."
-                    raise ValueError(msg)
-        keys = []
-        for key in node.keys():
-            keys.append(key.name())
-        return keys
+        return self._schema.get_list_keys(parse_xpath(path))
+
+    def get_schema(self, xpath):
+        _, entries = self._schema.lookup(parse_xpath(xpath))
+        return entries[-1]
 
     def subscribe_notification(self, xpath, callback):
         self._connector.operational_session.subscribe_notification(xpath, callback)
@@ -3,14 +3,18 @@
 
 import re
 import logging
+import asyncio
 from concurrent import futures
+from collections import deque, OrderedDict
 import json
 import time
+import threading
 import grpc
 import random
 import libyang
 from .proto import gnmi_pb2_grpc, gnmi_pb2
 from .repo.repo import NotFoundError, ApplyFailedError
+from .repo.pool import RepositoryPool
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +26,7 @@ GRPC_STATUS_CODE_INVALID_ARGUMENT = grpc.StatusCode.INVALID_ARGUMENT.value[0]
 GRPC_STATUS_CODE_NOT_FOUND = grpc.StatusCode.NOT_FOUND.value[0]
 GRPC_STATUS_CODE_ABORTED = grpc.StatusCode.ABORTED.value[0]
 GRPC_STATUS_CODE_UNIMPLEMENTED = grpc.StatusCode.UNIMPLEMENTED.value[0]
+GRPC_STATUS_CODE_RESOURCE_EXHAUSTED = grpc.StatusCode.RESOURCE_EXHAUSTED.value[0]
 REGEX_PTN_LIST_KEY = re.compile(r"\[.*.*\]")
 
 
@@ -29,6 +34,10 @@ class InvalidArgumentError(Exception):
     pass
 
 
+class QueueOverflowError(Exception):
+    pass
+
+
 def _parse_gnmi_path(gnmi_path):
     xpath = ""
     for elem in gnmi_path.elem:
@@ -59,6 +68,124 @@ def _build_gnmi_path(xpath):
     return gnmi_path
 
 
+_INT_TYPES = frozenset(["int8", "int16", "int32", "int64"])
+_UINT_TYPES = frozenset(["uint8", "uint16", "uint32", "uint64"])
+_STRING_TYPES = frozenset(
+    [
+        "string",
+        "enumeration",
+        "identityref",
+        "bits",
+        "binary",
+        "instance-identifier",
+    ]
+)
+# RFC 7951 encodes them as JSON strings not to lose precision.
+_JSON_IETF_STRING_TYPES = frozenset(["int64", "uint64", "decimal64"])
+
+
+def _child_schema(schema, name):
+    if schema is None:
+        return None
+    return schema.child_entry(name.rpartition(":")[2])
+
+
+def _key_str(val):
+    if isinstance(val, bool):
+        return "true" if val else "false"
+    return str(val)
+
+
+def _typed_value(val, basetype):
+    if basetype in _UINT_TYPES:
+        return gnmi_pb2.TypedValue(uint_val=int(val))
+    if basetype in _INT_TYPES:
+        return gnmi_pb2.TypedValue(int_val=int(val))
+    if basetype == "boolean":
+        return gnmi_pb2.TypedValue(bool_val=val)
+    if basetype == "decimal64":
+        return gnmi_pb2.TypedValue(double_val=float(val))
+    if basetype == "empty":
+        return gnmi_pb2.TypedValue(json_ietf_val=b"[null]")
+    if basetype in _STRING_TYPES:
+        return gnmi_pb2.TypedValue(string_val=str(val))
+    # Types of union and leafref are decided by the value.
+    if isinstance(val, bool):
+        return gnmi_pb2.TypedValue(bool_val=val)
+    if isinstance(val, int):
+        if val < 0:
+            return gnmi_pb2.TypedValue(int_val=val)
+        return gnmi_pb2.TypedValue(uint_val=val)
+    if isinstance(val, float):
+        return gnmi_pb2.TypedValue(double_val=val)
+    return gnmi_pb2.TypedValue(string_val=str(val))
+
+
+def _is_list(data, schema):
+    if schema is not None:
+        return schema.keyword == "list"
+    return len(data) > 0 and isinstance(data[0], dict)
+
+
+def _encode_proto(data, schema, elems, updates):
+    """Encode a data tree into gNMI Updates of each leaf.
+
+    Args:
+        data (any): Data tree to encode.
+        schema (SchemaEntry): Schema of the root node of the data tree. If it is None, values are typed by their
+            python types.
+        elems (list of gnmi_pb2.PathElem): Path to the root node of the data tree.
+        updates (list of gnmi_pb2.Update): Encoded Updates are appended to this.
+    """
+    if isinstance(data, dict):
+        for name, val in data.items():
+            elem = gnmi_pb2.PathElem(name=name)
+            _encode_proto(val, _child_schema(schema, name), elems + [elem], updates)
+    elif isinstance(data, list) and _is_list(data, schema) and len(elems) > 0:
+        last = elems[-1]
+        keys = [] if schema is None else schema.keys
+        for item in data:
+            key = dict(last.key)
+            for k in keys:
+                if k in item:
+                    key[k] = _key_str(item[k])
+            elem = gnmi_pb2.PathElem(name=last.name, key=key)
+            _encode_proto(item, schema, elems[:-1] + [elem], updates)
+    else:
+        basetype = None if schema is None else schema.basetype
+        if isinstance(data, list):
+            element = [_typed_value(v, basetype) for v in data]
+            tv = gnmi_pb2.TypedValue(leaflist_val=gnmi_pb2.ScalarArray(element=element))
+        else:
+            tv = _typed_value(data, basetype)
+        updates.append(gnmi_pb2.Update(path=gnmi_pb2.Path(elem=elems), val=tv))
+
+
+def _encode_json_ietf(data, schema):
+    """Convert a data tree into the form of RFC 7951 JSON encoding.
+
+    Args:
+        data (any): Data tree to convert.
+        schema (SchemaEntry): Schema of the root node of the data tree. If it is None, values are not converted.
+
+    Returns:
+        any: Converted data tree.
+    """
+    if isinstance(data, dict):
+        return {
+            name: _encode_json_ietf(val, _child_schema(schema, name))
+            for name, val in data.items()
+        }
+    if isinstance(data, list):
+        return [_encode_json_ietf(v, schema) for v in data]
+    basetype = None if schema is None else schema.basetype
+    if basetype in _JSON_IETF_STRING_TYPES:
+        return str(data)
+    if basetype == "empty":
+        return [None]
+    return data
+
+
 class Request:
     """Base class of Request for gNMI services.
 
@@ -104,6 +231,7 @@ class GetRequest(Request):
     Attributes:
         result (any): Retrieved data according to the requested path from the datastore.
         timestamp (int): Timestamp of the data. It is nanoseconds since the Unix epoch.
+        updates (list of gnmi_pb2.Update): Retrieved data encoded by encode().
     """
 
     def exec(self):
@@ -136,6 +264,59 @@ class GetRequest(Request):
         """
         return json.dumps(self.result)
 
+    def _schema(self):
+        try:
+            return self.repo.get_schema(self.xpath)
+        except (NotImplementedError, ValueError) as e:
+            logger.debug("schema of %s is not available. %s", self.xpath, e)
+            return None
+
+    def json_ietf_result(self):
+        """Get retrieved data in JSON format defined in RFC 7951.
+
+        It requires the repository to access the schema.
+
+        Returns:
+            str: Retrieved data in JSON format defined in RFC 7951.
+        """
+        return json.dumps(_encode_json_ietf(self.result, self._schema()))
+
+    def proto_result(self):
+        """Get retrieved data as gNMI Updates of each leaf with typed values.
+
+        It requires the repository to access the schema.
+
+        Returns:
+            list of gnmi_pb2.Update: Updates of each leaf. Their paths are relative to the prefix.
+        """
+        updates = []
+        _encode_proto(self.result, self._schema(), list(self.gnmi_path.elem), updates)
+        return updates
+
+    def encode(self, encoding):
+        """Encode retrieved data into gNMI Updates.
+
+        The result is stored in `updates`. It requires the repository to access the schema.
+
+        Args:
+            encoding (gnmi_pb2.Encoding): Encoding of the Updates.
+        """
+        try:
+            if encoding == gnmi_pb2.Encoding.PROTO:
+                self.updates = self.proto_result()
+                return
+            tv = gnmi_pb2.TypedValue()
+            if encoding == gnmi_pb2.Encoding.JSON_IETF:
+                tv.json_ietf_val = self.json_ietf_result().encode()
+            else:
+                tv.json_val = self.json_result().encode()
+            self.updates = [gnmi_pb2.Update(path=self.gnmi_path, val=tv)]
+        except Exception as e:
+            msg = f"failed to encode data. {self.xpath}: {e}"
+            logger.error(msg)
+            self.status.code = GRPC_STATUS_CODE_UNKNOWN
+            self.status.message = msg
+
 
 class SetRequest(Request):
     """Base class for each SetRequest operation; DELETE, REPLACE and UPDATE.
@@ -145,19 +326,39 @@ class SetRequest(Request):
         leaves (dict): Dictionary which returns values to set with xpath of leaf.
     """
 
+    OP_NAME = "set"
+    SCALAR_VALS = frozenset(
+        [
+            "string_val",
+            "int_val",
+            "uint_val",
+            "bool_val",
+            "double_val",
+            "float_val",
+        ]
+    )
+
     def __init__(self, repo, prefix, gnmi_path):
         super().__init__(repo, prefix, gnmi_path)
         self.leaves = {}
 
     def _decode_val(self, val):
-        if val.HasField("json_val"):
+        t = val.WhichOneof("value")
+        if t == "json_val":
             return json.loads(val.json_val)
-        else:
-            t = val.WhichOneof("value")
-            msg = f"encoding {t} is not supported."
-            logger.error(msg)
-            self.status.code = GRPC_STATUS_CODE_UNIMPLEMENTED
-            self.status.message = msg
+        if t == "json_ietf_val":
+            return json.loads(val.json_ietf_val)
+        if t in self.SCALAR_VALS:
+            return getattr(val, t)
+        if t == "leaflist_val":
+            elements = val.leaflist_val.element
+            types = [e.WhichOneof("value") for e in elements]
+            if all(et in self.SCALAR_VALS for et in types):
+                return [getattr(e, et) for e, et in zip(elements, types)]
+        msg = f"encoding {t} is not supported."
+        logger.error(msg)
+        self.status.code = GRPC_STATUS_CODE_UNIMPLEMENTED
+        self.status.message = msg
 
     def _is_container(self, val):
         return isinstance(val, dict)
@@ -196,19 +397,66 @@ class SetRequest(Request):
             keys_str = f"{keys_str}[{key}='{val}']"
         return f"{path}{keys_str}"
 
-    def _get_leaves(self, val, path):
+    def _get_leaves(self, val, path, leaves=None):
+        if leaves is None:
+            leaves = self.leaves
         if self._is_container(val):
             for k, v in val.items():
                 next_path = f"{path}/{k}"
-                self._get_leaves(v, next_path)
+                self._get_leaves(v, next_path, leaves)
         elif self._is_container_list(val):
             for container in val:
                 next_path = self._xpath_with_keys(container, path)
                 # Add container instance.
-                self.leaves[next_path] = None
-                self._get_leaves(container, next_path)
+                leaves[next_path] = None
+                self._get_leaves(container, next_path, leaves)
         else:
-            self.leaves[path] = val
+            leaves[path] = val
+
+    def _set_leaf(self, xpath, val):
+        """Set a value to a leaf. It updates the status on failure.
+
+        Returns:
+            bool: True if succeeded.
+        """
+        try:
+            self.repo.set(xpath, val)
+        except ValueError as e:
+            msg = f"failed to {self.OP_NAME}. xpath: {xpath} or value: {val} is invalid. {e}"
+            logger.error(msg)
+            self.status.code = GRPC_STATUS_CODE_INVALID_ARGUMENT
+            self.status.message = msg
+            return False
+        except Exception as e:
+            msg = f"failed to {self.OP_NAME}. xpath: {xpath}, value: {val}. {e}"
+            logger.error(msg)
+            self.status.code = GRPC_STATUS_CODE_UNKNOWN
+            self.status.message = msg
+            return False
+        return True
+
+    def _val_into_tree(self):
+        """Build a data tree from the top of the module with the decoded value.
+
+        Returns:
+            (str, dict): The module name and the data tree. None if the module is not specified in the xpath.
+        """
+        elements = list(libyang.xpath_split(self.xpath))
+        module = elements[0][0]
+        if module is None:
+            return None
+        tree = self.val
+        for i in reversed(range(len(elements))):
+            prefix, name, keys = elements[i]
+            if i > 0 and prefix is not None:
+                name = f"{prefix}:{name}"
+            if len(keys) > 0:
+                entry = {k: v for k, v in keys}
+                if self._is_container(tree):
+                    entry.update(tree)
+                tree = [entry]
+            tree = {name: tree}
+        return module, tree
 
     def _parse_val_into_leaves(self, val):
         decoded_val = self._decode_val(val)
@@ -255,19 +503,100 @@ class DeleteRequest(SetRequest):
 class ReplaceRequest(SetRequest):
     """SetRequest for operation REPLACE.
 
+    It compares the requested value with the current configuration and only registers changes for the differences.
+    Replacing a subtree with the same value changes nothing.
+
     Attributes:
         operation: Operation type of the Set service. To be specified "REPLACE".
+        deletes (list of str): Xpaths deleted by the request. Available after exec().
+        updates (dict): Values set by the request with xpaths of leaves. Available after exec().
     """
 
+    OP_NAME = "replace"
+
     def __init__(self, repo, prefix, gnmi_path, val):
         super().__init__(repo, prefix, gnmi_path)
         self.operation = gnmi_pb2.UpdateResult.Operation.REPLACE
         self._parse_val_into_leaves(val)
+        self.deletes = []
+        self.updates = {}
 
-    def exec(self, repo):
-        # TODO: Delete value of not specified leaves. If default value is specified, the datastore will set the value.
-        # TODO: Set value of specified leaves.
-        pass
+    def _canonical(self, val):
+        # Types of data from the repository may differ from the requested ones, e.g. uint64 in a string.
+        if isinstance(val, list):
+            return [self._canonical(v) for v in val]
+        if isinstance(val, bool):
+            return "true" if val else "false"
+        if val is None:
+            return None
+        return str(val)
+
+    def _get_current_leaves(self):
+        current = self.repo.get_config(self.xpath)
+        leaves = {}
+        if self._is_container(current) or self._is_container_list(current):
+            self._get_leaves(current, self.xpath, leaves)
+        else:
+            leaves[self.xpath] = current
+        return leaves
+
+    def _diff(self, current):
+        deletes = []
+        # Delete from parents not to delete children of deleted list entries one by one.
+        for path in sorted(set(current) - set(self.leaves), key=len):
+            if any(path.startswith(d + "/") for d in deletes):
+                continue
+            deletes.append(path)
+        updates = {}
+        for path, val in self.leaves.items():
+            if path in current and self._canonical(current[path]) == self._canonical(
+                val
+            ):
+                continue
+            updates[path] = val
+        return deletes, updates
+
+    def exec(self):
+        try:
+            current = self._get_current_leaves()
+        except NotFoundError:
+            current = {}
+        except ValueError as e:
+            msg = f"failed to replace. {self.xpath} is invalid. {e}"
+            logger.error(msg)
+            self.status.code = GRPC_STATUS_CODE_INVALID_ARGUMENT
+            self.status.message = msg
+            return
+        except Exception as e:
+            msg = f"failed to replace. failed to get current data of {self.xpath}. {e}"
+            logger.error(msg)
+            self.status.code = GRPC_STATUS_CODE_UNKNOWN
+            self.status.message = msg
+            return
+        if self.status.code != GRPC_STATUS_CODE_OK:
+            return
+        self.deletes, self.updates = self._diff(current)
+        logger.debug(
+            "Replace %s: deletes: %s, updates: %s",
+            self.xpath,
+            self.deletes,
+            self.updates,
+        )
+        for path in self.deletes:
+            try:
+                self.repo.delete(path)
+            except NotFoundError:
+                pass
+            except Exception as e:
+                msg = f"failed to replace. failed to delete {path}. {e}"
+                logger.error(msg)
+                self.status.code = GRPC_STATUS_CODE_UNKNOWN
+                self.status.message = msg
+                return
+        for path, val in self.updates.items():
+            # A leaf-list is replaced as a whole.
+            if not self._set_leaf(path, val):
+                return
 
 
 class UpdateRequest(SetRequest):
@@ -277,41 +606,194 @@ class UpdateRequest(SetRequest):
         operation: Operation type of the Set service. To be specified "UPDATE".
     """
 
+    OP_NAME = "update"
+
     def __init__(self, repo, prefix, gnmi_path, val):
         super().__init__(repo, prefix, gnmi_path)
         self.operation = gnmi_pb2.UpdateResult.Operation.UPDATE
         self._parse_val_into_leaves(val)
 
     def exec(self):
+        tree = self._val_into_tree()
+        if tree is None:
+            self._exec_leaves()
+            return
+        module, data = tree
+        logger.debug("Update tree: %s = %s", module, data)
+        try:
+            self.repo.set_batch(module, data)
+        except NotImplementedError:
+            self._exec_leaves()
+        except ValueError as e:
+            self._attribute_error(GRPC_STATUS_CODE_INVALID_ARGUMENT, e)
+        except Exception as e:
+            self._attribute_error(GRPC_STATUS_CODE_UNKNOWN, e)
+
+    def _attribute_error(self, code, e):
+        # The batch does not tell which leaf is wrong. Retry leaf by leaf to find it. The Set fails in either case
+        # because the repository may have discarded other changes on the error.
+        logger.debug("failed to update %s in a batch. %s", self.xpath, e)
+        self._exec_leaves()
+        if self.status.code == GRPC_STATUS_CODE_OK:
+            msg = f"failed to update. xpath: {self.xpath}. {e}"
+            logger.error(msg)
+            self.status.code = code
+            self.status.message = msg
+
+    def _exec_leaves(self):
         for k in self.leaves:
             val = self.leaves.get(k)
             if not isinstance(val, list):
                 val = [val]
             for v in val:
                 logger.debug("Update leaf: %s = %s", k, v)
-                try:
-                    self.repo.set(k, v)
-                except ValueError as e:
-                    msg = f"failed to update. xpath: {k} or value: {v} is invalid. {e}"
-                    logger.error(msg)
-                    self.status.code = GRPC_STATUS_CODE_INVALID_ARGUMENT
-                    self.status.message = msg
+                if not self._set_leaf(k, v):
                     return
-                except Exception as e:
-                    msg = f"failed to update. xpath: {k}, value: {v}. {e}"
-                    logger.error(msg)
-                    self.status.code = GRPC_STATUS_CODE_UNKNOWN
-                    self.status.message = msg
+
+
+class NotificationQueue:
+    """Bounded queue of notifications for a subscribe request.
+
+    Producers put() notifications from the notification callback and a consumer blocks on get() until notifications
+    arrive. When the queue is full, it follows the overflow policy:
+
+        drop-oldest: Drop the oldest data notification.
+        coalesce: Replace a queued notification for the same path with the new one. If there is no notification for
+            the path, drop the oldest data notification.
+        disconnect: Drop all queued notifications and make the consumer fail with QueueOverflowError.
+
+    Sync responses are never dropped or coalesced.
+
+    Args:
+        max_size (int): Maximum number of queued notifications.
+        overflow_policy (str): Overflow policy. One of OVERFLOW_POLICIES.
+
+    Attributes:
+        dropped (int): The number of notifications dropped or coalesced due to overflows.
+    """
+
+    OVERFLOW_DROP_OLDEST = "drop-oldest"
+    OVERFLOW_COALESCE = "coalesce"
+    OVERFLOW_DISCONNECT = "disconnect"
+    OVERFLOW_POLICIES = [OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_DISCONNECT]
+
+    def __init__(self, max_size, overflow_policy):
+        if max_size < 1:
+            raise ValueError(f"max_size should be larger than 0: {max_size}")
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy: {overflow_policy}")
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+        # Entries are [path, notification]. A path is None for a sync response.
+        self._queue = deque()
+        # The latest entry for each path. It is used to coalesce notifications.
+        self._entries = {}
+        self._overflowed = False
+        self._cond = threading.Condition()
+        self._listener = None
+        self.dropped = 0
+
+    def __len__(self):
+        with self._cond:
+            return len(self._queue)
+
+    def _forget(self, entry):
+        if entry[0] is not None and self._entries.get(entry[0]) is entry:
+            del self._entries[entry[0]]
+
+    def _drop_oldest(self):
+        for i, entry in enumerate(self._queue):
+            if entry[0] is not None:
+                del self._queue[i]
+                self._forget(entry)
+                self.dropped += 1
+                return
+
+    def set_listener(self, listener):
+        """Set a function called after a notification is put.
+
+        It allows a consumer to wait for notifications without blocking a thread (e.g. on an asyncio event loop).
+        The listener is called in the producer's thread.
+
+        Args:
+            listener (func): Function without arguments. None to unset.
+        """
+        self._listener = listener
+
+    def put(self, notification, path=None):
+        """Put a notification.
+
+        Args:
+            notification (gnmi_pb2.SubscribeResponse): Notification to put.
+            path (str or tupple): Path of the data the notification is for. Tupple of paths for a bulk notification.
+                None for a sync response.
+        """
+        self._put(notification, path)
+        listener = self._listener
+        if listener is not None:
+            listener()
+
+    def _put(self, notification, path):
+        with self._cond:
+            if self._overflowed:
+                return
+            if len(self._queue) >= self._max_size and path is not None:
+                if self._overflow_policy == self.OVERFLOW_DISCONNECT:
+                    self._overflowed = True
+                    self._queue.clear()
+                    self._entries.clear()
+                    self._cond.notify_all()
                     return
+                if self._overflow_policy == self.OVERFLOW_COALESCE:
+                    entry = self._entries.get(path)
+                    if entry is not None:
+                        entry[1] = notification
+                        self.dropped += 1
+                        return
+                self._drop_oldest()
+            entry = [path, notification]
+            self._queue.append(entry)
+            if path is not None:
+                self._entries[path] = entry
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Get all queued notifications.
+
+        It blocks until a notification arrives or the timeout expires.
+
+        Args:
+            timeout (float): Seconds to wait for notifications. None means waiting forever.
+
+        Returns:
+            list of gnmi_pb2.SubscribeResponse: Notifications in arrival order. It is empty if the timeout expired.
+
+        Raises:
+            QueueOverflowError: The queue overflowed under the disconnect policy.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: len(self._queue) > 0 or self._overflowed, timeout
+            )
+            if self._overflowed:
+                raise QueueOverflowError(
+                    f"notification queue overflowed. max size: {self._max_size}"
+                )
+            notifications = [entry[1] for entry in self._queue]
+            self._queue.clear()
+            self._entries.clear()
+            return notifications
 
 
 class SubscribeRequest:
     """Request for gNMI Subscribe service.
 
     Attributes:
-        repo (Repository): Repository to access the datastore.
+        pool (RepositoryPool): Pool of repositories to access the datastore.
         rid (int): Request ID.
         subscribe (gnmi_pb2.SubscriptionList): gNMI subscribe request body.
+        max_notifs (int): Maximum number of notifications queued for the client.
+        overflow_policy (str): Policy applied when the notification queue is full. See NotificationQueue.
     """
 
     PATH_SR = "/goldstone-telemetry:subscribe-requests/subscribe-request[id='{}']"
@@ -329,11 +811,26 @@ class SubscribeRequest:
         gnmi_pb2.SubscriptionMode.SAMPLE: "SAMPLE",
     }
 
-    def __init__(self, repo, rid, subscribe):
-        self._repo = repo
+    DEFAULT_MAX_NOTIFS = 16384
+    DEFAULT_OVERFLOW_POLICY = NotificationQueue.OVERFLOW_COALESCE
+
+    def __init__(
+        self,
+        pool,
+        rid,
+        subscribe,
+        max_notifs=DEFAULT_MAX_NOTIFS,
+        overflow_policy=DEFAULT_OVERFLOW_POLICY,
+    ):
+        self._pool = pool
         self._rid = rid
         self._config = self._parse_config(subscribe)
-        self._notifs = []
+        self._notifs = NotificationQueue(max_notifs, overflow_policy)
+
+    @property
+    def rid(self):
+        """int: Request ID."""
+        return self._rid
 
     def _parse_subscription_config(self, sid, config):
         if not config.HasField("path"):
@@ -378,6 +875,7 @@ class SubscribeRequest:
             prefix + "/config/id": self._rid,
             prefix + "/config/mode": self._config["mode"],
             prefix + "/config/updates-only": self._config["updates-only"],
+            prefix + "/config/bulk-updates": True,
         }
         for s in self._config["subscriptions"]:
             sid = s["id"]
@@ -395,8 +893,7 @@ class SubscribeRequest:
                     configs[sprefix + "/config/heartbeat-interval"] = s[
                         "heartbeat-interval"
                     ]
-        with self._repo() as repo:
-            repo.start()
+        with self._pool.acquire() as repo:
             for path, value in configs.items():
                 try:
                     repo.set(path, value)
@@ -412,8 +909,7 @@ class SubscribeRequest:
                 raise InvalidArgumentError(msg) from e
 
     def clear(self):
-        with self._repo() as repo:
-            repo.start()
+        with self._pool.acquire() as repo:
             try:
                 repo.delete(self.PATH_SR.format(self._rid))
                 repo.apply()
@@ -453,19 +949,166 @@ class SubscribeRequest:
                 )
             )
         if sr is not None:
-            self._notifs.insert(0, sr)
+            self._notifs.put(sr, notif.get("path"))
+
+    def push_bulk_notif(self, notif):
+        """Push a bulk notification as a gNMI notification with many updates.
+
+        A queued bulk notification is coalesced only with a new one for the same set of paths.
+
+        Args:
+            notif (dict): Content of telemetry-bulk-notify-event.
+        """
+        timestamp = time.time_ns()
+        updates = notif.get("update", [])
+        deletes = notif.get("delete", [])
+        sr = gnmi_pb2.SubscribeResponse(
+            update=gnmi_pb2.Notification(
+                timestamp=timestamp,
+                update=[
+                    gnmi_pb2.Update(
+                        path=_build_gnmi_path(update["path"]),
+                        val=gnmi_pb2.TypedValue(json_val=update["json-data"].encode()),
+                    )
+                    for update in updates
+                ],
+                delete=[_build_gnmi_path(path) for path in deletes],
+            )
+        )
+        key = (tuple(update["path"] for update in updates), tuple(deletes))
+        self._notifs.put(sr, key)
 
     def poll_notifs(self):
-        with self._repo() as repo:
-            repo.start()
+        with self._pool.acquire() as repo:
             repo.exec_rpc(self.PATH_POLL, {"id": self._rid})
 
-    def pull_notifs(self):
-        while True:
-            try:
-                yield self._notifs.pop()
-            except IndexError:
-                break
+    def set_listener(self, listener):
+        """Set a function called when a notification arrives. See NotificationQueue.set_listener().
+
+        Args:
+            listener (func): Function without arguments. None to unset.
+        """
+        self._notifs.set_listener(listener)
+
+    def pull_notifs(self, timeout=None):
+        """Pull queued notifications.
+
+        Args:
+            timeout (float): Seconds to wait for notifications. None means waiting forever.
+
+        Returns:
+            list of gnmi_pb2.SubscribeResponse: Notifications. It is empty if the timeout expired.
+
+        Raises:
+            QueueOverflowError: The client could not keep up with the notifications.
+        """
+        return self._notifs.get(timeout)
+
+
+class GetCache:
+    """LRU cache of Get results with a short TTL.
+
+    Decoded results are keyed by a normalized xpath. They are encoded for each request, so requests in any encoding
+    share an entry. A cached entry keeps the timestamp of the original retrieval so that clients can tell how old the
+    served data is. Statistics are logged at the debug level every STATS_LOG_INTERVAL seconds while the cache is
+    looked up.
+
+    Args:
+        ttl (float): Seconds to keep a result.
+        max_entries (int): Maximum number of results to keep. The least recently used one is evicted first.
+
+    Attributes:
+        ttl (float): Seconds to keep a result.
+        max_entries (int): Maximum number of results to keep.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups not served from the cache.
+    """
+
+    DEFAULT_TTL = 0
+    DEFAULT_MAX_ENTRIES = 1024
+    STATS_LOG_INTERVAL = 60
+
+    def __init__(self, ttl, max_entries=DEFAULT_MAX_ENTRIES):
+        if ttl <= 0:
+            raise ValueError(f"ttl should be larger than 0: {ttl}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries should be larger than 0: {max_entries}")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stats_logged = time.monotonic()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, xpath):
+        """Look up a cached result.
+
+        Args:
+            xpath (str): Normalized xpath of the result.
+
+        Returns:
+            tupple: (timestamp, result) of the cached result. None if it is not cached or has been expired.
+        """
+        key = xpath
+        now = time.monotonic()
+        with self._lock:
+            if now - self._stats_logged >= self.STATS_LOG_INTERVAL:
+                self._stats_logged = now
+                logger.debug(
+                    "Get cache hits: %d, misses: %d, entries: %d",
+                    self.hits,
+                    self.misses,
+                    len(self._entries),
+                )
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, xpath, timestamp, result):
+        """Cache a result.
+
+        Args:
+            xpath (str): Normalized xpath of the result.
+            timestamp (int): Timestamp of the result. It is nanoseconds since the Unix epoch.
+            result (any): Retrieved data. It should not be modified after it is cached.
+        """
+        key = xpath
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires, timestamp, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Get statistics of the cache.
+
+        Returns:
+            dict: The number of hits, misses and cached entries.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
 
 
 class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
@@ -474,22 +1117,78 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
     Args:
         repo (Repository): Datastore instance where requested data are get, set or delete.
         supported_models (dict): List of yang models supported by the gNMI server.
-    """
+        pool (RepositoryPool): Pool of started repositories to serve requests. If it is None, the servicer creates
+            and owns a pool of the repo.
+        max_notifs (int): Maximum number of notifications queued for each Subscribe stream.
+        overflow_policy (str): Policy applied when a notification queue is full. See NotificationQueue.
+        get_cache_ttl (float): Seconds to cache Get results. If it is 0, Get results are not cached.
+        get_cache_max_entries (int): Maximum number of Get results to cache.
+        get_concurrency (int): Maximum number of paths of a Get request retrieved concurrently. Each of them uses a
+            repository of the pool.
 
-    SUPPORTED_ENCODINGS = [gnmi_pb2.Encoding.JSON]
-    NOTIFICATION_PULL_INTERVAL = 0.01
+    Attributes:
+        get_cache (GetCache): Cache of Get results. None if caching is disabled.
+    """
 
-    def __init__(self, repo, supported_models):
+    SUPPORTED_ENCODINGS = [
+        gnmi_pb2.Encoding.JSON,
+        gnmi_pb2.Encoding.JSON_IETF,
+        gnmi_pb2.Encoding.PROTO,
+    ]
+    NOTIFICATION_WAIT_TIMEOUT = 1
+    DEFAULT_GET_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        repo,
+        supported_models,
+        pool=None,
+        max_notifs=SubscribeRequest.DEFAULT_MAX_NOTIFS,
+        overflow_policy=SubscribeRequest.DEFAULT_OVERFLOW_POLICY,
+        get_cache_ttl=GetCache.DEFAULT_TTL,
+        get_cache_max_entries=GetCache.DEFAULT_MAX_ENTRIES,
+        get_concurrency=DEFAULT_GET_CONCURRENCY,
+    ):
         super().__init__()
         self.repo = repo
         self.supported_models = supported_models
+        self.max_notifs = max_notifs
+        self.overflow_policy = overflow_policy
+        self._own_pool = pool is None
+        if self._own_pool:
+            pool = RepositoryPool(repo)
+        self.pool = pool
+        self.get_cache = None
+        if get_cache_ttl > 0:
+            self.get_cache = GetCache(get_cache_ttl, get_cache_max_entries)
+        if get_concurrency < 1:
+            raise ValueError(
+                f"get_concurrency should be larger than 0: {get_concurrency}"
+            )
+        self.get_concurrency = get_concurrency
+        self._get_executor = None
+        if get_concurrency > 1:
+            # Concurrent Get requests share the threads. Each of them is limited by get_concurrency.
+            self._get_executor = futures.ThreadPoolExecutor(max_workers=pool.max_size)
         self._subscribe_requests = {}
         self._subscribe_repo = self.repo()
         self._subscribe_repo.start()
+        # NOTE: Subscribe all telemetry notifications at once. Notifications of a subscription are delivered in order,
+        #   so bulk updates never overtake the following sync response.
         self._subscribe_repo.subscribe_notification(
-            "/goldstone-telemetry:telemetry-notify-event", self._notification_cb
+            "/goldstone-telemetry:*", self._notification_cb
         )
 
+    def stop(self):
+        """Release all repositories held by the servicer."""
+        if self.get_cache is not None:
+            logger.info("Get cache statistics: %s", self.get_cache.stats())
+        self._subscribe_repo.stop()
+        if self._get_executor is not None:
+            self._get_executor.shutdown()
+        if self._own_pool:
+            self.pool.close()
+
     def Capabilities(self, request, context):
         return gnmi_pb2.CapabilityResponse(
             supported_models=[
@@ -526,43 +1225,101 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
             requests.append(gr)
         return requests
 
-    def _exec_get_requests(self, requests):
-        for r in requests:
+    def _exec_get_request(self, r, encoding):
+        cached = None
+        if self.get_cache is not None:
+            cached = self.get_cache.get(r.xpath)
+        if cached is not None:
+            r.timestamp, r.result = cached
+        else:
             r.exec()
             if r.status.code != GRPC_STATUS_CODE_OK:
                 return r.status
+            if self.get_cache is not None:
+                self.get_cache.put(r.xpath, r.timestamp, r.result)
+        # Encode it for each request while the repository is available to access the schema. Paths of the Updates
+        # depend on how the request splits the xpath into the prefix and the path.
+        r.encode(encoding)
+        if r.status.code != GRPC_STATUS_CODE_OK:
+            return r.status
+
+    def _exec_get_requests(self, requests, encoding):
+        for r in requests:
+            error = self._exec_get_request(r, encoding)
+            if error is not None:
+                return error
+
+    def _exec_pooled_get_request(self, r, encoding):
+        with self.pool.acquire() as repo:
+            r.repo = repo
+            try:
+                return self._exec_get_request(r, encoding)
+            finally:
+                r.repo = None
+
+    def _exec_get_requests_concurrently(self, requests, encoding):
+        # The caller must not hold a repository of the pool. Otherwise, it may wait for the requests forever which
+        # wait for a repository.
+        pending = set()
+        failed = False
+        index = 0
+        while index < len(requests) or len(pending) > 0:
+            # Stop dispatching on a failure, as the sequential execution does.
+            while (
+                not failed
+                and index < len(requests)
+                and len(pending) < self.get_concurrency
+            ):
+                f = self._get_executor.submit(
+                    self._exec_pooled_get_request, requests[index], encoding
+                )
+                pending.add(f)
+                index += 1
+            if len(pending) == 0:
+                break
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for f in done:
+                if f.result() is not None:
+                    failed = True
+        # Report the error of the first failed request in order.
+        for r in requests:
+            if r.status.code != GRPC_STATUS_CODE_OK:
+                return r.status
+
+    def _set_context_error(self, context, error):
+        status_code = self._get_status_code(error.code)
+        details = error.message
+        context.set_code(status_code)
+        context.set_details(details)
+        logger.debug("gRPC StatusCode: %s, details: %s", status_code, details)
 
     def Get(self, request, context):
+        response, error = self._get(request)
+        if error is not None:
+            self._set_context_error(context, error)
+        return response
+
+    def _get(self, request):
         error = self._verify_encoding(request.encoding)
         if error is None:
-            with self.repo() as repo:
-                repo.start()
-                requests = self._collect_get_requests(request, repo)
-                error = self._exec_get_requests(requests)
+            if self._get_executor is not None and len(request.path) > 1:
+                requests = self._collect_get_requests(request, None)
+                error = self._exec_get_requests_concurrently(requests, request.encoding)
+            else:
+                with self.pool.acquire() as repo:
+                    requests = self._collect_get_requests(request, repo)
+                    error = self._exec_get_requests(requests, request.encoding)
         if error is not None:
-            status_code = self._get_status_code(error.code)
-            details = error.message
-            context.set_code(status_code)
-            context.set_details(details)
-            logger.debug("gRPC StatusCode: %s, details: %s", status_code, details)
-            return gnmi_pb2.GetResponse(error=error)
+            return gnmi_pb2.GetResponse(error=error), error
         notifications = []
         for r in requests:
-            tv = gnmi_pb2.TypedValue()
-            tv.json_val = r.json_result().encode()
-            # tv.json_ietf_val = r.json_result().encode()
-            u = gnmi_pb2.Update(
-                path=r.gnmi_path,
-                val=tv,
-            )
-            updates = [u]
             n = gnmi_pb2.Notification(
                 timestamp=r.timestamp,
                 prefix=request.prefix,
-                update=updates,
+                update=r.updates,
             )
             notifications.append(n)
-        return gnmi_pb2.GetResponse(notification=notifications)
+        return gnmi_pb2.GetResponse(notification=notifications), None
 
     def _collect_set_requests(self, request, repo):
         prefix = request.prefix
@@ -627,8 +1384,13 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
             )
 
     def Set(self, request, context):
-        with self.repo() as repo:
-            repo.start()
+        response, error = self._set(request)
+        if error is not None:
+            self._set_context_error(context, error)
+        return response
+
+    def _set(self, request):
+        with self.pool.acquire() as repo:
             requests, error_requests, error = self._collect_set_requests(request, repo)
             if error is None:
                 error_requests, error = self._exec_set_requests(requests)
@@ -638,6 +1400,9 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
                 self._set_status_code_aborted(requests, error_requests)
                 logger.error("Set() discards all changes.")
                 repo.discard()
+            elif self.get_cache is not None:
+                # Cached results may no longer reflect the datastore.
+                self.get_cache.clear()
         timestamp = time.time_ns()
         results = []
         for r in requests:
@@ -649,11 +1414,6 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
             )
             results.append(ur)
         if error is not None:
-            status_code = self._get_status_code(error.code)
-            details = error.message
-            context.set_code(status_code)
-            context.set_details(details)
-            logger.debug("gRPC StatusCode: %s, details: %s", status_code, details)
             logger.debug(
                 "SetRequest StatusCode: %s", self._get_status_code(error.code).name
             )
@@ -663,12 +1423,13 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
                     gnmi_pb2.UpdateResult.Operation.Name(r.operation),
                     self._get_status_code(r.status.code).name,
                 )
-        return gnmi_pb2.SetResponse(
+        response = gnmi_pb2.SetResponse(
             prefix=request.prefix,
             response=results,
             message=error,
             timestamp=timestamp,
         )
+        return response, error
 
     def _notification_cb(self, xpath, notif_type, value, timestamp, priv):
         rid = value["request-id"]
@@ -679,7 +1440,10 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
                 "Subscribe request %s related to the notification is not found.", rid
             )
             return
-        sr.push_notif(value)
+        if xpath.endswith(":telemetry-bulk-notify-event"):
+            sr.push_bulk_notif(value)
+        else:
+            sr.push_notif(value)
 
     def _generate_subscribe_request_id(self):
         while True:
@@ -687,61 +1451,82 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
             if rid not in self._subscribe_requests.keys():
                 return rid
 
-    def _notify_current_states(self, sr):
+    def _notify_current_states(self, sr, context):
         sync_response = False
-        while True:
-            for notification in sr.pull_notifs():
+        while context.is_active():
+            # The timeout only bounds how long a cancelled stream may hold its worker thread.
+            for notification in sr.pull_notifs(self.NOTIFICATION_WAIT_TIMEOUT):
                 yield notification
                 if notification.sync_response:
                     sync_response = True
             if sync_response:
                 break
-            time.sleep(self.NOTIFICATION_PULL_INTERVAL)
 
     def _notify_updated_states(self, sr, context):
-        while True:
-            if not context.is_active():
-                break
-            for notification in sr.pull_notifs():
+        while context.is_active():
+            for notification in sr.pull_notifs(self.NOTIFICATION_WAIT_TIMEOUT):
                 yield notification
-            time.sleep(self.NOTIFICATION_PULL_INTERVAL)
 
-    def Subscribe(self, request_iterator, context):
-        def set_error(code, msg):
-            logger.error(msg)
-            context.set_code(code)
-            context.set_details(msg)
-            return gnmi_pb2.Error(code=code, message=msg)
+    def _open_subscribe_request(self, subscribe):
+        """Create a subscribe request and configure it to the datastore.
 
-        # Create a subscription.
-        req = next(request_iterator)
-        mode = req.subscribe.mode
+        Args:
+            subscribe (gnmi_pb2.SubscriptionList): gNMI subscribe request body.
+
+        Returns:
+            (SubscribeRequest, int, str): The subscribe request, a status code and an error message. The subscribe
+                request is None if it failed.
+        """
         rid = self._generate_subscribe_request_id()
-        error = None
         try:
-            sr = SubscribeRequest(self.repo, rid, req.subscribe)
+            sr = SubscribeRequest(
+                self.pool,
+                rid,
+                subscribe,
+                max_notifs=self.max_notifs,
+                overflow_policy=self.overflow_policy,
+            )
             self._subscribe_requests[rid] = sr
             sr.exec()
         except InvalidArgumentError as e:
-            error = set_error(
+            self._close_subscribe_request(rid)
+            return (
+                None,
                 GRPC_STATUS_CODE_INVALID_ARGUMENT,
                 f"request has invalid argument(s). {e}",
             )
         except Exception as e:
-            error = set_error(
-                GRPC_STATUS_CODE_UNKNOWN, f"an unknown error has occurred. {e}"
-            )
-        if error is not None:
-            try:
-                self._subscribe_requests[rid].clear()
-                del self._subscribe_requests[rid]
-            except KeyError:
-                pass
+            self._close_subscribe_request(rid)
+            return None, GRPC_STATUS_CODE_UNKNOWN, f"an unknown error has occurred. {e}"
+        return sr, GRPC_STATUS_CODE_OK, None
+
+    def _close_subscribe_request(self, rid):
+        try:
+            self._subscribe_requests[rid].clear()
+            del self._subscribe_requests[rid]
+        except KeyError:
+            pass
+
+    def Subscribe(self, request_iterator, context):
+        def set_error(code, msg):
+            logger.error(msg)
+            context.set_code(code)
+            context.set_details(msg)
+            return gnmi_pb2.Error(code=code, message=msg)
+
+        # Create a subscription.
+        req = next(request_iterator)
+        mode = req.subscribe.mode
+        sr, code, msg = self._open_subscribe_request(req.subscribe)
+        if sr is None:
+            error = set_error(code, msg)
             return gnmi_pb2.SubscribeResponse(error=error)
+        rid = sr.rid
+        error = None
 
         # Generate notifications.
         try:
-            for notification in self._notify_current_states(sr):
+            for notification in self._notify_current_states(sr, context):
                 yield notification
             if mode == gnmi_pb2.SubscriptionList.Mode.POLL:
                 for req in request_iterator:
@@ -752,24 +1537,158 @@ class gNMIServicer(gnmi_pb2_grpc.gNMIServicer):
                         )
                         break
                     sr.poll_notifs()
-                    for notification in self._notify_current_states(sr):
+                    for notification in self._notify_current_states(sr, context):
                         yield notification
             elif mode == gnmi_pb2.SubscriptionList.Mode.STREAM:
                 for notification in self._notify_updated_states(sr, context):
                     yield notification
+        except QueueOverflowError as e:
+            error = set_error(
+                GRPC_STATUS_CODE_RESOURCE_EXHAUSTED,
+                f"the client is too slow to receive notifications. {e}",
+            )
         except Exception as e:
             error = set_error(
                 GRPC_STATUS_CODE_UNKNOWN, f"an unknown error has occurred. {e}"
             )
         finally:
-            self._subscribe_requests[rid].clear()
-            del self._subscribe_requests[rid]
+            self._close_subscribe_request(rid)
         if error is None:
             return gnmi_pb2.SubscribeResponse()
         else:
             return gnmi_pb2.SubscribeResponse(error=error)
 
 
+class gNMIAsyncServicer(gnmi_pb2_grpc.gNMIServicer):
+    """gNMIAsyncServicer provides an asyncio implementation of the methods of the gNMI service for grpc.aio.
+
+    It shares the request handling of gNMIServicer. Blocking datastore accesses are offloaded to the executor. Subscribe
+    streams wait for notifications on the event loop, so they do not occupy threads of the executor.
+
+    Args:
+        servicer (gNMIServicer): Servicer to handle requests.
+        executor (concurrent.futures.Executor): Executor to run blocking datastore accesses.
+    """
+
+    def __init__(self, servicer, executor):
+        super().__init__()
+        self._servicer = servicer
+        self._executor = executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def Capabilities(self, request, context):
+        return self._servicer.Capabilities(request, context)
+
+    async def Get(self, request, context):
+        response, error = await self._run(self._servicer._get, request)
+        if error is not None:
+            self._servicer._set_context_error(context, error)
+        return response
+
+    async def Set(self, request, context):
+        response, error = await self._run(self._servicer._set, request)
+        if error is not None:
+            self._servicer._set_context_error(context, error)
+        return response
+
+    async def _notify(self, sr, event, until_sync_response):
+        while True:
+            # Clear the event before pulling not to miss a notification pushed in between.
+            event.clear()
+            notifications = sr.pull_notifs(0)
+            if len(notifications) == 0:
+                await event.wait()
+                continue
+            sync_response = False
+            for notification in notifications:
+                yield notification
+                if notification.sync_response:
+                    sync_response = True
+            if until_sync_response and sync_response:
+                break
+
+    async def Subscribe(self, request_iterator, context):
+        def set_error(code, msg):
+            logger.error(msg)
+            context.set_code(code)
+            context.set_details(msg)
+
+        # Create a subscription.
+        req = await request_iterator.__anext__()
+        mode = req.subscribe.mode
+        sr, code, msg = await self._run(
+            self._servicer._open_subscribe_request, req.subscribe
+        )
+        if sr is None:
+            set_error(code, msg)
+            return
+
+        # Generate notifications.
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        sr.set_listener(lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            async for notification in self._notify(sr, event, True):
+                yield notification
+            if mode == gnmi_pb2.SubscriptionList.Mode.POLL:
+                async for req in request_iterator:
+                    if not req.HasField("poll"):
+                        set_error(
+                            GRPC_STATUS_CODE_INVALID_ARGUMENT,
+                            "the request is not a 'poll' request.",
+                        )
+                        break
+                    await self._run(sr.poll_notifs)
+                    async for notification in self._notify(sr, event, True):
+                        yield notification
+            elif mode == gnmi_pb2.SubscriptionList.Mode.STREAM:
+                async for notification in self._notify(sr, event, False):
+                    yield notification
+        except QueueOverflowError as e:
+            set_error(
+                GRPC_STATUS_CODE_RESOURCE_EXHAUSTED,
+                f"the client is too slow to receive notifications. {e}",
+            )
+        except asyncio.CancelledError:
+            logger.debug("Subscribe request %s is cancelled.", sr.rid)
+            raise
+        except Exception as e:
+            set_error(GRPC_STATUS_CODE_UNKNOWN, f"an unknown error has occurred. {e}")
+        finally:
+            sr.set_listener(None)
+            await self._run(self._servicer._close_subscribe_request, sr.rid)
+
+
+def _load_supported_models(supported_models_file):
+    with open(supported_models_file, "r") as f:
+        try:
+            return json.loads(f.read())
+        except json.JSONDecodeError as e:
+            logger.error("%s is not JSON format.: %s", supported_models_file, e)
+            exit()
+
+
+def _add_ports(
+    server, secure_port, insecure_port, private_key_file, certificate_chain_file
+):
+    port = None
+    if private_key_file is not None and certificate_chain_file is not None:
+        with open(private_key_file, "rb") as f:
+            private_key = f.read()
+        with open(certificate_chain_file, "rb") as f:
+            certificate_chain = f.read()
+        credentials = grpc.ssl_server_credentials(((private_key, certificate_chain),))
+        port = server.add_secure_port(f"[::]:{secure_port}", credentials)
+    if insecure_port is not None:
+        port = server.add_insecure_port(f"[::]:{insecure_port}")
+    if port is None:
+        logger.error("No ports to listen.")
+        exit()
+
+
 def serve(
     repo,
     max_workers=10,
@@ -778,52 +1697,153 @@ def serve(
     private_key_file=None,
     certificate_chain_file=None,
     supported_models_file=None,
+    max_notifs=SubscribeRequest.DEFAULT_MAX_NOTIFS,
+    overflow_policy=SubscribeRequest.DEFAULT_OVERFLOW_POLICY,
+    get_cache_ttl=GetCache.DEFAULT_TTL,
+    get_cache_max_entries=GetCache.DEFAULT_MAX_ENTRIES,
+    get_concurrency=gNMIServicer.DEFAULT_GET_CONCURRENCY,
 ):
     """Run a gNMI server.
 
+    Each call occupies a thread of the server while it is processed. Note that a Subscribe call occupies a thread
+    until the stream is closed.
+
     Args:
         repo (Repository): Datastore instance where requested data will be retrieved.
-        max_workers (int): The number of threads to execute calls asynchronously.
+        max_workers (int): The number of threads to execute calls asynchronously. It also limits the number of
+            repositories pooled for the calls.
         secure_port (int): gNMI server listens this port number for secure connections.
         insecure_port (int): gNMI server listens this port number for insecure connections.
             If it is None, the gNMI server does not accept insecure connection.
         private_key_file (str): Path to a PEM-encoded private key file.
         certificate_chain_file (str): Path to a PEM-encoded certificate chain file.
         supported_models_file (str): Path to a JSON file which is listed yang models supported by the gNMI server.
+        max_notifs (int): Maximum number of notifications queued for each Subscribe stream.
+        overflow_policy (str): Policy applied when a notification queue is full. See NotificationQueue.
+        get_cache_ttl (float): Seconds to cache Get results. If it is 0, Get results are not cached.
+        get_cache_max_entries (int): Maximum number of Get results to cache.
+        get_concurrency (int): Maximum number of paths of a Get request retrieved concurrently.
     """
     logger.info(
         "gNMI server serves as: max_workers=%d, secure_port=%d, insecure_port=%s,"
-        " private_key_file=%s, certificate_chain_file=%s, supported_models_file=%s",
+        " private_key_file=%s, certificate_chain_file=%s, supported_models_file=%s,"
+        " max_notifs=%d, overflow_policy=%s, get_cache_ttl=%s, get_cache_max_entries=%d,"
+        " get_concurrency=%d",
         max_workers,
         secure_port,
         insecure_port,
         private_key_file,
         certificate_chain_file,
         supported_models_file,
+        max_notifs,
+        overflow_policy,
+        get_cache_ttl,
+        get_cache_max_entries,
+        get_concurrency,
     )
 
-    with open(supported_models_file, "r") as f:
-        try:
-            supported_models = json.loads(f.read())
-        except json.JSONDecodeError as e:
-            logger.error("%s is not JSON format.: %s", supported_models_file, e)
-            exit()
+    supported_models = _load_supported_models(supported_models_file)
+    pool = RepositoryPool(repo, max_size=max_workers)
+    servicer = gNMIServicer(
+        repo,
+        supported_models,
+        pool=pool,
+        max_notifs=max_notifs,
+        overflow_policy=overflow_policy,
+        get_cache_ttl=get_cache_ttl,
+        get_cache_max_entries=get_cache_max_entries,
+        get_concurrency=get_concurrency,
+    )
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
-    gnmi_pb2_grpc.add_gNMIServicer_to_server(
-        gNMIServicer(repo, supported_models), server
+    gnmi_pb2_grpc.add_gNMIServicer_to_server(servicer, server)
+    _add_ports(
+        server, secure_port, insecure_port, private_key_file, certificate_chain_file
     )
-    port = None
-    if private_key_file is not None and certificate_chain_file is not None:
-        with open(private_key_file, "rb") as f:
-            private_key = f.read()
-        with open(certificate_chain_file, "rb") as f:
-            certificate_chain = f.read()
-        credentials = grpc.ssl_server_credentials(((private_key, certificate_chain),))
-        port = server.add_secure_port(f"[::]:{secure_port}", credentials)
-    if insecure_port is not None:
-        port = server.add_insecure_port(f"[::]:{insecure_port}")
-    if port is None:
-        logger.error("No ports to listen.")
-        exit()
     server.start()
-    server.wait_for_termination()
+    try:
+        server.wait_for_termination()
+    finally:
+        servicer.stop()
+        pool.close()
+
+
+async def serve_async(
+    repo,
+    max_workers=10,
+    secure_port=51051,
+    insecure_port=None,
+    private_key_file=None,
+    certificate_chain_file=None,
+    supported_models_file=None,
+    max_notifs=SubscribeRequest.DEFAULT_MAX_NOTIFS,
+    overflow_policy=SubscribeRequest.DEFAULT_OVERFLOW_POLICY,
+    get_cache_ttl=GetCache.DEFAULT_TTL,
+    get_cache_max_entries=GetCache.DEFAULT_MAX_ENTRIES,
+    get_concurrency=gNMIServicer.DEFAULT_GET_CONCURRENCY,
+):
+    """Run a gNMI server on grpc.aio.
+
+    Calls are processed on the event loop and only datastore accesses use threads. The number of concurrent
+    Subscribe streams is not limited by the number of threads.
+
+    Args:
+        repo (Repository): Datastore instance where requested data will be retrieved.
+        max_workers (int): The number of threads to access the datastore. It also limits the number of repositories
+            pooled for the accesses.
+        secure_port (int): gNMI server listens this port number for secure connections.
+        insecure_port (int): gNMI server listens this port number for insecure connections.
+            If it is None, the gNMI server does not accept insecure connection.
+        private_key_file (str): Path to a PEM-encoded private key file.
+        certificate_chain_file (str): Path to a PEM-encoded certificate chain file.
+        supported_models_file (str): Path to a JSON file which is listed yang models supported by the gNMI server.
+        max_notifs (int): Maximum number of notifications queued for each Subscribe stream.
+        overflow_policy (str): Policy applied when a notification queue is full. See NotificationQueue.
+        get_cache_ttl (float): Seconds to cache Get results. If it is 0, Get results are not cached.
+        get_cache_max_entries (int): Maximum number of Get results to cache.
+        get_concurrency (int): Maximum number of paths of a Get request retrieved concurrently.
+    """
+    logger.info(
+        "gNMI asyncio server serves as: max_workers=%d, secure_port=%d, insecure_port=%s,"
+        " private_key_file=%s, certificate_chain_file=%s, supported_models_file=%s,"
+        " max_notifs=%d, overflow_policy=%s, get_cache_ttl=%s, get_cache_max_entries=%d,"
+        " get_concurrency=%d",
+        max_workers,
+        secure_port,
+        insecure_port,
+        private_key_file,
+        certificate_chain_file,
+        supported_models_file,
+        max_notifs,
+        overflow_policy,
+        get_cache_ttl,
+        get_cache_max_entries,
+        get_concurrency,
+    )
+
+    supported_models = _load_supported_models(supported_models_file)
+    pool = RepositoryPool(repo, max_size=max_workers)
+    servicer = gNMIServicer(
+        repo,
+        supported_models,
+        pool=pool,
+        max_notifs=max_notifs,
+        overflow_policy=overflow_policy,
+        get_cache_ttl=get_cache_ttl,
+        get_cache_max_entries=get_cache_max_entries,
+        get_concurrency=get_concurrency,
+    )
+    executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+    server = grpc.aio.server()
+    gnmi_pb2_grpc.add_gNMIServicer_to_server(
+        gNMIAsyncServicer(servicer, executor), server
+    )
+    _add_ports(
+        server, secure_port, insecure_port, private_key_file, certificate_chain_file
+    )
+    await server.start()
+    try:
+        await server.wait_for_termination()
+    finally:
+        servicer.stop()
+        executor.shutdown()
+        pool.close()
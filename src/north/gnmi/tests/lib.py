@@ -37,6 +37,10 @@ class MockRepository(Repository):
         if self.exception is not None:
             raise self.exception
 
+    def set_batch(self, module, data):
+        if self.exception is not None:
+            raise self.exception
+
     def delete(self, xpath):
         if self.exception is not None:
             raise self.exception
@@ -251,7 +255,7 @@ class gNMIServerTestCase(unittest.IsolatedAsyncioTestCase):
             self.rpc.cancel()
         except Exception:
             pass
-        self.servicer._subscribe_repo.stop()
+        self.servicer.stop()
         self.tasks = []
         self.conn.stop()
         self.q.put({"type": "stop"})
@@ -3,7 +3,9 @@
 # pylint: disable=W0212,C0103
 
 import unittest
+import asyncio
 import time
+from concurrent import futures
 import json
 import grpc
 import sysrepo
@@ -14,10 +16,17 @@ from goldstone.north.gnmi.server import (
     SetRequest,
     UpdateRequest,
     DeleteRequest,
+    ReplaceRequest,
+    NotificationQueue,
+    QueueOverflowError,
+    SubscribeRequest,
+    GetCache,
+    gNMIAsyncServicer,
 )
 from goldstone.north.gnmi.proto import gnmi_pb2
 from goldstone.north.gnmi.repo.repo import NotFoundError
 from goldstone.north.gnmi.repo.sysrepo import Sysrepo
+from goldstone.north.gnmi.repo.pool import RepositoryPool, PoolClosedError
 
 
 def append_path_element(path: gnmi_pb2.Path, name, key=None, val=None):
@@ -89,6 +98,38 @@ class TestGetRequest(unittest.TestCase):
         self.assertDictEqual(request.result, {"name": "c1"})
         self.assertEqual(request.json_result(), '{"name": "c1"}')
 
+    def test_proto_result_without_schema(self):
+        data = {
+            "components": {
+                "component": [
+                    {
+                        "name": "c1",
+                        "state": {"temperature": -3, "used-power": 10},
+                    }
+                ]
+            }
+        }
+        repo = MockRepository(data=data)
+        prefix = gnmi_pb2.Path()
+        append_path_element(prefix, "openconfig-platform:components")
+        path = gnmi_pb2.Path()
+        append_path_element(path, "component", "name", "c1")
+        request = GetRequest(repo, prefix, path)
+        request.exec()
+        request.encode(gnmi_pb2.Encoding.PROTO)
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+        actual = {}
+        for u in request.updates:
+            self.assertEqual(u.path.elem[0], path.elem[0])
+            name = "/".join(e.name for e in u.path.elem[1:])
+            actual[name] = u.val
+        expected = {
+            "name": gnmi_pb2.TypedValue(string_val="c1"),
+            "state/temperature": gnmi_pb2.TypedValue(int_val=-3),
+            "state/used-power": gnmi_pb2.TypedValue(uint_val=10),
+        }
+        self.assertEqual(actual, expected)
+
 
 class TestSetRequest(unittest.TestCase):
     """Tests for SetRequest."""
@@ -107,6 +148,39 @@ class TestSetRequest(unittest.TestCase):
         )
         self.assertEqual(request.status, expected_status)
 
+    def test_decode_val_json_ietf(self):
+        p = gnmi_pb2.Path()
+        request = SetRequest(None, p, p)
+        val = gnmi_pb2.TypedValue()
+        val.json_ietf_val = b'{"a": {"b": "B", "c": "18446744073709551615"}}'
+        expected = {"a": {"b": "B", "c": "18446744073709551615"}}
+        actual = request._decode_val(val)
+        self.assertEqual(actual, expected)
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+
+    def test_decode_val_scalar(self):
+        p = gnmi_pb2.Path()
+        request = SetRequest(None, p, p)
+        vals = [
+            (gnmi_pb2.TypedValue(string_val="A"), "A"),
+            (gnmi_pb2.TypedValue(int_val=-1), -1),
+            (gnmi_pb2.TypedValue(uint_val=1), 1),
+            (gnmi_pb2.TypedValue(bool_val=False), False),
+            (gnmi_pb2.TypedValue(double_val=0.5), 0.5),
+        ]
+        for val, expected in vals:
+            actual = request._decode_val(val)
+            self.assertEqual(actual, expected)
+        leaflist = gnmi_pb2.ScalarArray(
+            element=[
+                gnmi_pb2.TypedValue(uint_val=1),
+                gnmi_pb2.TypedValue(uint_val=2),
+            ]
+        )
+        actual = request._decode_val(gnmi_pb2.TypedValue(leaflist_val=leaflist))
+        self.assertEqual(actual, [1, 2])
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+
     def test_decode_val_ascii(self):
         p = gnmi_pb2.Path()
         request = SetRequest(None, p, p)
@@ -452,6 +526,95 @@ class TestDeleteRequest(unittest.TestCase):
         self.assertEqual(request.status, expected_status)
 
 
+class RecordingRepository(MockRepository):
+    def __init__(self, config=None):
+        super().__init__()
+        self.config = config
+        self.sets = {}
+        self.deletes = []
+
+    def get_config(self, xpath):
+        if self.config is None:
+            raise NotFoundError(xpath)
+        return self.config
+
+    def get_list_keys(self, path):
+        return ["name"]
+
+    def set(self, xpath, data):
+        self.sets[xpath] = data
+
+    def delete(self, xpath):
+        self.deletes.append(xpath)
+
+
+class TestReplaceRequest(unittest.TestCase):
+    """Tests for ReplaceRequest."""
+
+    def replace_request(self, repo, val_src):
+        prefix = gnmi_pb2.Path()
+        append_path_element(prefix, "openconfig-platform:components")
+        path = gnmi_pb2.Path()
+        append_path_element(path, "component", "name", "c1")
+        val = gnmi_pb2.TypedValue()
+        val.json_val = json.dumps(val_src).encode()
+        request = ReplaceRequest(repo, prefix, path, val)
+        self.assertEqual(request.operation, gnmi_pb2.UpdateResult.Operation.REPLACE)
+        return request
+
+    def test_replace_request(self):
+        xpath = "/openconfig-platform:components/component[name='c1']"
+        current = {
+            "name": "c1",
+            "config": {"name": "c1", "description": "d1"},
+            "subcomponents": {
+                "subcomponent": [
+                    {"name": "s1", "config": {"name": "s1"}},
+                    {"name": "s2", "config": {"name": "s2"}},
+                ]
+            },
+        }
+        val_src = {
+            "name": "c1",
+            "config": {"name": "c1", "location": "l1"},
+            "subcomponents": {
+                "subcomponent": [
+                    {"name": "s1", "config": {"name": "s1"}},
+                ]
+            },
+        }
+        repo = RecordingRepository(current)
+        request = self.replace_request(repo, val_src)
+        request.exec()
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+        self.assertEqual(
+            repo.deletes,
+            [
+                f"{xpath}/config/description",
+                f"{xpath}/subcomponents/subcomponent[name='s2']",
+            ],
+        )
+        self.assertEqual(repo.sets, {f"{xpath}/config/location": "l1"})
+
+    def test_replace_request_without_changes(self):
+        current = {"name": "c1", "config": {"name": "c1", "description": "d1"}}
+        repo = RecordingRepository(current)
+        request = self.replace_request(repo, current)
+        request.exec()
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+        self.assertEqual(repo.deletes, [])
+        self.assertEqual(repo.sets, {})
+
+    def test_replace_request_not_found(self):
+        xpath = "/openconfig-platform:components/component[name='c1']"
+        repo = RecordingRepository()
+        request = self.replace_request(repo, {"name": "c1"})
+        request.exec()
+        self.assertEqual(request.status.code, grpc.StatusCode.OK.value[0])
+        self.assertEqual(repo.deletes, [])
+        self.assertEqual(repo.sets, {f"{xpath}/name": "c1"})
+
+
 class TestUpdateRequest(unittest.TestCase):
     """Tests for UpdateRequest."""
 
@@ -482,6 +645,41 @@ class TestUpdateRequest(unittest.TestCase):
         )
         self.assertEqual(request.status, expected_status)
 
+    def test_val_into_tree(self):
+        prefix = gnmi_pb2.Path()
+        append_path_element(prefix, "openconfig-interfaces:interfaces")
+        path = gnmi_pb2.Path()
+        append_path_element(path, "interface", "name", "eth0")
+        append_path_element(path, "subinterfaces")
+        val = gnmi_pb2.TypedValue()
+        val_src = {"subinterface": [{"index": 0, "config": {"index": 0}}]}
+        val.json_val = json.dumps(val_src).encode()
+        request = UpdateRequest(MockRepository(), prefix, path, val)
+        expected = (
+            "openconfig-interfaces",
+            {
+                "interfaces": {
+                    "interface": [
+                        {
+                            "name": "eth0",
+                            "subinterfaces": val_src,
+                        }
+                    ]
+                }
+            },
+        )
+        self.assertEqual(request._val_into_tree(), expected)
+
+    def test_val_into_tree_without_module(self):
+        prefix = gnmi_pb2.Path()
+        path = gnmi_pb2.Path()
+        append_path_element(path, "interfaces")
+        append_path_element(path, "interface", "name", "eth0")
+        val = gnmi_pb2.TypedValue()
+        val.json_val = json.dumps({"name": "eth0"}).encode()
+        request = UpdateRequest(MockRepository(), prefix, path, val)
+        self.assertIsNone(request._val_into_tree())
+
     def test_update_request_invalid_argument_error(self):
         prefix = gnmi_pb2.Path()
         append_path_element(prefix, "aaa:bbb")
@@ -505,6 +703,262 @@ class TestUpdateRequest(unittest.TestCase):
         self.assertEqual(request.status, expected_status)
 
 
+class TestSysrepo(unittest.TestCase):
+    """Tests for Sysrepo."""
+
+    def test_get_list_keys(self):
+        with Sysrepo() as repo:
+            repo.start()
+            for i in range(3):
+                keys = repo.get_list_keys(
+                    f"/openconfig-interfaces:interfaces/interface[name='eth{i}']/subinterfaces/subinterface"
+                )
+                self.assertEqual(keys, ["index"])
+            self.assertEqual(
+                repo.get_list_keys("/openconfig-interfaces:interfaces/interface"),
+                ["name"],
+            )
+            self.assertEqual(
+                repo.get_list_keys("/openconfig-interfaces:interfaces"),
+                [],
+            )
+            with self.assertRaises(ValueError):
+                repo.get_list_keys("/openconfig-interfaces:interfaces/unknown")
+
+    def test_expect_single_result(self):
+        with Sysrepo() as repo:
+            repo.start()
+            f = repo._expect_single_result_when_path_includes_list_node
+            self.assertFalse(f("/openconfig-interfaces:interfaces"))
+            self.assertFalse(f("/openconfig-interfaces:interfaces/interface"))
+            for _ in range(2):
+                self.assertTrue(
+                    f("/openconfig-interfaces:interfaces/interface[name='eth0']")
+                )
+                self.assertTrue(
+                    f(
+                        "/openconfig-interfaces:interfaces/interface[name='eth0']/config/mtu"
+                    )
+                )
+            self.assertTrue(
+                f(
+                    "/openconfig-interfaces:interfaces/interface[name='eth0']/subinterfaces/subinterface"
+                )
+            )
+            self.assertFalse(
+                f(
+                    "/openconfig-interfaces:interfaces/interface/subinterfaces/subinterface[index='0']"
+                )
+            )
+
+
+class CountingRepository(MockRepository):
+    started = 0
+    stopped = 0
+    healthy = True
+
+    def start(self):
+        CountingRepository.started += 1
+
+    def stop(self):
+        CountingRepository.stopped += 1
+
+    def is_healthy(self):
+        return CountingRepository.healthy
+
+
+class TestRepositoryPool(unittest.TestCase):
+    """Tests for RepositoryPool."""
+
+    def setUp(self):
+        CountingRepository.started = 0
+        CountingRepository.stopped = 0
+        CountingRepository.healthy = True
+
+    def test_reuse(self):
+        pool = RepositoryPool(CountingRepository, max_size=2)
+        with pool.acquire() as repo1:
+            pass
+        with pool.acquire() as repo2:
+            self.assertIs(repo1, repo2)
+        self.assertEqual(CountingRepository.started, 1)
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(pool.idle, 1)
+        pool.close()
+        self.assertEqual(CountingRepository.stopped, 1)
+        self.assertEqual(pool.size, 0)
+        with self.assertRaises(PoolClosedError):
+            with pool.acquire():
+                pass
+
+    def test_bounded(self):
+        pool = RepositoryPool(CountingRepository, max_size=2)
+        with pool.acquire() as repo1:
+            with pool.acquire() as repo2:
+                self.assertIsNot(repo1, repo2)
+                with self.assertRaises(TimeoutError):
+                    with pool.acquire(timeout=0.01):
+                        pass
+        self.assertEqual(CountingRepository.started, 2)
+        self.assertEqual(pool.idle, 2)
+        pool.close()
+
+    def test_unhealthy(self):
+        pool = RepositoryPool(CountingRepository, max_size=1)
+        with pool.acquire() as repo1:
+            pass
+        CountingRepository.healthy = False
+        with pool.acquire() as repo2:
+            self.assertIsNot(repo1, repo2)
+        self.assertEqual(CountingRepository.started, 2)
+        self.assertEqual(CountingRepository.stopped, 1)
+        self.assertEqual(pool.size, 1)
+        pool.close()
+
+
+class TestNotificationQueue(unittest.TestCase):
+    """Tests for NotificationQueue."""
+
+    def test_get(self):
+        q = NotificationQueue(10, NotificationQueue.OVERFLOW_DROP_OLDEST)
+        self.assertEqual(q.get(timeout=0.01), [])
+        q.put("a", "/a")
+        q.put("b", "/b")
+        q.put("sync")
+        self.assertEqual(q.get(), ["a", "b", "sync"])
+        self.assertEqual(len(q), 0)
+
+    def test_drop_oldest(self):
+        q = NotificationQueue(2, NotificationQueue.OVERFLOW_DROP_OLDEST)
+        q.put("a1", "/a")
+        q.put("b1", "/b")
+        q.put("a2", "/a")
+        self.assertEqual(q.get(), ["b1", "a2"])
+        self.assertEqual(q.dropped, 1)
+
+    def test_coalesce(self):
+        q = NotificationQueue(2, NotificationQueue.OVERFLOW_COALESCE)
+        q.put("a1", "/a")
+        q.put("b1", "/b")
+        q.put("a2", "/a")
+        q.put("c1", "/c")
+        self.assertEqual(q.get(), ["b1", "c1"])
+        q.put("a1", "/a")
+        q.put("b1", "/b")
+        q.put("b2", "/b")
+        self.assertEqual(q.get(), ["a1", "b2"])
+
+    def test_sync_response_is_not_dropped(self):
+        q = NotificationQueue(1, NotificationQueue.OVERFLOW_DROP_OLDEST)
+        q.put("sync")
+        q.put("a1", "/a")
+        q.put("a2", "/a")
+        self.assertEqual(q.get(), ["sync", "a2"])
+
+    def test_disconnect(self):
+        q = NotificationQueue(1, NotificationQueue.OVERFLOW_DISCONNECT)
+        q.put("a1", "/a")
+        q.put("a2", "/a")
+        with self.assertRaises(QueueOverflowError):
+            q.get()
+
+
+class TestSubscribeRequest(unittest.TestCase):
+    """Tests for SubscribeRequest."""
+
+    def setUp(self):
+        subscribe = gnmi_pb2.SubscriptionList(
+            mode=gnmi_pb2.SubscriptionList.Mode.STREAM
+        )
+        self.sr = SubscribeRequest(None, 1, subscribe, max_notifs=1)
+
+    def test_push_bulk_notif(self):
+        prefix = "/openconfig-interfaces:interfaces/interface[name='Interface1/0/1']"
+        notif = {
+            "request-id": 1,
+            "subscription-id": 0,
+            "update": [
+                {"path": prefix + "/state/enabled", "json-data": "true"},
+                {"path": prefix + "/state/mtu", "json-data": "1500"},
+            ],
+            "delete": [prefix + "/state/description"],
+        }
+        self.sr.push_bulk_notif(notif)
+        actual = self.sr.pull_notifs()
+        self.assertEqual(len(actual), 1)
+        notification = actual[0].update
+        self.assertEqual(len(notification.update), 2)
+        self.assertEqual(notification.update[0].path.elem[-1].name, "enabled")
+        self.assertEqual(json.loads(notification.update[0].val.json_val), True)
+        self.assertEqual(notification.update[1].path.elem[-1].name, "mtu")
+        self.assertEqual(json.loads(notification.update[1].val.json_val), 1500)
+        self.assertEqual(len(notification.delete), 1)
+        self.assertEqual(notification.delete[0].elem[-1].name, "description")
+
+    def test_push_bulk_notif_coalesce(self):
+        path = "/openconfig-interfaces:interfaces/interface[name='Interface1/0/1']/state/mtu"
+        for value in ["1500", "9000"]:
+            notif = {
+                "request-id": 1,
+                "subscription-id": 0,
+                "update": [{"path": path, "json-data": value}],
+            }
+            self.sr.push_bulk_notif(notif)
+        actual = self.sr.pull_notifs()
+        self.assertEqual(len(actual), 1)
+        self.assertEqual(json.loads(actual[0].update.update[0].val.json_val), 9000)
+
+
+class TestGetCache(unittest.TestCase):
+    """Tests for GetCache."""
+
+    def test_get(self):
+        cache = GetCache(10)
+        self.assertIsNone(cache.get("/a"))
+        cache.put("/a", 100, {"a": 1})
+        self.assertEqual(cache.get("/a"), (100, {"a": 1}))
+        self.assertIsNone(cache.get("/b"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 2, "entries": 1})
+
+    def test_expire(self):
+        cache = GetCache(0.01)
+        cache.put("/a", 100, {"a": 1})
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("/a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_evict_least_recently_used(self):
+        cache = GetCache(10, max_entries=2)
+        cache.put("/a", 100, "a")
+        cache.put("/b", 200, "b")
+        cache.get("/a")
+        cache.put("/c", 300, "c")
+        self.assertIsNone(cache.get("/b"))
+        self.assertEqual(cache.get("/a"), (100, "a"))
+        self.assertEqual(cache.get("/c"), (300, "c"))
+
+    def test_clear(self):
+        cache = GetCache(10)
+        cache.put("/a", 100, "a")
+        cache.clear()
+        self.assertIsNone(cache.get("/a"))
+
+    def test_log_stats(self):
+        cache = GetCache(10)
+        cache.STATS_LOG_INTERVAL = 0
+        cache.put("/a", 100, "a")
+        cache.get("/a")
+        with self.assertLogs("goldstone.north.gnmi.server", level="DEBUG") as cm:
+            cache.get("/a")
+        self.assertIn("hits: 1, misses: 0, entries: 1", cm.output[0])
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            GetCache(0)
+        with self.assertRaises(ValueError):
+            GetCache(10, max_entries=0)
+
+
 class TestCapabilities(gNMIServerTestCase):
     """Tests for gNMI Capabilities service."""
 
@@ -589,7 +1043,11 @@ class TestCapabilities(gNMIServerTestCase):
                     "version": "2018-11-21",
                 },
             ],
-            "supported_encodings": [gnmi_pb2.Encoding.JSON],
+            "supported_encodings": [
+                gnmi_pb2.Encoding.JSON,
+                gnmi_pb2.Encoding.JSON_IETF,
+                gnmi_pb2.Encoding.PROTO,
+            ],
             "gNMI_version": "0.6.0",
         }
         request = gnmi_pb2.CapabilityRequest()
@@ -694,6 +1152,57 @@ class TestGet(gNMIServerTestCase):
 
         await self.run_gnmi_server_test(test)
 
+    async def test_get_cached_with_prefix(self):
+        self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
+        self.servicer.get_cache = GetCache(10)
+
+        def test():
+            path = gnmi_pb2.Path()
+            append_path_element(path, "openconfig-terminal-device:terminal-device")
+            append_path_element(path, "logical-channels")
+            append_path_element(path, "channel", "index", "1")
+            append_path_element(path, "state")
+            append_path_element(path, "index")
+            request = gnmi_pb2.GetRequest(path=[path])
+            actual, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+
+            # The same xpath split into a prefix and a path is served from the cache.
+            prefix = gnmi_pb2.Path()
+            append_path_element(prefix, "openconfig-terminal-device:terminal-device")
+            append_path_element(prefix, "logical-channels")
+            path = gnmi_pb2.Path()
+            append_path_element(path, "channel", "index", "1")
+            append_path_element(path, "state")
+            append_path_element(path, "index")
+            request = gnmi_pb2.GetRequest(prefix=prefix, path=[path])
+            cached, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+            self.assertEqual(self.servicer.get_cache.stats()["hits"], 1)
+            self.assertEqual(cached.notification[0].prefix, prefix)
+            self.assertEqual(cached.notification[0].update[0].path, path)
+            self.assertEqual(
+                cached.notification[0].timestamp, actual.notification[0].timestamp
+            )
+            self.assertEqual(
+                cached.notification[0].update[0].val,
+                actual.notification[0].update[0].val,
+            )
+
+            # Requests in other encodings share the cached result.
+            request = gnmi_pb2.GetRequest(
+                prefix=prefix, path=[path], encoding=gnmi_pb2.Encoding.PROTO
+            )
+            cached, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+            self.assertEqual(self.servicer.get_cache.stats()["hits"], 2)
+            self.assertEqual(cached.notification[0].update[0].path, path)
+            self.assertEqual(
+                cached.notification[0].update[0].val, gnmi_pb2.TypedValue(uint_val=1)
+            )
+
+        await self.run_gnmi_server_test(test)
+
     async def test_get_a_leaf_slash_in_key(self):
         mock_data = {
             "interfaces": {
@@ -784,6 +1293,98 @@ class TestGet(gNMIServerTestCase):
 
         await self.run_gnmi_server_test(test)
 
+    async def test_get_a_leaf_with_JSON_IETF_encoding(self):
+        self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
+
+        def test():
+            path = gnmi_pb2.Path()
+            append_path_element(path, "openconfig-terminal-device:terminal-device")
+            append_path_element(path, "logical-channels")
+            append_path_element(path, "channel", "index", "1")
+            append_path_element(path, "state")
+            append_path_element(path, "index")
+            request = gnmi_pb2.GetRequest(
+                path=[path], encoding=gnmi_pb2.Encoding.JSON_IETF
+            )
+            actual, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+            self.assertEqual(actual.error.code, grpc.StatusCode.OK.value[0])
+            self.assertEqual(actual.notification[0].update[0].path, path)
+            act = json.loads(
+                actual.notification[0].update[0].val.json_ietf_val.decode("utf-8")
+            )
+            self.assertEqual(act, 1)
+
+        await self.run_gnmi_server_test(test)
+
+    async def test_get_a_container_with_PROTO_encoding(self):
+        self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
+
+        def test():
+            path = gnmi_pb2.Path()
+            append_path_element(path, "openconfig-terminal-device:terminal-device")
+            append_path_element(path, "logical-channels")
+            append_path_element(path, "channel", "index", "1")
+            append_path_element(path, "state")
+            request = gnmi_pb2.GetRequest(path=[path], encoding=gnmi_pb2.Encoding.PROTO)
+            actual, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+            self.assertEqual(actual.error.code, grpc.StatusCode.OK.value[0])
+            self.assertEqual(len(actual.notification), 1)
+            act = {}
+            for u in actual.notification[0].update:
+                self.assertEqual(list(u.path.elem[:-1]), list(path.elem))
+                act[u.path.elem[-1].name] = u.val
+            expected = {
+                "index": gnmi_pb2.TypedValue(uint_val=1),
+                "description": gnmi_pb2.TypedValue(
+                    string_val="description for channel#1"
+                ),
+                "test-signal": gnmi_pb2.TypedValue(bool_val=True),
+                "link-state": gnmi_pb2.TypedValue(string_val="UP"),
+            }
+            self.assertEqual(act, expected)
+
+        await self.run_gnmi_server_test(test)
+
+    async def test_get_a_list_with_PROTO_encoding(self):
+        self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
+
+        def test():
+            path = gnmi_pb2.Path()
+            append_path_element(path, "openconfig-terminal-device:terminal-device")
+            append_path_element(path, "logical-channels")
+            append_path_element(path, "channel")
+            request = gnmi_pb2.GetRequest(path=[path], encoding=gnmi_pb2.Encoding.PROTO)
+            actual, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.OK)
+            self.assertEqual(actual.error.code, grpc.StatusCode.OK.value[0])
+            act = {}
+            for u in actual.notification[0].update:
+                channel = u.path.elem[2]
+                self.assertEqual(channel.name, "channel")
+                leaf = "/".join(e.name for e in u.path.elem[3:])
+                act[(channel.key["index"], leaf)] = u.val
+            self.assertEqual(
+                act[("1", "ingress/state/physical-channel")],
+                gnmi_pb2.TypedValue(
+                    leaflist_val=gnmi_pb2.ScalarArray(
+                        element=[
+                            gnmi_pb2.TypedValue(uint_val=0),
+                            gnmi_pb2.TypedValue(uint_val=10),
+                            gnmi_pb2.TypedValue(uint_val=100),
+                            gnmi_pb2.TypedValue(uint_val=1000),
+                        ]
+                    )
+                ),
+            )
+            self.assertEqual(
+                act[("2", "state/link-state")], gnmi_pb2.TypedValue(string_val="DOWN")
+            )
+            self.assertEqual(act[("2", "index")], gnmi_pb2.TypedValue(uint_val=2))
+
+        await self.run_gnmi_server_test(test)
+
     async def test_get_a_leaf_list(self):
         self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
 
@@ -1078,12 +1679,33 @@ class TestGet(gNMIServerTestCase):
 
         await self.run_gnmi_server_test(test)
 
+    async def test_get_multiple_paths_first_error(self):
+        self.set_mock_oper_data("openconfig-terminal-device", self.mock_data)
+
+        def test():
+            path1 = gnmi_pb2.Path()
+            append_path_element(path1, "openconfig-terminal-device:terminal-device")
+            append_path_element(path1, "logical-channels")
+            path2 = gnmi_pb2.Path()
+            append_path_element(path2, "openconfig-platform:components")
+            append_path_element(path2, "component", "name", "blah")
+            path3 = gnmi_pb2.Path()
+            append_path_element(path3, "openconfig-platform:components")
+            append_path_element(path3, "component", "name", "blah")
+            append_path_element(path3, "blah")
+            request = gnmi_pb2.GetRequest(path=[path1, path2, path3])
+            actual, code = self.gnmi_get(request)
+            self.assertEqual(code, grpc.StatusCode.NOT_FOUND)
+            self.assertEqual(actual.error.code, grpc.StatusCode.NOT_FOUND.value[0])
+
+        await self.run_gnmi_server_test(test)
+
     async def test_get_unimplemented_encoding(self):
         def test():
             path = gnmi_pb2.Path()
             append_path_element(path, "openconfig-platform:components")
             for e in gnmi_pb2.Encoding.keys():
-                if e == "JSON":
+                if e in ("JSON", "JSON_IETF", "PROTO"):
                     continue
                 request = gnmi_pb2.GetRequest(path=[path], encoding=e)
                 actual, code = self.gnmi_get(request)
@@ -1095,6 +1717,63 @@ class TestGet(gNMIServerTestCase):
         await self.run_gnmi_server_test(test)
 
 
+class MockAsyncContext:
+    def __init__(self):
+        self.code = None
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+
+class TestAsyncServicer(gNMIServerTestCase):
+    """Tests for gNMIAsyncServicer."""
+
+    MOCK_MODULES = ["openconfig-platform"]
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.executor = futures.ThreadPoolExecutor(max_workers=2)
+        self.async_servicer = gNMIAsyncServicer(self.servicer, self.executor)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+        await super().asyncTearDown()
+
+    async def test_get(self):
+        self.set_mock_oper_data(
+            "openconfig-platform",
+            {"components": {"component": [{"name": "c1", "state": {"name": "c1"}}]}},
+        )
+        await asyncio.sleep(0.5)
+        path = gnmi_pb2.Path()
+        append_path_element(path, "openconfig-platform:components")
+        append_path_element(path, "component", "name", "c1")
+        append_path_element(path, "state")
+        append_path_element(path, "name")
+        context = MockAsyncContext()
+        actual = await self.async_servicer.Get(
+            gnmi_pb2.GetRequest(path=[path]), context
+        )
+        self.assertIsNone(context.code)
+        self.assertEqual(actual.error.code, grpc.StatusCode.OK.value[0])
+        self.assertEqual(actual.notification[0].update[0].val.json_val, b'"c1"')
+
+    async def test_get_unimplemented_encoding(self):
+        path = gnmi_pb2.Path()
+        append_path_element(path, "openconfig-platform:components")
+        context = MockAsyncContext()
+        actual = await self.async_servicer.Get(
+            gnmi_pb2.GetRequest(path=[path], encoding=gnmi_pb2.Encoding.ASCII),
+            context,
+        )
+        self.assertEqual(context.code, grpc.StatusCode.UNIMPLEMENTED)
+        self.assertEqual(actual.error.code, grpc.StatusCode.UNIMPLEMENTED.value[0])
+
+
 class TestSet(gNMIServerTestCase):
     """Tests for gNMI server Set service."""
 
@@ -3190,6 +3869,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -3330,6 +4010,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -3473,6 +4154,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -3617,6 +4299,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -3762,6 +4445,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -3883,6 +4567,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -4026,6 +4711,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "STREAM",
                             "updates-only": True,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -4149,6 +4835,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "ONCE",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -4257,6 +4944,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "ONCE",
                             "updates-only": True,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -4348,6 +5036,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "POLL",
                             "updates-only": False,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -4477,6 +5166,7 @@ class TestSubscribe(gNMIServerTestCase):
                             "id": generated_id,
                             "mode": "POLL",
                             "updates-only": True,
+                            "bulk-updates": True,
                         },
                         "subscriptions": {
                             "subscription": [
@@ -30,13 +30,19 @@ class IfChangeHandler(ChangeHandler):
         self.xpath = xpath
         ifname = xpath[1][2][0][1]
 
-        self.obj = await self.server.ifname2taiobj(ifname)
+        self.obj, self.module = await self.server.ifname2taiobj(
+            ifname, with_module=True
+        )
         if self.obj == None:
             raise InvalArgError("Invalid Interface name")
 
         self.ifname = ifname
         self.tai_attr_name = None
 
+    def resource_key(self):
+        # provision-mode and signal-rate change state of the whole module. interfaces of a module are not independent
+        return self.module.location
+
     async def validate(self, user):
         if not self.tai_attr_name:
             return
@@ -277,6 +283,10 @@ class PinModeHandler(IfChangeHandler):
     def to_tai_value(self, v, attr_name):
         return v.lower()
 
+    def resource_key(self):
+        # removes and creates conflicting interfaces
+        return None
+
     async def apply(self, user):
         self._removed = await self.remove()
         await super().apply(user)
@@ -582,7 +592,18 @@ def parse_macsec_counters(attrs):
 
 
 class InterfaceServer(ServerBase):
-    def __init__(self, conn, taish_server, platform_info):
+    # seconds to cache operational data. 0 disables the cache
+    DEFAULT_OPER_CACHE_TTL = 0
+    DEFAULT_COUNTERS_CACHE_TTL = 0.1
+
+    def __init__(
+        self,
+        conn,
+        taish_server,
+        platform_info,
+        oper_cache_ttl=DEFAULT_OPER_CACHE_TTL,
+        counters_cache_ttl=DEFAULT_COUNTERS_CACHE_TTL,
+    ):
         super().__init__(conn, "goldstone-interfaces")
         ifinfo = {}
         clkinfo = {}
@@ -604,6 +625,17 @@ class InterfaceServer(ServerBase):
         self.notif_task_q = asyncio.Queue()
         self.is_initializing = True
         self.oidmap = {}  # key: oid, value: obj
+        # each apply is a round trip to taish. apply changes of different modules concurrently
+        self.apply_concurrency = 16
+        # sysrepo may pull the same data for several clients at once. counters change all the time,
+        # so a short TTL only coalesces those pulls
+        self.oper_cache_ttl = {}
+        if oper_cache_ttl > 0:
+            self.oper_cache_ttl["/goldstone-interfaces:interfaces"] = oper_cache_ttl
+        if counters_cache_ttl > 0:
+            self.oper_cache_ttl[
+                "/goldstone-interfaces:interfaces/interface/state/counters"
+            ] = counters_cache_ttl
         self.handlers = {
             "interfaces": {
                 "interface": {
@@ -866,6 +898,9 @@ class InterfaceServer(ServerBase):
                 if oper_status == "unknown":
                     continue
                 notif = {"if-name": ifname, "oper-status": oper_status.upper()}
+                self.invalidate_oper_cache(
+                    f"/goldstone-interfaces:interfaces/interface[name='{ifname}']/state"
+                )
                 self.send_notification(eventname, notif)
 
         async def notif_loop():
@@ -985,19 +1020,20 @@ class InterfaceServer(ServerBase):
             return i
 
         obj = await self.ifname2taiobj(ifname)
-        pm = await obj.get("pin-mode")
-        p = self.get_interface_info(ifname, pm)
-        if p:
-            v = {}
-            if "component" in p:
-                v["platform"] = {"component": p["component"]["name"]}
-            if "tai" in p:
-                t = {
-                    "module": p["tai"]["module"]["name"],
-                    "host-interface": p["tai"]["hostif"]["name"],
-                }
-                v["transponder"] = t
-            i["component-connection"] = v
+        if not counter_only:
+            pm = await obj.get("pin-mode")
+            p = self.get_interface_info(ifname, pm)
+            if p:
+                v = {}
+                if "component" in p:
+                    v["platform"] = {"component": p["component"]["name"]}
+                if "tai" in p:
+                    t = {
+                        "module": p["tai"]["module"]["name"],
+                        "host-interface": p["tai"]["hostif"]["name"],
+                    }
+                    v["transponder"] = t
+                i["component-connection"] = v
 
         if len(xpath) == 3 and xpath[2][1] == "component-connection":
             return i
@@ -1195,7 +1231,10 @@ class InterfaceServer(ServerBase):
 
     async def oper_cb(self, xpath, priv):
         xpath = list(libyang.xpath_split(xpath))
-        counter_only = False
+        # Retrieve only counters if they are requested, e.g. by a telemetry subscription.
+        counter_only = (
+            len(xpath) > 3 and xpath[2][1] == "state" and xpath[3][1] == "counters"
+        )
 
         if len(xpath) < 2 or len(xpath[1][2]) < 1:
             ifnames = await self.get_ifname_list()
@@ -1206,8 +1245,6 @@ class InterfaceServer(ServerBase):
                 ifnames = [(name, obj, module)]
             elif xpath[1][2][0][0] == "state/goldstone-gearbox:associated-gearbox":
                 ifnames = await self.get_ifname_list(xpath[1][2][0][1])
-            elif len(xpath) == 4 and xpath[3][1] == "counters":
-                counter_only = True
             else:
                 logger.warn(f"invalid request: {xpath}")
                 return
@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 
 def main():
-    async def _main(taish_server, platform_info):
+    async def _main(taish_server, platform_info, oper_cache_ttl, counters_cache_ttl):
         loop = asyncio.get_event_loop()
         stop_event = asyncio.Event()
         loop.add_signal_handler(signal.SIGINT, stop_event.set)
@@ -24,7 +24,13 @@ def main():
 
         conn = Connector()
 
-        ifserver = InterfaceServer(conn, taish_server, platform_info)
+        ifserver = InterfaceServer(
+            conn,
+            taish_server,
+            platform_info,
+            oper_cache_ttl=oper_cache_ttl,
+            counters_cache_ttl=counters_cache_ttl,
+        )
         gb = GearboxServer(conn, ifserver)
         servers = [gb, ifserver]  # order matters
 
@@ -54,6 +60,18 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("-v", "--verbose", action="store_true")
     parser.add_argument("-s", "--taish-server", default="127.0.0.1:50051")
+    parser.add_argument(
+        "--oper-cache-ttl",
+        type=float,
+        default=InterfaceServer.DEFAULT_OPER_CACHE_TTL,
+        help="seconds to cache interface operational data. 0 disables the cache",
+    )
+    parser.add_argument(
+        "--counters-cache-ttl",
+        type=float,
+        default=InterfaceServer.DEFAULT_COUNTERS_CACHE_TTL,
+        help="seconds to cache interface counters. 0 disables the cache",
+    )
     parser.add_argument("platform_file", metavar="platform-file")
 
     args = parser.parse_args()
@@ -70,7 +88,14 @@ def main():
     with open(args.platform_file) as f:
         platform_info = json.loads(f.read())
 
-    asyncio.run(_main(args.taish_server, platform_info))
+    asyncio.run(
+        _main(
+            args.taish_server,
+            platform_info,
+            args.oper_cache_ttl,
+            args.counters_cache_ttl,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -68,7 +68,10 @@ class TestBase(unittest.IsolatedAsyncioTestCase):
             elif args[0] == "num-pgmrclk":
                 return "4"
 
+        self.get_logs = []
+
         async def get(spec, *args, **kwargs):
+            self.get_logs.append(args[0])
             if args[0] in ["alarm-notification", "notify"]:
                 return "(nil)"
             elif args[0] == "pcs-status":
@@ -292,6 +295,19 @@ class TestInterfaceServer(TestBase):
 
         await asyncio.create_task(asyncio.to_thread(test))
 
+    async def test_oper_cb_counters(self):
+        def test():
+            conn = Connector()
+            self.get_logs.clear()
+            prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+            v = conn.get_operational(prefix + "/state/counters")
+            self.assertTrue(v)
+            # Only counters of the requested interface are retrieved.
+            self.assertEqual(self.get_logs.count("pmon-enet-mac-rx"), 1)
+            self.assertNotIn("provision-mode", self.get_logs)
+
+        await asyncio.create_task(asyncio.to_thread(test))
+
     async def test_fec(self):
         def test():
             conn = Connector()
@@ -47,6 +47,9 @@ class TAIHandler(ChangeHandler):
         self.value = None
         self.original_value = None
 
+    def resource_key(self):
+        return self.module.location
+
     async def validate(self, user):
         if not self.attr_name:
             return
@@ -266,6 +269,8 @@ class TransponderServer(ServerBase):
         self.modules = {}
 
         self.is_initializing = True
+        # each apply is a round trip to taish. apply changes of different modules concurrently
+        self.apply_concurrency = 16
         self.handlers = {
             "modules": {
                 "module": {
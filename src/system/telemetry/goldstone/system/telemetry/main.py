@@ -8,7 +8,12 @@ import signal
 import itertools
 from goldstone.lib.util import start_probe, call
 from goldstone.lib.connector.sysrepo import Connector
-from .store import InMemorySubscriptionStore, InMemoryTelemetryStore
+from .store import (
+    InMemorySubscriptionStore,
+    CompactTelemetryStore,
+    SqliteSubscriptionStore,
+    SqliteTelemetryStore,
+)
 from .telemetry import TelemetryServer
 
 
@@ -16,15 +21,19 @@ logger = logging.getLogger(__name__)
 
 
 def main():
-    async def _main():
+    async def _main(store_path):
         loop = asyncio.get_event_loop()
         stop_event = asyncio.Event()
         loop.add_signal_handler(signal.SIGINT, stop_event.set)
         loop.add_signal_handler(signal.SIGTERM, stop_event.set)
 
         conn = Connector()
-        subscription_store = InMemorySubscriptionStore()
-        telemetry_store = InMemoryTelemetryStore()
+        if store_path is not None:
+            subscription_store = SqliteSubscriptionStore(store_path)
+            telemetry_store = SqliteTelemetryStore(store_path)
+        else:
+            subscription_store = InMemorySubscriptionStore()
+            telemetry_store = CompactTelemetryStore()
         gsserver = TelemetryServer(conn, subscription_store, telemetry_store)
         servers = [gsserver]
 
@@ -49,11 +58,18 @@ def main():
             for s in servers:
                 await call(s.stop)
             conn.stop()
+            if store_path is not None:
+                telemetry_store.close()
+                subscription_store.close()
 
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="enable detailed output"
     )
+    parser.add_argument(
+        "--store-path",
+        help="database file to keep subscriptions and telemetry data across restarts",
+    )
     args = parser.parse_args()
 
     fmt = "%(levelname)s %(module)s %(funcName)s l.%(lineno)d | %(message)s"
@@ -69,7 +85,7 @@ def main():
     else:
         logging.basicConfig(level=logging.INFO, format=fmt)
 
-    asyncio.run(_main())
+    asyncio.run(_main(args.store_path))
 
 
 if __name__ == "__main__":
@@ -117,6 +117,39 @@ class PathParser:
         self._prune_leaves(leaves, path)
         return leaves
 
+    def _is_config_node(self, node):
+        if node.config_false():
+            return False
+        children = getattr(node, "children", None)
+        if children is None:
+            return True
+        for child in children():
+            if not self._is_config_node(child):
+                return False
+        return True
+
+    def is_config_path(self, path):
+        """Check whether a path has configuration data only.
+
+        Args:
+            path (str): Path to check.
+
+        Returns:
+            bool: True if the node and all of its descendants are configuration data.
+        """
+        return self._is_config_node(self._find_node(path))
+
+    def compile(self, path):
+        """Compile a flattener of data trees for a path.
+
+        Args:
+            path (str): Path to the target node.
+
+        Returns:
+            LeafFlattener: Flattener for the path.
+        """
+        return LeafFlattener(self, path)
+
     def is_valid_path(self, path):
         """Validate a schema path.
 
@@ -132,3 +165,90 @@ class PathParser:
         except libyang.LibyangError:
             return False
         return True
+
+
+class LeafFlattener:
+    """Flattener of data trees compiled for a path.
+
+    It produces leaves like PathParser.parse_dict_into_leaves() does. Schema nodes and list keys are looked up once
+    and cached by their schema paths. Unnecessary subtrees are pruned while walking the data tree. Then, flattening a
+    data tree does not walk the schema nor parse paths again.
+
+    Unlike parse_dict_into_leaves(), list entries not matching key predicates of the path are pruned too. Then, the
+    leaves are limited to the requested entries even if the data tree has their siblings.
+
+    Args:
+        parser (PathParser): Parser to look up schema nodes.
+        path (str): Path to the target node.
+    """
+
+    def __init__(self, parser, path):
+        self._parser = parser
+        self._path_elems = []
+        self._predicates = {}
+        for depth, (prefix, name, keys) in enumerate(libyang.xpath_split(path), 1):
+            self._path_elems.append(f"{prefix}:{name}" if prefix else name)
+            if len(keys) > 0:
+                self._predicates[depth] = keys
+        self._top_prefix = self._path_elems[0].split(":")[0]
+        self._nodes = {}
+        self._keys = {}
+
+    def _node(self, schema_path):
+        node = self._nodes.get(schema_path)
+        if node is None:
+            if len(schema_path) == 1:
+                node = next(self._parser._find_head_node("/" + schema_path[0]))
+            else:
+                parent = self._node(schema_path[:-1])
+                node = self._parser._next_node(parent, schema_path[-1].split(":")[-1])
+            self._nodes[schema_path] = node
+        return node
+
+    def _list_keys(self, schema_path):
+        keys = self._keys.get(schema_path)
+        if keys is None:
+            keys = [key.name() for key in self._node(schema_path).keys()]
+            self._keys[schema_path] = keys
+        return keys
+
+    def _flatten_container(self, data, schema_path, path, leaves):
+        for name, value in data.items():
+            self._flatten(value, schema_path + (name,), f"{path}/{name}", leaves)
+
+    def _flatten(self, data, schema_path, path, leaves):
+        depth = len(schema_path)
+        if depth <= len(self._path_elems):
+            if schema_path[-1] != self._path_elems[depth - 1]:
+                return
+        if self._parser._is_container(data):
+            self._flatten_container(data, schema_path, path, leaves)
+        elif self._parser._is_container_list(data):
+            keys = self._list_keys(schema_path)
+            predicates = self._predicates.get(depth)
+            for entry in data:
+                if predicates is not None and not all(
+                    str(entry.get(key)) == value for key, value in predicates
+                ):
+                    continue
+                keys_str = "".join(f"[{key}='{entry[key]}']" for key in keys)
+                self._flatten_container(entry, schema_path, path + keys_str, leaves)
+        elif depth >= len(self._path_elems):
+            leaves[path] = data
+
+    def flatten(self, data):
+        """Flatten a data tree into path to leaves.
+
+        Args:
+            data (dict): Data tree in dictionaly to flatten.
+
+        Returns:
+            dict: Flattened data.
+              key: Path to a leaf node.
+              value: Data of a leaf node.
+        """
+        leaves = {}
+        for key, value in data.items():
+            name = f"{self._top_prefix}:{key}"
+            self._flatten(value, (name,), "/" + name, leaves)
+        return leaves
@@ -0,0 +1,91 @@
+"""Columnar snapshots of sampled data."""
+
+
+_MISSING = object()
+
+
+def new_times(size, value):
+    """Create a column of times.
+
+    Args:
+        size (int): Number of leaves.
+        value (int): Initial time of the leaves.
+
+    Returns:
+        list of int: The column.
+    """
+    return [value] * size
+
+
+def expired(times, limit):
+    """Find leaves last updated before a time.
+
+    Args:
+        times (list of int): Column of times created by new_times().
+        limit (int): Time to compare with.
+
+    Returns:
+        list of int: Positions of the leaves.
+    """
+    return [i for i, t in enumerate(times) if t < limit]
+
+
+class Snapshot:
+    """The last sample of a path in columns.
+
+    Leaf paths and values are kept in parallel lists. Each update compares the new sample with the previous one and
+    records created or updated leaves and deleted leaves. If the leaves are unchanged, the value columns are compared
+    position by position without looking up paths.
+
+    Attributes:
+        seq (int): Sequence number of the sample. It starts from 1 with the first sample.
+        layout (int): Version of the leaf paths. It changes when leaves are created or deleted.
+        paths (list of str): Paths of the leaves.
+        values (list): Values of the leaves in the order of paths.
+        changed (list of int): Positions of leaves created or updated by the last sample.
+        deleted (list of str): Paths of leaves deleted by the last sample.
+    """
+
+    def __init__(self):
+        self.seq = 0
+        self.layout = 0
+        self.paths = []
+        self.values = []
+        self.changed = []
+        self.deleted = []
+
+    def __len__(self):
+        return len(self.paths)
+
+    def items(self):
+        """Iterate over the leaves.
+
+        Returns:
+            iterator of tupple: Pairs of a path and a value.
+        """
+        return zip(self.paths, self.values)
+
+    def update(self, data):
+        """Replace the snapshot with a new sample.
+
+        Args:
+            data (dict): Leaf paths and values.
+        """
+        paths = list(data)
+        values = list(data.values())
+        if paths == self.paths:
+            previous = self.values
+            self.changed = [i for i, value in enumerate(values) if previous[i] != value]
+            self.deleted = []
+        else:
+            previous = dict(zip(self.paths, self.values))
+            self.changed = [
+                i
+                for i, (path, value) in enumerate(zip(paths, values))
+                if previous.get(path, _MISSING) != value
+            ]
+            self.deleted = [path for path in self.paths if path not in data]
+            self.layout += 1
+        self.seq += 1
+        self.paths = paths
+        self.values = values
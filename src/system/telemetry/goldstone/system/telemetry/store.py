@@ -2,8 +2,13 @@
 
 
 from abc import abstractmethod
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta
+import asyncio
+import json
 import logging
+import sqlite3
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -133,6 +138,257 @@ class InMemoryTelemetryStore(TelemetryStore):
         return inner.keys()
 
 
+class _Telemetry:
+    """Telemetry data returned by CompactTelemetryStore.get().
+
+    It works as a read-only dict of "value" and "update-time". The update time is converted to a datetime on access.
+    """
+
+    __slots__ = ("value", "time")
+
+    def __init__(self, value, time_):
+        self.value = value
+        self.time = time_
+
+    def __getitem__(self, key):
+        if key == "value":
+            return self.value
+        if key == "update-time":
+            age = time.monotonic_ns() - self.time
+            return datetime.now() - timedelta(microseconds=age / 1000)
+        raise KeyError(key)
+
+
+class _Leaves:
+    """Telemetry data of a subscription in parallel arrays.
+
+    Attributes:
+        index (dict): Positions in the arrays by path IDs.
+        pids (array): Path IDs.
+        values (list): Values.
+        times (array): Last update times in monotonic nanoseconds.
+    """
+
+    __slots__ = ("index", "pids", "values", "times")
+
+    def __init__(self):
+        self.index = {}
+        self.pids = array("q")
+        self.values = []
+        self.times = array("q")
+
+    def remove(self, pos):
+        # Move the last entry to the removed position to keep the arrays dense.
+        last = len(self.pids) - 1
+        if pos != last:
+            self.pids[pos] = self.pids[last]
+            self.values[pos] = self.values[last]
+            self.times[pos] = self.times[last]
+            self.index[self.pids[pos]] = pos
+        self.pids.pop()
+        self.values.pop()
+        self.times.pop()
+
+
+class CompactTelemetryStore(TelemetryStore):
+    """A telemetry datastore implementation using volatile memory compactly.
+
+    Paths are interned to integer IDs shared by all subscriptions. Telemetry data of a subscription are kept in
+    parallel arrays of path IDs, values and monotonic timestamps instead of a dict for each data. Data returned by
+    get() works as a read-only dict created on demand.
+
+    If you want to keep telemetry data after rebooting your application, you should not use this."""
+
+    def __init__(self):
+        self._leaves = {}
+        self._pids = {}
+        self._paths = []
+        self._refs = []
+        self._free_pids = []
+
+    def _intern(self, path):
+        pid = self._pids.get(path)
+        if pid is not None:
+            self._refs[pid] += 1
+            return pid
+        if len(self._free_pids) > 0:
+            pid = self._free_pids.pop()
+            self._paths[pid] = path
+            self._refs[pid] = 1
+        else:
+            pid = len(self._paths)
+            self._paths.append(path)
+            self._refs.append(1)
+        self._pids[path] = pid
+        return pid
+
+    def _release(self, pid):
+        self._refs[pid] -= 1
+        if self._refs[pid] > 0:
+            return
+        del self._pids[self._paths[pid]]
+        self._paths[pid] = None
+        self._free_pids.append(pid)
+
+    def set(self, ids, path, value):
+        self._set(ids, path, value, time.monotonic_ns())
+
+    def _set(self, ids, path, value, now):
+        leaves = self._leaves.get(ids)
+        if leaves is None:
+            leaves = _Leaves()
+            self._leaves[ids] = leaves
+        pid = self._pids.get(path)
+        pos = None if pid is None else leaves.index.get(pid)
+        if pos is None:
+            pid = self._intern(path)
+            leaves.index[pid] = len(leaves.pids)
+            leaves.pids.append(pid)
+            leaves.values.append(value)
+            leaves.times.append(now)
+        else:
+            leaves.values[pos] = value
+            leaves.times[pos] = now
+
+    def delete(self, ids, path):
+        try:
+            leaves = self._leaves[ids]
+            pid = self._pids[path]
+            pos = leaves.index.pop(pid)
+        except KeyError as e:
+            raise TelemetryNotExistError() from e
+        leaves.remove(pos)
+        self._release(pid)
+        if len(leaves.pids) <= 0:
+            del self._leaves[ids]
+
+    def get(self, ids, path):
+        try:
+            leaves = self._leaves[ids]
+            pos = leaves.index[self._pids[path]]
+        except KeyError as e:
+            raise TelemetryNotExistError() from e
+        return _Telemetry(leaves.values[pos], leaves.times[pos])
+
+    def list(self, ids):
+        leaves = self._leaves.get(ids)
+        if leaves is None:
+            return []
+        return [self._paths[pid] for pid in leaves.pids]
+
+
+class _SqliteStore:
+    """Base class for datastores backed by a sqlite database file.
+
+    Args:
+        path (str): Path to the database file.
+    """
+
+    SCHEMA = []
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path)
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+
+    def close(self):
+        """Close the database."""
+        self._db.close()
+
+
+class SqliteTelemetryStore(_SqliteStore, CompactTelemetryStore):
+    """A telemetry datastore implementation persisting data in a sqlite database file.
+
+    Telemetry data are kept in memory like CompactTelemetryStore and written back to the database. Writes are batched
+    into one transaction per event loop iteration, i.e. per sampling tick. Data in the database are loaded on
+    initialization, so suppress-redundant and heartbeat states survive restarts.
+
+    Args:
+        path (str): Path to the database file.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS telemetry ("
+        "request_id INTEGER, subscription_id INTEGER, path TEXT, value TEXT, "
+        "update_time INTEGER, PRIMARY KEY (request_id, subscription_id, path))"
+    ]
+
+    def __init__(self, path):
+        CompactTelemetryStore.__init__(self)
+        _SqliteStore.__init__(self, path)
+        self._pending = {}
+        self._flush_scheduled = False
+        self._load()
+
+    def _load(self):
+        offset = time.time_ns() - time.monotonic_ns()
+        rows = self._db.execute(
+            "SELECT request_id, subscription_id, path, value, update_time "
+            "FROM telemetry"
+        )
+        for outer_id, inner_id, path, value, update_time in rows:
+            ids = (outer_id, inner_id)
+            self._set(ids, path, json.loads(value), update_time - offset)
+
+    def set(self, ids, path, value):
+        now = time.monotonic_ns()
+        self._set(ids, path, value, now)
+        self._pending[(ids, path)] = (value, now)
+        self._schedule_flush()
+
+    def delete(self, ids, path):
+        super().delete(ids, path)
+        self._pending[(ids, path)] = None
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self.flush)
+
+    def flush(self):
+        """Write pending changes to the database in a transaction."""
+        self._flush_scheduled = False
+        if len(self._pending) == 0:
+            return
+        offset = time.time_ns() - time.monotonic_ns()
+        updates = []
+        deletes = []
+        for ((outer_id, inner_id), path), data in self._pending.items():
+            if data is None:
+                deletes.append((outer_id, inner_id, path))
+            else:
+                value, now = data
+                updates.append(
+                    (outer_id, inner_id, path, json.dumps(value), now + offset)
+                )
+        self._pending = {}
+        try:
+            with self._db:
+                self._db.executemany(
+                    "DELETE FROM telemetry "
+                    "WHERE request_id = ? AND subscription_id = ? AND path = ?",
+                    deletes,
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO telemetry VALUES (?, ?, ?, ?, ?)", updates
+                )
+        except sqlite3.Error as e:
+            logger.error("Failed to write telemetry data. %s", e)
+
+    def close(self):
+        """Write pending changes and close the database."""
+        self.flush()
+        super().close()
+
+
 class SubscriptionExistError(Exception):
     pass
 
@@ -196,6 +452,22 @@ class SubscriptionStore:
         """
         pass
 
+    def saved(self):
+        """Get configurations of subscriptions saved before the application restarted.
+
+        Returns:
+            dict: Configuration data of subscriptions by their identifiers. It does not include added subscriptions.
+        """
+        return {}
+
+    def forget(self, id_):
+        """Forget a subscription saved before the application restarted.
+
+        Args:
+            id_ (int): Identifier of the subscription to forget.
+        """
+        pass
+
 
 class InMemorySubscriptionStore(SubscriptionStore):
     """A subscription datastore implementation using volatile memory.
@@ -224,3 +496,47 @@ class InMemorySubscriptionStore(SubscriptionStore):
 
     def list(self):
         return list(self._subscriptions.keys())
+
+
+class SqliteSubscriptionStore(_SqliteStore, InMemorySubscriptionStore):
+    """A subscription datastore implementation persisting configurations in a sqlite database file.
+
+    Subscriptions are kept in memory. Their configurations are saved in the database, so they can be restored after
+    the application restarted. See saved().
+
+    Args:
+        path (str): Path to the database file.
+    """
+
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS subscriptions (id INTEGER PRIMARY KEY, config TEXT)"
+    ]
+
+    def __init__(self, path):
+        InMemorySubscriptionStore.__init__(self)
+        _SqliteStore.__init__(self, path)
+        rows = self._db.execute("SELECT id, config FROM subscriptions")
+        self._saved = {id_: json.loads(config) for id_, config in rows}
+
+    def add(self, id_, subscription):
+        super().add(id_, subscription)
+        self._saved.pop(id_, None)
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO subscriptions VALUES (?, ?)",
+                (id_, json.dumps(subscription.config)),
+            )
+
+    def delete(self, id_):
+        super().delete(id_)
+        with self._db:
+            self._db.execute("DELETE FROM subscriptions WHERE id = ?", (id_,))
+
+    def saved(self):
+        return dict(self._saved)
+
+    def forget(self, id_):
+        if self._saved.pop(id_, None) is None:
+            return
+        with self._db:
+            self._db.execute("DELETE FROM subscriptions WHERE id = ?", (id_,))
@@ -4,12 +4,17 @@
 import logging
 import asyncio
 import json
+import functools
+import heapq
+import itertools
+import time
 from datetime import datetime, timedelta
 import sysrepo
 import libyang
 from goldstone.lib.core import ServerBase, ChangeHandler
 from .store import SubscriptionNotExistError, TelemetryNotExistError
 from .path import PathParser
+from .snapshot import Snapshot, new_times, expired
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +26,632 @@ class ValidationFailedError(Exception):
         self.msg = msg
 
 
+def _schema_elems(xpath):
+    elems = []
+    for prefix, name, _ in libyang.xpath_split(xpath):
+        if len(elems) == 0:
+            name = f"{prefix}:{name}"
+        elems.append(name)
+    return tuple(elems)
+
+
+class ChangeEventRouter:
+    """Routes change events of the central datastore to ON_CHANGE samplers.
+
+    Configuration changes are reported by module change subscriptions. State changes are reported by notifications
+    from south daemons. A notification is routed to listeners whose paths overlap the subtree it reports. Changes of
+    paths in `covers` are always reported by the notification. Other state data may change silently, so they still
+    need to be polled. Only sources registered by add_module() and add_notification() after they are subscribed
+    count. Paths of the others are polled.
+
+    Args:
+        path_parser (PathParser): Parser to inspect schema nodes of paths.
+    """
+
+    NOTIFICATIONS = {
+        "/goldstone-interfaces:interface-link-state-notify-event": {
+            "scope": "/goldstone-interfaces:interfaces/interface/state",
+            "covers": ["/goldstone-interfaces:interfaces/interface/state/oper-status"],
+        },
+        "/goldstone-platform:piu-notify-event": {
+            "scope": "/goldstone-platform:components/component/piu/state",
+            "covers": [
+                "/goldstone-platform:components/component/piu/state/status",
+                "/goldstone-platform:components/component/piu/state/piu-type",
+                "/goldstone-platform:components/component/piu/state/cfp2-presence",
+            ],
+        },
+        "/goldstone-platform:transceiver-notify-event": {
+            "scope": "/goldstone-platform:components/component/transceiver/state",
+            "covers": [
+                "/goldstone-platform:components/component/transceiver/state/presence"
+            ],
+        },
+        # NOTE: They report only attributes monitored by the TAI south daemon.
+        "/goldstone-transponder:module-notify-event": {
+            "scope": "/goldstone-transponder:modules/module/state",
+            "covers": [],
+        },
+        "/goldstone-transponder:host-interface-notify-event": {
+            "scope": "/goldstone-transponder:modules/module/host-interface/state",
+            "covers": [],
+        },
+        "/goldstone-transponder:host-interface-alarm-notification-event": {
+            "scope": "/goldstone-transponder:modules/module/host-interface/state",
+            "covers": [],
+        },
+        "/goldstone-transponder:network-interface-notify-event": {
+            "scope": "/goldstone-transponder:modules/module/network-interface/state",
+            "covers": [],
+        },
+        "/goldstone-transponder:network-interface-alarm-notification-event": {
+            "scope": "/goldstone-transponder:modules/module/network-interface/state",
+            "covers": [],
+        },
+    }
+
+    def __init__(self, path_parser):
+        self._path_parser = path_parser
+        self._listeners = {}
+        self._covers = []
+        self._modules = set()
+
+    def add_notification(self, xpath):
+        """Add a subscribed notification as a source of change events.
+
+        Args:
+            xpath (str): Path of the notification. A key of NOTIFICATIONS.
+        """
+        for path in self.NOTIFICATIONS[xpath]["covers"]:
+            self._covers.append(_schema_elems(path))
+
+    def add_module(self, module):
+        """Add a module whose configuration changes are subscribed.
+
+        Args:
+            module (str): Name of the module.
+        """
+        self._modules.add(module)
+
+    def add_listener(self, lid, path, callback):
+        """Add a listener of changes.
+
+        Args:
+            lid (any): Identification of the listener.
+            path (str): Path to listen.
+            callback (func): Function to be called without arguments when the path may have been changed.
+        """
+        self._listeners[lid] = (_schema_elems(path), callback)
+
+    def remove_listener(self, lid):
+        """Remove a listener of changes.
+
+        Args:
+            lid (any): Identification of the listener.
+        """
+        self._listeners.pop(lid, None)
+
+    def covers(self, path):
+        """Check whether all changes of the path are reported as events.
+
+        Args:
+            path (str): Path to check.
+
+        Returns:
+            bool: True if the path does not need to be polled.
+        """
+        elems = _schema_elems(path)
+        for covered in self._covers:
+            if elems[: len(covered)] == covered:
+                return True
+        if elems[0].split(":")[0] not in self._modules:
+            return False
+        try:
+            return self._path_parser.is_config_path(path)
+        except Exception as e:
+            logger.warning("Failed to inspect the schema of %s. %s", path, e)
+            return False
+
+    def dispatch(self, xpath):
+        """Notify listeners of a change.
+
+        Args:
+            xpath (str): Path to the changed node.
+        """
+        elems = _schema_elems(xpath)
+        for path, callback in list(self._listeners.values()):
+            length = min(len(path), len(elems))
+            if path[:length] == elems[:length]:
+                callback()
+
+    async def notification_cb(self, xpath, notif_type, value, timestamp, priv):
+        """Callback function for a notification from a south daemon.
+
+        Args:
+            xpath (str): Path of the notification.
+            notif_type (str): Type of the notification.
+            value (dict): Content of the notification.
+            timestamp (int): Timestamp of the notification.
+            priv (any): Scope of the notification.
+        """
+        self.dispatch(priv)
+
+    async def module_change_cb(self, event, req_id, changes, priv):
+        """Callback function for applied configuration changes.
+
+        Args:
+            event (str): Event type of the callback. It is always "done".
+            req_id (int): Request ID.
+            changes (list of sysrepo.Change): Applied changes.
+            priv (any): Private data from the request subscribing.
+        """
+        for change in changes:
+            self.dispatch(change.xpath)
+
+
+class SamplingScheduler:
+    """Central scheduler of sampling.
+
+    Samplers are kept in a heap ordered by their deadlines. Deadlines are aligned on boundaries of the sampling
+    intervals from the same origin, so they do not drift and samplers due at the same time wake up together. Samplers
+    for the same path due at the same time share one retrieval of state data.
+
+    The scheduler runs a task while it has samplers.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._seq = itertools.count()
+        self._origin = None
+        self._task = None
+        self._wakeup = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _next_deadline(self, interval, now):
+        return now + interval - (now - self._origin) % interval
+
+    def _push(self, entry):
+        entry[1] = next(self._seq)
+        heapq.heappush(self._heap, entry)
+
+    def add(self, sampler):
+        """Start scheduling a sampler.
+
+        Args:
+            sampler (Sampler): Sampler to schedule. It is sampled at every boundary of its interval.
+        """
+        if sampler in self._entries:
+            return
+        now = time.time_ns()
+        if self._origin is None:
+            self._origin = now
+        # Entries are [deadline, sequence, sampler]. A removed entry has None as a sampler.
+        entry = [self._next_deadline(sampler.interval, now), 0, sampler]
+        self._entries[sampler] = entry
+        self._push(entry)
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def remove(self, sampler):
+        """Stop scheduling a sampler.
+
+        Args:
+            sampler (Sampler): Sampler to stop.
+        """
+        entry = self._entries.pop(sampler, None)
+        if entry is None:
+            return
+        entry[2] = None
+        if len(self._entries) > 0:
+            return
+        task = self._task
+        self._task = None
+        self._heap = []
+        self._origin = None
+        if task is not None:
+            task.cancel()
+            await asyncio.wait([task])
+
+    async def _run(self):
+        while True:
+            while len(self._heap) > 0 and self._heap[0][2] is None:
+                heapq.heappop(self._heap)
+            timeout = None
+            if len(self._heap) > 0:
+                timeout = max(self._heap[0][0] - time.time_ns(), 0)
+                timeout = timeout / 1000 / 1000 / 1000
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+                # A sampler was added. Recalculate the timeout.
+                continue
+            except asyncio.TimeoutError:
+                pass
+            self._run_due()
+
+    def _run_due(self):
+        now = time.time_ns()
+        due = {}
+        while len(self._heap) > 0 and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[2] is None:
+                continue
+            due.setdefault(entry[2].path, []).append(entry)
+        for path, entries in due.items():
+            first = entries[0][2]
+            start = time.time_ns()
+            data = first.sample()
+            read = time.time_ns() - start
+            for entry in entries:
+                deadline, _, sampler = entry
+                fan_out_start = time.time_ns()
+                if data is not None:
+                    # The cost of the shared read is counted for all samplers.
+                    if sampler is not first:
+                        sampler.record_read(*first.last_read)
+                    sampler.fan_out(data)
+                end = time.time_ns()
+                # Fan-outs of the other samplers are not counted.
+                elapsed = read + end - fan_out_start
+                next_deadline = self._next_deadline(sampler.interval, end)
+                missed = (next_deadline - deadline) // sampler.interval - 1
+                sampler.record(start - deadline, missed, elapsed)
+                # The sampler may have been removed by a subscriber.
+                if entry[2] is not None:
+                    # The interval may have been adapted by the sample.
+                    entry[0] = self._next_deadline(sampler.interval, end)
+                    self._push(entry)
+
+
+class Sampler:
+    """Sampling loop shared by identical subscriptions.
+
+    It retrieves state data of the path and passes them to all subscribers as a Snapshot. The snapshot tells leaves
+    changed from the previous sample, so subscribers need not compare every leaf with their own last values.
+
+    With a ChangeEventRouter, it also samples as soon as a change event for the path arrives. It polls the path only
+    if some changes of the path are not reported as events.
+
+    With max_interval, the sampler adapts its interval to the latency of samples. When a sample takes longer than a
+    half of the current interval, the interval is doubled up to max_interval, so a slow south daemon is polled less
+    often. When samples become fast enough for a half of the current interval, the interval is halved down to the
+    requested one.
+
+    Args:
+        conn (SysrepoConnection): Connection with the central datastore.
+        path (str): Path to retrieve.
+        interval (int): Sampling interval in nanoseconds.
+        events (ChangeEventRouter): Source of change events. If it is None, the sampler polls the path.
+        scheduler (SamplingScheduler): Scheduler to poll the path. If it is None, the sampler uses its own scheduler.
+        max_interval (int): Maximum sampling interval of adaptive sampling in nanoseconds. If it is None, the sampler
+            samples at the requested interval.
+
+    Attributes:
+        samples (int): The number of scheduled samples.
+        missed_deadlines (int): The number of deadlines passed without a sample.
+        last_jitter (int): Delay of the last scheduled sample from its deadline in nanoseconds.
+        max_jitter (int): Maximum delay of scheduled samples from their deadlines in nanoseconds.
+        overruns (int): The number of scheduled samples which took longer than the interval.
+        retrieve_time (int): Total time to retrieve state data in nanoseconds.
+        flatten_time (int): Total time to flatten retrieved data into leaves in nanoseconds.
+        leaves (int): The number of leaves in the last sample.
+        last_read (tupple): Time to retrieve, time to flatten and the number of leaves of the last sample.
+    """
+
+    STATISTICS = [
+        "samples",
+        "missed-deadlines",
+        "last-jitter",
+        "max-jitter",
+        "effective-interval",
+    ]
+    # Load of a sample is its latency divided by the interval.
+    OVERLOAD = 0.5
+    UNDERLOAD = 0.25
+    RECOVERY_SAMPLES = 3
+
+    def __init__(
+        self, conn, path, interval, events=None, scheduler=None, max_interval=None
+    ):
+        self._conn = conn
+        self._path = path
+        self._requested_interval = interval
+        self._interval = interval
+        self._max_interval = max_interval
+        self._fast_samples = 0
+        self._events = events
+        if scheduler is None:
+            scheduler = SamplingScheduler()
+        self._scheduler = scheduler
+        self._flattener = PathParser(self._conn.ctx).compile(path)
+        self._poll = events is None or not events.covers(path)
+        self._subscribers = {}
+        self._snapshot = Snapshot()
+        self._running = False
+        self._triggered = False
+        self.samples = 0
+        self.missed_deadlines = 0
+        self.last_jitter = 0
+        self.max_jitter = 0
+        self.overruns = 0
+        self.retrieve_time = 0
+        self.flatten_time = 0
+        self.leaves = 0
+        self.last_read = (0, 0, 0)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    @property
+    def path(self):
+        """str: Path to retrieve."""
+        return self._path
+
+    @property
+    def interval(self):
+        """int: Current sampling interval in nanoseconds. It differs from the requested one under adaptive sampling."""
+        return self._interval
+
+    @property
+    def polling(self):
+        """bool: True if the sampler polls the path."""
+        return self._poll
+
+    def get_statistics(self):
+        """Get sampling statistics.
+
+        Returns:
+            dict: Statistics in the form of subscription state data. effective-interval is included only under
+                adaptive sampling.
+        """
+        statistics = {
+            "samples": self.samples,
+            "missed-deadlines": self.missed_deadlines,
+            "last-jitter": self.last_jitter,
+            "max-jitter": self.max_jitter,
+        }
+        if self._max_interval is not None:
+            statistics["effective-interval"] = self._interval
+        return statistics
+
+    def subscribe(self, sid, callback):
+        """Add a subscriber. Sampling starts with the first subscriber.
+
+        Args:
+            sid (any): Identification of the subscriber.
+            callback (func): Function to be called with sampled data. The data is a Snapshot. It is shared by all
+                subscribers and should not be modified.
+        """
+        self._subscribers[sid] = callback
+        if self._running:
+            return
+        self._running = True
+        if self._events is not None:
+            self._events.add_listener(id(self), self._path, self.trigger)
+        if self._poll:
+            self._scheduler.add(self)
+
+    async def unsubscribe(self, sid):
+        """Remove a subscriber. Sampling stops with the last subscriber.
+
+        Args:
+            sid (any): Identification of the subscriber.
+        """
+        self._subscribers.pop(sid, None)
+        if len(self._subscribers) > 0 or not self._running:
+            return
+        self._running = False
+        if self._events is not None:
+            self._events.remove_listener(id(self))
+        if self._poll:
+            await self._scheduler.remove(self)
+
+    def trigger(self):
+        """Sample the path soon.
+
+        Triggers before the sampling are coalesced into one sampling. The sampling is deferred not to access the
+        datastore in a datastore callback.
+        """
+        if self._triggered:
+            return
+        self._triggered = True
+        asyncio.get_running_loop().call_soon(self._triggered_sample)
+
+    def _triggered_sample(self):
+        self._triggered = False
+        if not self._running:
+            return
+        data = self.sample()
+        if data is not None:
+            self.fan_out(data)
+
+    def record(self, jitter, missed, elapsed):
+        """Record a scheduled sample.
+
+        Args:
+            jitter (int): Delay of the sample from its deadline in nanoseconds.
+            missed (int): The number of deadlines passed without a sample.
+            elapsed (int): Time taken to retrieve the data and to process it by subscribers in nanoseconds.
+        """
+        if elapsed > self._interval:
+            self.overruns += 1
+        self.samples += 1
+        self.missed_deadlines += missed
+        self.last_jitter = jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        if self._max_interval is not None:
+            self._adapt(elapsed)
+
+    def _adapt(self, elapsed):
+        if elapsed > self._interval * self.OVERLOAD:
+            self._fast_samples = 0
+            interval = min(self._interval * 2, self._max_interval)
+            if interval != self._interval:
+                logger.info(
+                    "Sampling %s is slow. Stretch the interval to %d ns.",
+                    self._path,
+                    interval,
+                )
+                self._interval = interval
+            return
+        if self._interval == self._requested_interval:
+            return
+        interval = max(self._interval // 2, self._requested_interval)
+        if elapsed > interval * self.UNDERLOAD:
+            self._fast_samples = 0
+            return
+        self._fast_samples += 1
+        if self._fast_samples < self.RECOVERY_SAMPLES:
+            return
+        self._fast_samples = 0
+        logger.info(
+            "Sampling %s recovered. Shrink the interval to %d ns.", self._path, interval
+        )
+        self._interval = interval
+
+    def sample(self):
+        """Retrieve state data of the path.
+
+        Returns:
+            dict: Leaf paths and values. None if the retrieval failed.
+        """
+        start = time.monotonic_ns()
+        try:
+            data = self._conn.get_operational(self._path, strip=False)
+        except Exception as e:
+            logger.error(
+                "Failed to retrieve current state of %s. %s: %s",
+                self._path,
+                type(e).__name__,
+                e,
+            )
+            return None
+        # NOTE: Connector returns a value None instead of raising an exception if the data was not found.
+        if data is None:
+            logger.info("data for path %s is not found.", self._path)
+            data = {}
+        retrieved = time.monotonic_ns()
+        data = self._flattener.flatten(data)
+        self.record_read(retrieved - start, time.monotonic_ns() - retrieved, len(data))
+        return data
+
+    def record_read(self, retrieve_time, flatten_time, leaves):
+        """Record the cost of a sample.
+
+        It is called by sample(), or by the scheduler for a sample shared with another sampler of the same path.
+
+        Args:
+            retrieve_time (int): Time to retrieve state data in nanoseconds.
+            flatten_time (int): Time to flatten retrieved data into leaves in nanoseconds.
+            leaves (int): The number of leaves.
+        """
+        self.retrieve_time += retrieve_time
+        self.flatten_time += flatten_time
+        self.leaves = leaves
+        self.last_read = (retrieve_time, flatten_time, leaves)
+
+    def fan_out(self, data):
+        """Pass sampled data to all subscribers.
+
+        Args:
+            data (dict): Leaf paths and values.
+        """
+        self._snapshot.update(data)
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(self._snapshot)
+            except Exception as e:
+                logger.error(
+                    "Failed to update current state and send notification. %s: %s",
+                    type(e).__name__,
+                    e,
+                )
+
+
+class SamplerRegistry:
+    """Registry of samplers shared by subscriptions.
+
+    Subscriptions with the identical path, mode, sampling interval, maximum sampling interval and suppress-redundant
+    share a sampler. Then, the load to retrieve state data scales with the number of unique subscriptions, not with
+    the number of clients.
+
+    Args:
+        events (ChangeEventRouter): Source of change events for ON_CHANGE subscriptions.
+        scheduler (SamplingScheduler): Scheduler to poll paths.
+    """
+
+    def __init__(self, events=None, scheduler=None):
+        self._events = events
+        self._scheduler = scheduler
+        self._samplers = {}
+
+    def __len__(self):
+        return len(self._samplers)
+
+    def get(self, key):
+        """Get a sampler.
+
+        Args:
+            key (tupple): Key of the sampler returned by subscribe().
+
+        Returns:
+            Sampler: The sampler. None if it does not exist.
+        """
+        return self._samplers.get(key)
+
+    def subscribe(self, conn, config, interval, sid, callback):
+        """Attach a subscriber to the sampler for the subscription.
+
+        Args:
+            conn (SysrepoConnection): Connection with the central datastore. It is used if a new sampler is created.
+            config (dict): Configuration data of the subscription.
+            interval (int): Sampling interval in nanoseconds.
+            sid (any): Identification of the subscriber.
+            callback (func): Function to be called with sampled data. See Sampler.subscribe().
+
+        Returns:
+            tupple: Key of the sampler. Use it to unsubscribe.
+        """
+        max_interval = config.get("max-sample-interval")
+        key = (
+            config["path"],
+            config["mode"],
+            interval,
+            max_interval,
+            config["suppress-redundant"],
+        )
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            events = self._events if config["mode"] == "ON_CHANGE" else None
+            sampler = Sampler(
+                conn, config["path"], interval, events, self._scheduler, max_interval
+            )
+            self._samplers[key] = sampler
+        sampler.subscribe(sid, callback)
+        return key
+
+    async def unsubscribe(self, key, sid):
+        """Detach a subscriber from the sampler.
+
+        Args:
+            key (tupple): Key of the sampler returned by subscribe().
+            sid (any): Identification of the subscriber.
+        """
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            return
+        await sampler.unsubscribe(sid)
+        # Another subscriber may have been attached while the loop was stopping.
+        if len(sampler) == 0 and self._samplers.get(key) is sampler:
+            del self._samplers[key]
+
+
 class Subscription:
     """Base class of subscriptions.
 
@@ -34,21 +665,44 @@ class Subscription:
         config (dict): Configuration data of the subscription.
         store (store.TelemetryStore): Datastore for telemetry data.
         update_interval (int): Telemetry data update interval in nanoseconds.
+        samplers (SamplerRegistry): Registry of samplers shared with other subscriptions. If it is None, the
+            subscription samples data by itself.
+        events (ChangeEventRouter): Source of change events for ON_CHANGE subscriptions. It is used if samplers is
+            None. If both are None, ON_CHANGE subscriptions poll their paths.
+        scheduler (SamplingScheduler): Scheduler to poll paths. It is used if samplers is None. If it is None, each
+            sampler uses its own scheduler.
     """
 
     NOTIF_PATH = "goldstone-telemetry:telemetry-notify-event"
+    BULK_NOTIF_PATH = "goldstone-telemetry:telemetry-bulk-notify-event"
 
-    def __init__(self, conn, config, store, update_interval):
+    def __init__(
+        self,
+        conn,
+        config,
+        store,
+        update_interval,
+        samplers=None,
+        events=None,
+        scheduler=None,
+    ):
         self._conn = conn
         self._config = config
         self._store = store
         self._update_interval = update_interval
+        self._samplers = samplers
+        self._events = events
+        self._scheduler = scheduler
         self._path_parser = PathParser(self._conn.ctx)
         self._id = self._config["id"]
         self._updates_only = False
+        self._bulk_updates = None
         self._subscriptions = {}
         self._parse_config()
         self._validate_config()
+        self._flatteners = {}
+        for _, config in self._subscriptions.items():
+            self._flatteners[config["path"]] = self._path_parser.compile(config["path"])
 
     def _parse_config(self):
         request_config = self._config.get("config")
@@ -57,6 +711,7 @@ class Subscription:
         self._updates_only = request_config.get("updates-only")
         if self._updates_only is None:
             self._updates_only = False
+        self._bulk_updates = request_config.get("bulk-updates")
         subscriptions = self._config.get("subscriptions")
         if subscriptions is None:
             subscriptions = {}
@@ -75,6 +730,7 @@ class Subscription:
                 "sample-interval": subscription_config.get("sample-interval"),
                 "suppress-redundant": subscription_config.get("suppress-redundant"),
                 "heartbeat-interval": subscription_config.get("heartbeat-interval"),
+                "max-sample-interval": subscription_config.get("max-sample-interval"),
             }
             self._subscriptions[sid] = parsed_subscription
 
@@ -95,7 +751,7 @@ class Subscription:
         if data is None:
             logger.info("data for path %s is not found.", xpath)
             data = {}
-        return self._path_parser.parse_dict_into_leaves(data, xpath)
+        return self._flatteners[xpath].flatten(data)
 
     def _send_notification(self, notif):
         """Send a notification.
@@ -105,6 +761,55 @@ class Subscription:
         """
         self._conn.send_notification(self.NOTIF_PATH, notif)
 
+    def _send_updates(self, sid, updates, deletes):
+        """Send notifications of created, updated and deleted data nodes of a subscription.
+
+        If bulk-updates is enabled, they are sent as a bulk notification. Otherwise, a notification is sent for each
+        data node.
+
+        Args:
+            sid (int): Identification of the subscription.
+            updates (list of tupple): Pairs of a path and a value of created or updated data nodes.
+            deletes (list of str): Paths to deleted data nodes.
+
+        Returns:
+            int: Number of notifications sent.
+        """
+        if self._bulk_updates:
+            if len(updates) == 0 and len(deletes) == 0:
+                return 0
+            notif = {
+                "request-id": self._id,
+                "subscription-id": sid,
+            }
+            if len(updates) > 0:
+                notif["update"] = [
+                    {"path": path, "json-data": json.dumps(value)}
+                    for path, value in updates
+                ]
+            if len(deletes) > 0:
+                notif["delete"] = deletes
+            self._conn.send_notification(self.BULK_NOTIF_PATH, notif)
+            return 1
+        for path, value in updates:
+            notif = {
+                "type": "UPDATE",
+                "request-id": self._id,
+                "subscription-id": sid,
+                "path": path,
+                "json-data": json.dumps(value),
+            }
+            self._send_notification(notif)
+        for path in deletes:
+            notif = {
+                "type": "DELETE",
+                "request-id": self._id,
+                "subscription-id": sid,
+                "path": path,
+            }
+            self._send_notification(notif)
+        return len(updates) + len(deletes)
+
     def _send_sync_response(self):
         notif = {
             "type": "SYNC_RESPONSE",
@@ -122,26 +827,39 @@ class Subscription:
     def _send_current_data(self):
         for sid, _ in self._subscriptions.items():
             ids = (self._id, sid)
-            sub_paths = self._store.list(ids)
-            for sub_path in sub_paths:
+            updates = []
+            for sub_path in self._store.list(ids):
                 data = self._store.get(ids, sub_path)
-                notif = {
-                    "type": "UPDATE",
-                    "request-id": self._id,
-                    "subscription-id": sid,
-                    "path": sub_path,
-                    "json-data": json.dumps(data["value"]),
-                }
-                self._send_notification(notif)
+                updates.append((sub_path, data["value"]))
+            self._send_updates(sid, updates, [])
 
-    async def start(self):
-        """Start the subscription."""
+    @property
+    def config(self):
+        """dict: Configuration data of the subscription."""
+        return self._config
+
+    async def start(self, restore=False):
+        """Start the subscription.
+
+        Args:
+            restore (bool): Resume the subscription restored after restarting. The current data and the sync response
+                have been sent before restarting, so they are not sent again.
+        """
         # Start session in __init__() because it will be used to parse and validate configuration parameters.
+        if restore:
+            return
         self._retrieve_current_data()
         if not self._updates_only:
             self._send_current_data()
         self._send_sync_response()
 
+    def clear_data(self):
+        """Delete telemetry data of the subscription."""
+        for sid in self._subscriptions:
+            ids = (self._id, sid)
+            for sub_path in list(self._store.list(ids)):
+                self._store.delete(ids, sub_path)
+
     async def stop(self):
         """Stop the subscription."""
         pass
@@ -162,25 +880,62 @@ class Subscription:
                     "sample-interval": subscription["sample-interval"],
                     "suppress-redundant": subscription["suppress-redundant"],
                     "heartbeat-interval": subscription["heartbeat-interval"],
+                    "max-sample-interval": subscription["max-sample-interval"],
                 }
             )
         return {
             "id": self._config["id"],
             "mode": self._config["config"]["mode"],
             "updates-only": self._updates_only,
+            "bulk-updates": self._bulk_updates,
             "subscriptions": subscriptions,
         }
 
 
 class StreamSubscription(Subscription):
-    """Subscription for the STREAM mode."""
+    """Subscription for the STREAM mode.
+
+    It accounts costs of its sampling work. Times are in nanoseconds. Retrieval and flattening of a sampler shared
+    with other subscribe-requests are counted for all of them. notification-rate is the number of notifications per
+    second in the last one to two minutes.
+    """
 
     HEARTBEAT_DISABLED = 0
+    RATE_WINDOW = 60 * 1000 * 1000 * 1000
+    COSTS = [
+        "leaves",
+        "retrieve-time",
+        "flatten-time",
+        "diff-time",
+        "notify-time",
+        "notifications",
+        "notification-rate",
+        "overruns",
+    ]
 
-    def __init__(self, conn, config, store, update_interval):
+    def __init__(
+        self,
+        conn,
+        config,
+        store,
+        update_interval,
+        samplers=None,
+        events=None,
+        scheduler=None,
+    ):
         self._default_sampling_interval = update_interval * 2
-        super().__init__(conn, config, store, update_interval)
-        self._loop_tasks = {}
+        super().__init__(
+            conn, config, store, update_interval, samplers, events, scheduler
+        )
+        self._sampler_keys = {}
+        self._own_samplers = {}
+        self._seqs = {}
+        self._times = {}
+        self._diff_time = 0
+        self._notify_time = 0
+        self._notifications = 0
+        self._rate_base = (time.monotonic_ns(), 0)
+        self._rate_next = None
 
     def _target_defined_mode(self, path):
         # NOTE: Select the mode by provided path.
@@ -217,31 +972,112 @@ class StreamSubscription(Subscription):
                     msg = f"sample-interval is shorter than minimum interval {self._update_interval}"
                     logger.error("Subscription config validation failed: %s", msg)
                     raise ValidationFailedError(msg)
+            if config["max-sample-interval"] is not None:
+                if config["mode"] != "SAMPLE":
+                    msg = "max-sample-interval is only for SAMPLE mode"
+                    logger.error("Subscription config validation failed: %s", msg)
+                    raise ValidationFailedError(msg)
+                if config["max-sample-interval"] < config["sample-interval"]:
+                    msg = "max-sample-interval is shorter than sample-interval"
+                    logger.error("Subscription config validation failed: %s", msg)
+                    raise ValidationFailedError(msg)
 
-    async def start(self):
-        await super().start()
-        loops = {
-            "ON_CHANGE": self._on_change_loop,
-            "SAMPLE": self._sample_loop,
-        }
-        for _, subscription in self._subscriptions.items():
-            try:
-                self._loop_tasks[subscription["id"]] = asyncio.create_task(
-                    loops[subscription["mode"]](subscription)
-                )
-            except KeyError:
+    async def start(self, restore=False):
+        await super().start(restore)
+        for sid, subscription in self._subscriptions.items():
+            if subscription["mode"] == "ON_CHANGE":
+                interval = self._update_interval
+                events = self._events
+            elif subscription["mode"] == "SAMPLE":
+                interval = subscription["sample-interval"]
+                events = None
+            else:
                 continue
+            ids = (self._id, sid)
+            callback = functools.partial(self._notify_data, subscription)
+            if self._samplers is not None:
+                self._sampler_keys[sid] = self._samplers.subscribe(
+                    self._conn, subscription, interval, ids, callback
+                )
+            else:
+                sampler = Sampler(
+                    self._conn,
+                    subscription["path"],
+                    interval,
+                    events,
+                    self._scheduler,
+                    subscription["max-sample-interval"],
+                )
+                sampler.subscribe(ids, callback)
+                self._own_samplers[sid] = sampler
 
     async def stop(self):
-        for _, loop_task in self._loop_tasks.items():
-            loop_task.cancel()
-        for _, loop_task in self._loop_tasks.items():
-            while True:
-                if loop_task.done():
-                    break
-                await asyncio.sleep(0.1)
+        for sid, key in self._sampler_keys.items():
+            await self._samplers.unsubscribe(key, (self._id, sid))
+        self._sampler_keys = {}
+        for sid, sampler in self._own_samplers.items():
+            await sampler.unsubscribe((self._id, sid))
+        self._own_samplers = {}
         await super().stop()
 
+    def _sampler(self, sid):
+        key = self._sampler_keys.get(sid)
+        if key is not None:
+            return self._samplers.get(key)
+        return self._own_samplers.get(sid)
+
+    def _notification_rate(self, now):
+        """Update the window of the notification rate and return the rate.
+
+        Args:
+            now (int): Current monotonic time in nanoseconds.
+
+        Returns:
+            float: Notifications per second.
+        """
+        if self._rate_next is None:
+            if now - self._rate_base[0] >= self.RATE_WINDOW:
+                self._rate_next = (now, self._notifications)
+        elif now - self._rate_next[0] >= self.RATE_WINDOW:
+            self._rate_base = self._rate_next
+            self._rate_next = (now, self._notifications)
+        base_time, base_count = self._rate_base
+        if now <= base_time:
+            return 0.0
+        return (self._notifications - base_count) / (now - base_time) * 1e9
+
+    def get_costs(self):
+        """Get costs of the sampling work of the subscribe-request.
+
+        Returns:
+            dict: Costs keyed by names in COSTS.
+        """
+        samplers = {}
+        for sid in self._subscriptions:
+            sampler = self._sampler(sid)
+            if sampler is not None:
+                samplers[id(sampler)] = sampler
+        samplers = samplers.values()
+        return {
+            "leaves": sum(s.leaves for s in samplers),
+            "retrieve-time": sum(s.retrieve_time for s in samplers),
+            "flatten-time": sum(s.flatten_time for s in samplers),
+            "diff-time": self._diff_time,
+            "notify-time": self._notify_time,
+            "notifications": self._notifications,
+            "notification-rate": round(self._notification_rate(time.monotonic_ns()), 2),
+            "overruns": sum(s.overruns for s in samplers),
+        }
+
+    def get_state(self):
+        state = super().get_state()
+        for subscription in state["subscriptions"]:
+            sampler = self._sampler(subscription["id"])
+            if sampler is not None:
+                subscription.update(sampler.get_statistics())
+        state.update(self.get_costs())
+        return state
+
     def _should_send_notif(self, config, ids, sub_path, value):
         send_notif = True
         suppress_redundant = (
@@ -261,64 +1097,88 @@ class StreamSubscription(Subscription):
                 pass
         return send_notif
 
-    def _sample_and_notify(self, config):
-        ids = (self._id, config["id"])
-        data = self._get_data(config["path"])
+    def _full_updates(self, config, ids, snapshot):
         currents = set(self._store.list(ids))
         exists = set()
+        updates = []
+        deletes = []
         # Created or updated data nodes.
-        for sub_path, value in data.items():
+        for sub_path, value in snapshot.items():
             exists.add(sub_path)
             if self._should_send_notif(config, ids, sub_path, value):
                 self._store.set(ids, sub_path, value)
-                notif = {
-                    "type": "UPDATE",
-                    "request-id": self._id,
-                    "subscription-id": config["id"],
-                    "path": sub_path,
-                    "json-data": json.dumps(value),
-                }
-                self._send_notification(notif)
+                updates.append((sub_path, value))
         # Deleted data nodes.
         for sub_path in currents - exists:
             try:
                 self._store.delete(ids, sub_path)
             except TelemetryNotExistError:
                 pass
-            notif = {
-                "type": "DELETE",
-                "request-id": self._id,
-                "subscription-id": config["id"],
-                "path": sub_path,
-            }
-            self._send_notification(notif)
-
-    async def _on_change_loop(self, config):
-        while True:
-            # NOTE: We should subscribe state change notifications with the central datastore if it is possible. To do
-            #   it, we need to design the archtecture and implement it into the model server daemons. Until then, we
-            #   will use this polling implementation.
-            await asyncio.sleep(self._update_interval / 1000 / 1000 / 1000)
+            deletes.append(sub_path)
+        return updates, deletes
+
+    def _delta_updates(self, config, ids, snapshot):
+        # NOTE: The store has the previous sample of the snapshot. Only changed leaves need to be updated.
+        positions = snapshot.changed
+        if config["heartbeat-interval"] > 0:
+            now = time.monotonic_ns()
+            times = self._times[config["id"]][1]
+            limit = now - config["heartbeat-interval"]
+            positions = sorted(set(positions).union(expired(times, limit)))
+            for i in positions:
+                times[i] = now
+        updates = []
+        for i in positions:
+            sub_path = snapshot.paths[i]
+            value = snapshot.values[i]
+            self._store.set(ids, sub_path, value)
+            updates.append((sub_path, value))
+        deletes = []
+        for sub_path in snapshot.deleted:
             try:
-                self._sample_and_notify(config)
-            except Exception as e:
-                logger.error(
-                    "Failed to update current state and send notification. %s: %s",
-                    type(e).__name__,
-                    e,
-                )
-
-    async def _sample_loop(self, config):
-        while True:
-            await asyncio.sleep(config["sample-interval"] / 1000 / 1000 / 1000)
+                self._store.delete(ids, sub_path)
+            except TelemetryNotExistError:
+                pass
+            deletes.append(sub_path)
+        return updates, deletes
+
+    def _reset_times(self, sid, ids, snapshot):
+        now = time.monotonic_ns()
+        wall = datetime.now()
+        times = new_times(len(snapshot), now)
+        for i, sub_path in enumerate(snapshot.paths):
             try:
-                self._sample_and_notify(config)
-            except Exception as e:
-                logger.error(
-                    "Failed to update current state and send notification. %s: %s",
-                    type(e).__name__,
-                    e,
-                )
+                age = wall - self._store.get(ids, sub_path)["update-time"]
+            except TelemetryNotExistError:
+                continue
+            times[i] = now - age // timedelta(microseconds=1) * 1000
+        self._times[sid] = (snapshot.layout, times)
+
+    def _notify_data(self, config, snapshot):
+        start = time.monotonic_ns()
+        sid = config["id"]
+        ids = (self._id, sid)
+        suppress_redundant = (
+            config["suppress-redundant"] or config["mode"] == "ON_CHANGE"
+        )
+        heartbeat = config["heartbeat-interval"] > 0
+        # Use the delta of the snapshot if this subscription has processed the previous sample.
+        synced = self._seqs.pop(sid, None) == snapshot.seq - 1
+        if heartbeat:
+            synced = synced and self._times.get(sid, (None,))[0] == snapshot.layout
+        if suppress_redundant and synced:
+            updates, deletes = self._delta_updates(config, ids, snapshot)
+        else:
+            updates, deletes = self._full_updates(config, ids, snapshot)
+            if suppress_redundant and heartbeat:
+                self._reset_times(sid, ids, snapshot)
+        self._seqs[sid] = snapshot.seq
+        diffed = time.monotonic_ns()
+        self._notifications += self._send_updates(sid, updates, deletes)
+        end = time.monotonic_ns()
+        self._diff_time += diffed - start
+        self._notify_time += end - diffed
+        self._notification_rate(end)
 
 
 class OnceSubscription(Subscription):
@@ -394,6 +1254,32 @@ class SubscribeRequestCreatedHandler(SubscribeRequestTypedHandler):
         super().__init__(rid, change)
         self._config = self._change.value
 
+    @classmethod
+    def create_subscription(cls, mode, config, user):
+        """Create a subscription.
+
+        Args:
+            mode (str): Mode of the subscribe-request.
+            config (dict): Configuration data of the subscribe-request.
+            user (dict): User defined data.
+
+        Returns:
+            Subscription: Created subscription.
+
+        Raises:
+            KeyError: The mode is invalid.
+            ValidationFailedError: The configuration is invalid.
+        """
+        return cls.SUBSCRIPTIONS[mode](
+            user["conn"],
+            config,
+            user["telemetry-store"],
+            user["update-interval"],
+            user.get("sampler-registry"),
+            user.get("change-events"),
+            user.get("sampling-scheduler"),
+        )
+
     def validate(self, user):
         try:
             mode = self._config["config"]["mode"]
@@ -402,12 +1288,7 @@ class SubscribeRequestCreatedHandler(SubscribeRequestTypedHandler):
             logger.error(msg)
             raise sysrepo.SysrepoInvalArgError(msg) from e
         try:
-            self._subscription = self.SUBSCRIPTIONS[mode](
-                user["conn"],
-                self._config,
-                user["telemetry-store"],
-                user["update-interval"],
-            )
+            self._subscription = self.create_subscription(mode, self._config, user)
         except KeyError as e:
             msg = f"invalid mode {mode}"
             logger.error(msg)
@@ -450,6 +1331,7 @@ class SubscribeRequestDeletedHandler(SubscribeRequestTypedHandler):
     async def apply(self, user):
         await self._subscription.stop()
         user["subscription-store"].delete(self._id)
+        self._subscription.clear_data()
 
     async def revert(self, user):
         user["subscription-store"].add(self._id, self._subscription)
@@ -506,6 +1388,9 @@ class TelemetryServer(ServerBase):
         subscription_store (store.SubscriptionStore): Datastore for managed subscriptions.
         telemetry_store (store.TelemetryStore): Datastore for telemetry data.
         update_interval (int): Telemetry data update interval in seconds.
+        share_samplers (bool): Share a sampling loop among identical STREAM subscriptions.
+        push_on_change (bool): Detect changes for ON_CHANGE subscriptions by configuration changes and notifications
+            from south daemons instead of polling where possible.
     """
 
     DEFAULT_UPDATE_INTERVAL = 5
@@ -516,17 +1401,69 @@ class TelemetryServer(ServerBase):
         subscription_store,
         telemetry_store,
         update_interval=DEFAULT_UPDATE_INTERVAL,
+        share_samplers=True,
+        push_on_change=True,
     ):
         super().__init__(conn, "goldstone-telemetry")
         self._subscription_store = subscription_store
         self._telemetry_store = telemetry_store
         self._update_interval = update_interval * 1000 * 1000 * 1000
+        self._events = None
+        if push_on_change:
+            self._events = ChangeEventRouter(PathParser(conn.ctx))
+        self._scheduler = SamplingScheduler()
+        self._samplers = None
+        if share_samplers:
+            self._samplers = SamplerRegistry(self._events, self._scheduler)
         self.handlers = {
             "subscribe-requests": {"subscribe-request": SubscribeRequestChangeHandler}
         }
 
+    @staticmethod
+    def _same_config(a, b):
+        return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+    async def _restore_subscriptions(self):
+        saved = self._subscription_store.saved()
+        if len(saved) == 0:
+            return
+        xpath = "/goldstone-telemetry:subscribe-requests/subscribe-request"
+        running = {c["id"]: c for c in self.get_running_data(xpath, default=[])}
+        user = {}
+        self.pre(user)
+        for rid, config in saved.items():
+            self._subscription_store.forget(rid)
+            # Telemetry data of the saved subscription is valid only if its configuration has not been changed.
+            current = running.get(rid)
+            restore = current is not None and self._same_config(current, config)
+            if not restore:
+                subscriptions = config.get("subscriptions", {}).get("subscription", [])
+                for subscription in subscriptions:
+                    ids = (rid, subscription["id"])
+                    for sub_path in list(self._telemetry_store.list(ids)):
+                        self._telemetry_store.delete(ids, sub_path)
+            if current is None:
+                logger.info("Subscribe request %s was deleted while stopped.", rid)
+                continue
+            try:
+                subscription = SubscribeRequestCreatedHandler.create_subscription(
+                    current["config"]["mode"], current, user
+                )
+            except (KeyError, ValidationFailedError) as e:
+                logger.error("Failed to restore subscribe request %s. %s", rid, e)
+                continue
+            self._subscription_store.add(rid, subscription)
+            await subscription.start(restore)
+            logger.info(
+                "Subscribe request %s is restored. resync: %s", rid, not restore
+            )
+
     async def start(self):
         """Start a service."""
+        # NOTE: Subscribe change events first. Samplers of restored subscriptions decide whether to poll by them.
+        if self._events is not None:
+            self._subscribe_change_events()
+        await self._restore_subscriptions()
         tasks = await super().start()
         # NOTE: The sysrepo v1 doesn't support subscriptions to specific "data" instances. It supports subscriptions to
         #   "schema" nodes. So, we should share a subscription to the RPC "/poll" for all POLL mode subscribe requests.
@@ -539,6 +1476,45 @@ class TelemetryServer(ServerBase):
         self.conn.subscribe_rpc_call(xpath, self.poll_cb)
         return tasks
 
+    def _config_modules(self):
+        modules = []
+        for name in self.conn.conn.models:
+            if name == self.conn.module:
+                continue
+            module = self.conn.conn.get_module(name)
+            if not module.implemented():
+                continue
+            for node in module:
+                if node.keyword() == "container" and not node.config_false():
+                    modules.append(name)
+                    break
+        return modules
+
+    def _subscribe_change_events(self):
+        for xpath, notification in ChangeEventRouter.NOTIFICATIONS.items():
+            module = xpath[1:].split(":")[0]
+            try:
+                self.conn.subscribe_notification(
+                    module,
+                    xpath,
+                    self._events.notification_cb,
+                    priv=notification["scope"],
+                )
+            except Exception as e:
+                # The module may not be installed.
+                logger.info("%s is not available as a change event. %s", xpath, e)
+                continue
+            self._events.add_notification(xpath)
+        for module in self._config_modules():
+            try:
+                self.conn.subscribe_module_change_done(
+                    module, self._events.module_change_cb
+                )
+            except Exception as e:
+                logger.info("changes of %s are not available. %s", module, e)
+                continue
+            self._events.add_module(module)
+
     async def stop(self):
         """Stop a service."""
         for rid in self._subscription_store.list():
@@ -551,6 +1527,9 @@ class TelemetryServer(ServerBase):
         user["subscription-store"] = self._subscription_store
         user["telemetry-store"] = self._telemetry_store
         user["update-interval"] = self._update_interval
+        user["sampler-registry"] = self._samplers
+        user["change-events"] = self._events
+        user["sampling-scheduler"] = self._scheduler
 
     async def poll_cb(self, xpath, inputs, event, priv):
         """Callback function for a poll request.
@@ -579,8 +1558,15 @@ class TelemetryServer(ServerBase):
             xpath (str): Full data path of the request.
             priv (any): Private data from the request subscribing.
         """
+        rids = list(self._subscription_store.list())
+        # Build only the requested subscribe-request if the request has its id.
+        req_xpath = list(libyang.xpath_split(xpath))
+        if len(req_xpath) > 1 and req_xpath[1][1] == "subscribe-request":
+            for key, value in req_xpath[1][2]:
+                if key == "id":
+                    rids = [rid for rid in rids if str(rid) == value]
         subscribe_requests = []
-        for rid in self._subscription_store.list():
+        for rid in rids:
             subscription = self._subscription_store.get(rid)
             data = subscription.get_state()
             subscribe_request = {
@@ -592,6 +1578,11 @@ class TelemetryServer(ServerBase):
             }
             if data["updates-only"] is not None:
                 subscribe_request["state"]["updates-only"] = data["updates-only"]
+            if data["bulk-updates"] is not None:
+                subscribe_request["state"]["bulk-updates"] = data["bulk-updates"]
+            for name in StreamSubscription.COSTS:
+                if name in data:
+                    subscribe_request["state"][name] = data[name]
             internal_subscriptions = []
             for internal_subscription_data in data["subscriptions"]:
                 internal_subscription = {
@@ -617,6 +1608,15 @@ class TelemetryServer(ServerBase):
                     internal_subscription["state"][
                         "heartbeat-interval"
                     ] = internal_subscription_data["heartbeat-interval"]
+                if internal_subscription_data["max-sample-interval"] is not None:
+                    internal_subscription["state"][
+                        "max-sample-interval"
+                    ] = internal_subscription_data["max-sample-interval"]
+                for name in Sampler.STATISTICS:
+                    if name in internal_subscription_data:
+                        internal_subscription["state"][
+                            name
+                        ] = internal_subscription_data[name]
                 internal_subscriptions.append(internal_subscription)
             if len(internal_subscriptions) > 0:
                 subscribe_request["subscriptions"] = {
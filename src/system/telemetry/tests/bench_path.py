@@ -0,0 +1,89 @@
+"""Micro-benchmark for path flattening.
+
+It compares PathParser.parse_dict_into_leaves() with a compiled LeafFlattener on a counters tree of 256 interfaces.
+
+    cd src/system/telemetry
+    python -m tests.bench_path
+"""
+
+
+import timeit
+import logging
+import argparse
+from goldstone.lib.connector.sysrepo import Connector
+from goldstone.system.telemetry.path import PathParser
+
+
+logger = logging.getLogger(__name__)
+
+
+COUNTERS = [
+    "in-octets",
+    "in-unicast-pkts",
+    "in-broadcast-pkts",
+    "in-multicast-pkts",
+    "in-discards",
+    "in-errors",
+    "in-unknown-protos",
+    "out-octets",
+    "out-unicast-pkts",
+    "out-broadcast-pkts",
+    "out-multicast-pkts",
+    "out-discards",
+    "out-errors",
+]
+PATH = "/goldstone-interfaces:interfaces/interface/state/counters"
+
+
+def counters_tree(num_interfaces):
+    interfaces = []
+    for i in range(num_interfaces):
+        name = f"Interface1/{i // 4}/{i % 4 + 1}"
+        interfaces.append(
+            {
+                "name": name,
+                "config": {"name": name, "admin-status": "UP"},
+                "state": {
+                    "name": name,
+                    "admin-status": "UP",
+                    "oper-status": "UP",
+                    "counters": {c: i * 1000 + n for n, c in enumerate(COUNTERS)},
+                },
+            }
+        )
+    return {"interfaces": {"interface": interfaces}}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--interfaces", type=int, default=256)
+    parser.add_argument("-n", "--number", type=int, default=20)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    conn = Connector()
+    try:
+        data = counters_tree(args.interfaces)
+        p = PathParser(conn.ctx)
+        flattener = p.compile(PATH)
+        expected = p.parse_dict_into_leaves(data, PATH)
+        assert flattener.flatten(data) == expected
+
+        current = timeit.timeit(
+            lambda: p.parse_dict_into_leaves(data, PATH), number=args.number
+        )
+        compiled = timeit.timeit(lambda: flattener.flatten(data), number=args.number)
+        logger.info(f"interfaces: {args.interfaces}, leaves: {len(expected)}")
+        logger.info(
+            f"parse_dict_into_leaves: {current / args.number * 1000:.3f} ms/sample"
+        )
+        logger.info(
+            f"LeafFlattener.flatten:  {compiled / args.number * 1000:.3f} ms/sample"
+        )
+        logger.info(f"speedup: {current / compiled:.1f}x")
+    finally:
+        conn.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Micro-benchmark for telemetry datastores.
+
+It compares InMemoryTelemetryStore with CompactTelemetryStore on counters of 256 interfaces subscribed by several
+subscriptions. It measures memory to keep the data and time to process a sample.
+
+    cd src/system/telemetry
+    python -m tests.bench_store
+"""
+
+
+import timeit
+import logging
+import argparse
+import tracemalloc
+from goldstone.system.telemetry.store import (
+    InMemoryTelemetryStore,
+    CompactTelemetryStore,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+COUNTERS = [
+    "in-octets",
+    "in-unicast-pkts",
+    "in-broadcast-pkts",
+    "in-multicast-pkts",
+    "in-discards",
+    "in-errors",
+    "in-unknown-protos",
+    "out-octets",
+    "out-unicast-pkts",
+    "out-broadcast-pkts",
+    "out-multicast-pkts",
+    "out-discards",
+    "out-errors",
+]
+
+
+def counter_paths(num_interfaces):
+    paths = []
+    for i in range(num_interfaces):
+        name = f"Interface1/{i // 4}/{i % 4 + 1}"
+        prefix = (
+            f"/goldstone-interfaces:interfaces/interface[name='{name}']/state/counters"
+        )
+        paths.extend(f"{prefix}/{c}" for c in COUNTERS)
+    return paths
+
+
+def fill(store, subscriptions, paths, base):
+    for sid in range(subscriptions):
+        ids = (sid, 0)
+        for n, path in enumerate(paths):
+            store.set(ids, path, base + n)
+
+
+def sample(store, subscriptions, paths, base):
+    # Emulate suppress-redundant: compare with the previous value, then update it.
+    for sid in range(subscriptions):
+        ids = (sid, 0)
+        for n, path in enumerate(paths):
+            value = base + n
+            if store.get(ids, path)["value"] != value:
+                store.set(ids, path, value)
+        store.list(ids)
+
+
+def measure(factory, subscriptions, paths, number):
+    # NOTE: Copy paths as a sampler creates new path strings for each sample.
+    tracemalloc.start()
+    store = factory()
+    fill(store, subscriptions, [str(p + " ")[:-1] for p in paths], 0)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    samples = [[str(p + " ")[:-1] for p in paths] for _ in range(number)]
+    it = iter(enumerate(samples, 1))
+
+    def run():
+        base, copied = next(it)
+        sample(store, subscriptions, copied, base)
+
+    elapsed = timeit.timeit(run, number=number)
+    return memory, elapsed / number
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--interfaces", type=int, default=256)
+    parser.add_argument("-s", "--subscriptions", type=int, default=16)
+    parser.add_argument("-n", "--number", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    paths = counter_paths(args.interfaces)
+    leaves = len(paths) * args.subscriptions
+    logger.info(f"subscriptions: {args.subscriptions}, leaves: {leaves}")
+    results = {}
+    for factory in [InMemoryTelemetryStore, CompactTelemetryStore]:
+        memory, elapsed = measure(factory, args.subscriptions, paths, args.number)
+        results[factory.__name__] = (memory, elapsed)
+        logger.info(
+            f"{factory.__name__ + ':':24} {memory / 1024 / 1024:.1f} MiB, "
+            f"{memory / leaves:.0f} B/leaf, {elapsed * 1000:.1f} ms/sample"
+        )
+    current = results[InMemoryTelemetryStore.__name__]
+    compact = results[CompactTelemetryStore.__name__]
+    logger.info(
+        f"memory: {current[0] / compact[0]:.1f}x smaller, "
+        f"time: {current[1] / compact[1]:.1f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    main()
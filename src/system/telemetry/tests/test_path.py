@@ -52,6 +52,83 @@ class TestPathParser(unittest.TestCase):
         expected = {path + "/name": "Interface1/0/1", path + "/admin-status": "UP"}
         self.assertEqual(parsed_data, expected)
 
+    def test_compile(self):
+        data = {
+            "interfaces": {
+                "interface": [
+                    {
+                        "name": f"Interface1/0/{i}",
+                        "config": {
+                            "name": f"Interface1/0/{i}",
+                            "admin-status": "UP",
+                        },
+                        "state": {
+                            "name": f"Interface1/0/{i}",
+                            "counters": {"in-octets": i, "out-octets": i * 2},
+                        },
+                    }
+                    for i in range(1, 3)
+                ]
+            }
+        }
+        p = PathParser(self.ctx)
+        paths = [
+            "/goldstone-interfaces:interfaces",
+            "/goldstone-interfaces:interfaces/interface/state/counters",
+            "/goldstone-interfaces:interfaces/interface/config/admin-status",
+        ]
+        for path in paths:
+            flattener = p.compile(path)
+            expected = p.parse_dict_into_leaves(data, path)
+            self.assertEqual(flattener.flatten(data), expected)
+            # Cached schema nodes are reused.
+            self.assertEqual(flattener.flatten(data), expected)
+
+        # Entries not matching key predicates are pruned.
+        prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/2']"
+        flattener = p.compile(prefix + "/state/counters")
+        expected = {
+            prefix + "/state/counters/in-octets": 2,
+            prefix + "/state/counters/out-octets": 4,
+        }
+        self.assertEqual(flattener.flatten(data), expected)
+        flattener = p.compile(
+            "/goldstone-interfaces:interfaces/interface[name='Interface1/0/3']"
+        )
+        self.assertEqual(flattener.flatten(data), {})
+
+    def test_compile_nested_list(self):
+        data = {
+            "modules": {
+                "module": [
+                    {
+                        "name": m,
+                        "network-interface": [
+                            {
+                                "name": n,
+                                "state": {"name": n, "output-power": f"{m}-{n}"},
+                            }
+                            for n in ["0", "1"]
+                        ],
+                    }
+                    for m in ["m1", "m2"]
+                ]
+            }
+        }
+        p = PathParser(self.ctx)
+        path = "/goldstone-transponder:modules/module/network-interface/state"
+        self.assertEqual(
+            p.compile(path).flatten(data), p.parse_dict_into_leaves(data, path)
+        )
+
+        prefix = "/goldstone-transponder:modules/module[name='m1']/network-interface[name='0']"
+        flattener = p.compile(prefix + "/state")
+        expected = {
+            prefix + "/state/name": "0",
+            prefix + "/state/output-power": "m1-0",
+        }
+        self.assertEqual(flattener.flatten(data), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for columnar snapshots."""
+
+import unittest
+from goldstone.system.telemetry.snapshot import Snapshot, new_times, expired
+
+
+PREFIX = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/state"
+
+
+def sample(**leaves):
+    return {
+        f"{PREFIX}/{name.replace('_', '-')}": value for name, value in leaves.items()
+    }
+
+
+class TestSnapshot(unittest.TestCase):
+    """Tests for Snapshot."""
+
+    def test_first_sample(self):
+        s = Snapshot()
+        s.update(sample(name="Interface1/0/1", in_octets=1))
+        self.assertEqual(s.seq, 1)
+        self.assertEqual(s.layout, 1)
+        self.assertEqual(s.changed, [0, 1])
+        self.assertEqual(s.deleted, [])
+        self.assertEqual(dict(s.items()), sample(name="Interface1/0/1", in_octets=1))
+
+    def test_numeric_changes(self):
+        s = Snapshot()
+        s.update(sample(in_octets=1, out_octets=2, in_errors=0))
+        s.update(sample(in_octets=1, out_octets=3, in_errors=1))
+        self.assertEqual(s.seq, 2)
+        self.assertEqual(s.layout, 1)
+        self.assertEqual(s.changed, [1, 2])
+        self.assertEqual(s.deleted, [])
+        s.update(sample(in_octets=1, out_octets=3, in_errors=1))
+        self.assertEqual(s.changed, [])
+
+    def test_large_counters(self):
+        s = Snapshot()
+        s.update(sample(in_octets=2**63, out_octets=2**64 - 2))
+        s.update(sample(in_octets=2**63, out_octets=2**64 - 1))
+        self.assertEqual(s.changed, [1])
+
+    def test_mixed_changes(self):
+        s = Snapshot()
+        s.update(sample(oper_status="UP", in_octets=1, enabled=True))
+        s.update(sample(oper_status="DOWN", in_octets=1, enabled=True))
+        self.assertEqual(s.changed, [0])
+        s.update(sample(oper_status="DOWN", in_octets=1, enabled=False))
+        self.assertEqual(s.changed, [2])
+
+    def test_type_changes(self):
+        s = Snapshot()
+        s.update(sample(in_octets=1, out_octets=2))
+        s.update(sample(in_octets=1, out_octets="2"))
+        self.assertEqual(s.changed, [1])
+        s.update(sample(in_octets=1, out_octets=2))
+        self.assertEqual(s.changed, [1])
+        s.update(sample(in_octets=2, out_octets=2))
+        self.assertEqual(s.changed, [0])
+
+    def test_layout_changes(self):
+        s = Snapshot()
+        s.update(sample(in_octets=1, out_octets=2))
+        s.update(sample(in_octets=1, in_errors=0))
+        self.assertEqual(s.layout, 2)
+        self.assertEqual(s.changed, [1])
+        self.assertEqual(s.deleted, [f"{PREFIX}/out-octets"])
+        s.update({})
+        self.assertEqual(s.layout, 3)
+        self.assertEqual(s.changed, [])
+        self.assertEqual(s.deleted, [f"{PREFIX}/in-octets", f"{PREFIX}/in-errors"])
+
+    def test_times(self):
+        times = new_times(3, 10)
+        self.assertEqual(expired(times, 10), [])
+        times[1] = 5
+        self.assertEqual(expired(times, 10), [1])
+        self.assertEqual(expired(times, 11), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
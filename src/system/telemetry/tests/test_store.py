@@ -1,14 +1,21 @@
 """Tests for datastores."""
 
 import unittest
+import unittest.mock
+import asyncio
 import datetime
+import os
+import tempfile
 from goldstone.lib.connector.sysrepo import Connector
 from goldstone.system.telemetry.store import (
     InMemoryTelemetryStore,
+    CompactTelemetryStore,
+    SqliteTelemetryStore,
     TelemetryNotExistError,
     InMemorySubscriptionStore,
     SubscriptionExistError,
     SubscriptionNotExistError,
+    SqliteSubscriptionStore,
 )
 from goldstone.system.telemetry.telemetry import Subscription
 
@@ -78,6 +85,170 @@ class TestInMemoryTelemetryStore(unittest.TestCase):
             ts.get(ids, path)
 
 
+class TestCompactTelemetryStore(unittest.TestCase):
+    """Tests for CompactTelemetryStore."""
+
+    PATH_PREFIX = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+
+    def test_set(self):
+        ts = CompactTelemetryStore()
+        ids = (1, 1)
+        path = self.PATH_PREFIX + "/config/admin-status"
+        # Create an entry.
+        self.assertFalse(path in ts.list(ids))
+        # NOTE: update-time is converted from a monotonic clock. Allow a small error.
+        before = datetime.datetime.now() - datetime.timedelta(milliseconds=1)
+        ts.set(ids, path, "UP")
+        after = datetime.datetime.now() + datetime.timedelta(milliseconds=1)
+        self.assertTrue(path in ts.list(ids))
+        stored_telemetry = ts.get(ids, path)
+        self.assertEqual(stored_telemetry["value"], "UP")
+        self.assertTrue(before <= stored_telemetry["update-time"] <= after)
+        # Update an entry.
+        ts.set(ids, path, "DOWN")
+        self.assertEqual(list(ts.list(ids)), [path])
+        self.assertEqual(ts.get(ids, path)["value"], "DOWN")
+
+    def test_delete(self):
+        ts = CompactTelemetryStore()
+        ids = (1, 1)
+        paths = [self.PATH_PREFIX + f"/config/{name}" for name in ["a", "b", "c"]]
+        for i, path in enumerate(paths):
+            ts.set(ids, path, i)
+        ts.delete(ids, paths[0])
+        self.assertEqual(sorted(ts.list(ids)), paths[1:])
+        for i, path in enumerate(paths[1:], 1):
+            self.assertEqual(ts.get(ids, path)["value"], i)
+        for path in paths[1:]:
+            ts.delete(ids, path)
+        self.assertEqual(list(ts.list(ids)), [])
+        with self.assertRaises(TelemetryNotExistError):
+            ts.delete(ids, paths[0])
+
+    def test_get_not_exist(self):
+        ts = CompactTelemetryStore()
+        path = self.PATH_PREFIX + "/config/admin-status"
+        with self.assertRaises(TelemetryNotExistError):
+            ts.get((1, 1), path)
+        ts.set((1, 1), path, "UP")
+        with self.assertRaises(TelemetryNotExistError):
+            ts.get((1, 2), path)
+
+    def test_intern(self):
+        ts = CompactTelemetryStore()
+        path = self.PATH_PREFIX + "/config/admin-status"
+        ts.set((1, 1), path, "UP")
+        ts.set((2, 1), path, "DOWN")
+        self.assertEqual(len(ts._paths), 1)
+        self.assertEqual(ts.get((1, 1), path)["value"], "UP")
+        self.assertEqual(ts.get((2, 1), path)["value"], "DOWN")
+        ts.delete((1, 1), path)
+        self.assertEqual(ts.get((2, 1), path)["value"], "DOWN")
+        ts.delete((2, 1), path)
+        self.assertEqual(ts._pids, {})
+        # A released path ID is reused.
+        ts.set((1, 1), self.PATH_PREFIX + "/config/name", "Interface1/0/1")
+        self.assertEqual(len(ts._paths), 1)
+
+
+class TestSqliteTelemetryStore(unittest.TestCase):
+    """Tests for SqliteTelemetryStore."""
+
+    PATH_PREFIX = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_restore(self):
+        ids = (1, 1)
+        admin_status = self.PATH_PREFIX + "/config/admin-status"
+        name = self.PATH_PREFIX + "/config/name"
+        ts = SqliteTelemetryStore(self.path)
+        ts.set(ids, admin_status, "UP")
+        ts.set(ids, name, "Interface1/0/1")
+        ts.set(ids, admin_status, "DOWN")
+        ts.delete(ids, name)
+        update_time = ts.get(ids, admin_status)["update-time"]
+        ts.close()
+
+        ts = SqliteTelemetryStore(self.path)
+        self.assertEqual(list(ts.list(ids)), [admin_status])
+        stored_telemetry = ts.get(ids, admin_status)
+        self.assertEqual(stored_telemetry["value"], "DOWN")
+        diff = stored_telemetry["update-time"] - update_time
+        self.assertLess(abs(diff.total_seconds()), 0.01)
+        with self.assertRaises(TelemetryNotExistError):
+            ts.get(ids, name)
+        ts.close()
+
+    def test_batch(self):
+        ids = (1, 1)
+        paths = [self.PATH_PREFIX + f"/state/counters/c{i}" for i in range(100)]
+        ts = SqliteTelemetryStore(self.path)
+        flushes = []
+        flush = ts.flush
+
+        def counting_flush():
+            flushes.append(len(ts._pending))
+            flush()
+
+        ts.flush = counting_flush
+
+        async def sample():
+            for i, path in enumerate(paths):
+                ts.set(ids, path, i)
+            await asyncio.sleep(0)
+
+        asyncio.run(sample())
+        # All writes in a tick are written in a transaction.
+        self.assertEqual(flushes, [len(paths)])
+        ts.close()
+        ts = SqliteTelemetryStore(self.path)
+        self.assertEqual(sorted(ts.list(ids)), sorted(paths))
+        ts.close()
+
+
+class TestSqliteSubscriptionStore(unittest.TestCase):
+    """Tests for SqliteSubscriptionStore."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_saved(self):
+        subscription = unittest.mock.Mock()
+        subscription.config = {"id": 1, "config": {"id": 1, "mode": "STREAM"}}
+        ss = SqliteSubscriptionStore(self.path)
+        self.assertEqual(ss.saved(), {})
+        ss.add(1, subscription)
+        ss.add(2, subscription)
+        ss.delete(2)
+        ss.close()
+
+        ss = SqliteSubscriptionStore(self.path)
+        self.assertEqual(ss.list(), [])
+        self.assertEqual(ss.saved(), {1: subscription.config})
+        # A restored subscription is not a saved one anymore.
+        ss.add(1, subscription)
+        self.assertEqual(ss.saved(), {})
+        self.assertEqual(ss.list(), [1])
+        ss.close()
+
+        ss = SqliteSubscriptionStore(self.path)
+        ss.forget(1)
+        ss.close()
+        ss = SqliteSubscriptionStore(self.path)
+        self.assertEqual(ss.saved(), {})
+        ss.close()
+
+
 class TestInMemorySubscriptionStore(unittest.TestCase):
     """Tests for InMemorySubscriptionStore."""
 
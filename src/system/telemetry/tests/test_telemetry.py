@@ -2,6 +2,7 @@
 
 
 import unittest
+import unittest.mock
 import asyncio
 import logging
 import time
@@ -13,7 +14,12 @@ from goldstone.system.telemetry.store import (
     InMemorySubscriptionStore,
     InMemoryTelemetryStore,
 )
-from goldstone.system.telemetry.telemetry import TelemetryServer
+from goldstone.system.telemetry.telemetry import (
+    TelemetryServer,
+    ChangeEventRouter,
+    SamplingScheduler,
+    Sampler,
+)
 
 
 class MockGSServer(ServerBase):
@@ -107,6 +113,11 @@ def config_subscription(sess, params):
             f"/goldstone-telemetry:subscribe-requests/subscribe-request[id='{rid}']/config/updates-only",
             params["updates-only"],
         )
+    if params.get("bulk-updates") is not None:
+        sess.set_item(
+            f"/goldstone-telemetry:subscribe-requests/subscribe-request[id='{rid}']/config/bulk-updates",
+            params["bulk-updates"],
+        )
     for subscription in params["subscriptions"]:
         sid = subscription["id"]
         sess.set_item(
@@ -144,9 +155,75 @@ def config_subscription(sess, params):
                 f"/subscription[id='{sid}']/config/heartbeat-interval",
                 subscription["heartbeat-interval"],
             )
+        if subscription.get("max-sample-interval") is not None:
+            sess.set_item(
+                f"/goldstone-telemetry:subscribe-requests/subscribe-request[id='{rid}']/subscriptions"
+                f"/subscription[id='{sid}']/config/max-sample-interval",
+                subscription["max-sample-interval"],
+            )
     sess.apply_changes()
 
 
+class TestChangeEventRouter(unittest.TestCase):
+    """Tests for ChangeEventRouter."""
+
+    def test_covers(self):
+        parser = unittest.mock.Mock()
+        parser.is_config_path.side_effect = lambda path: "/config" in path
+        events = ChangeEventRouter(parser)
+        prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+        config = prefix + "/config/admin-status"
+        oper_status = prefix + "/state/oper-status"
+
+        # Paths are polled until their sources of change events are subscribed.
+        self.assertFalse(events.covers(config))
+        self.assertFalse(events.covers(oper_status))
+
+        events.add_module("goldstone-interfaces")
+        self.assertTrue(events.covers(config))
+        self.assertFalse(events.covers(oper_status))
+
+        events.add_notification(
+            "/goldstone-interfaces:interface-link-state-notify-event"
+        )
+        self.assertTrue(events.covers(oper_status))
+        self.assertFalse(events.covers(prefix + "/state/counters/in-octets"))
+
+
+class TestSamplingScheduler(unittest.TestCase):
+    """Tests for SamplingScheduler."""
+
+    def test_shared_sample_costs(self):
+        path = "/goldstone-interfaces:interfaces/interface/state/counters"
+        interval = 10 * 1000 * 1000 * 1000
+        conn = unittest.mock.Mock()
+        conn.get_operational.return_value = {}
+        scheduler = SamplingScheduler()
+        scheduler._origin = 0
+        samplers = []
+        for fan_out_time in [0.05, 0]:
+            sampler = Sampler(conn, path, interval, scheduler=scheduler)
+            sampler._flattener = unittest.mock.Mock()
+            sampler._flattener.flatten.return_value = {path + "/in-octets": 1}
+            sampler._subscribers[0] = lambda _, t=fan_out_time: time.sleep(t)
+            sampler.record = unittest.mock.Mock()
+            scheduler._push([0, 0, sampler])
+            samplers.append(sampler)
+
+        scheduler._run_due()
+
+        # Both samplers share one read, and both account its cost.
+        self.assertEqual(conn.get_operational.call_count, 1)
+        for sampler in samplers:
+            self.assertEqual(sampler.leaves, 1)
+            self.assertGreater(sampler.retrieve_time, 0)
+        self.assertEqual(samplers[0].retrieve_time, samplers[1].retrieve_time)
+        # The fan-out of the first sampler is not counted for the second one.
+        elapsed = [sampler.record.call_args[0][2] for sampler in samplers]
+        self.assertGreater(elapsed[0], 50 * 1000 * 1000)
+        self.assertLess(elapsed[1], 50 * 1000 * 1000)
+
+
 class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
     """Tests for TelemetryServer."""
 
@@ -285,6 +362,14 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                                         "id": params["id"],
                                         "mode": params["mode"],
                                         "updates-only": params["updates-only"],
+                                        "leaves": 0,
+                                        "retrieve-time": 0,
+                                        "flatten-time": 0,
+                                        "diff-time": 0,
+                                        "notify-time": 0,
+                                        "notifications": 0,
+                                        "notification-rate": 0,
+                                        "overruns": 0,
                                     },
                                     "subscriptions": {
                                         "subscription": [
@@ -317,6 +402,10 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                                                     "heartbeat-interval": s[
                                                         "heartbeat-interval"
                                                     ],
+                                                    "samples": 0,
+                                                    "missed-deadlines": 0,
+                                                    "last-jitter": 0,
+                                                    "max-jitter": 0,
                                                 },
                                             }
                                         ]
@@ -451,6 +540,14 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                                         "id": params["id"],
                                         "mode": params["mode"],
                                         "updates-only": params["updates-only"],
+                                        "leaves": 0,
+                                        "retrieve-time": 0,
+                                        "flatten-time": 0,
+                                        "diff-time": 0,
+                                        "notify-time": 0,
+                                        "notifications": 0,
+                                        "notification-rate": 0,
+                                        "overruns": 0,
                                     },
                                     "subscriptions": {
                                         "subscription": [
@@ -476,6 +573,10 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
                                                     "heartbeat-interval": s[
                                                         "heartbeat-interval"
                                                     ],
+                                                    "samples": 0,
+                                                    "missed-deadlines": 0,
+                                                    "last-jitter": 0,
+                                                    "max-jitter": 0,
                                                 },
                                             }
                                         ]
@@ -1012,6 +1113,33 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
 
         await self.run_test(test)
 
+    async def test_config_subscription_error_short_max_sample_interval(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/config/admin-status"
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": None,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "SAMPLE",
+                                "sample-interval": 10 * 1000 * 1000 * 1000,
+                                "suppress-redundant": None,
+                                "heartbeat-interval": None,
+                                "max-sample-interval": 5 * 1000 * 1000 * 1000,
+                            }
+                        ],
+                    }
+                    with self.assertRaises(sysrepo.SysrepoCallbackFailedError):
+                        config_subscription(sess, params)
+
+        await self.run_test(test)
+
     async def test_subscribe_container(self):
         def test():
             time.sleep(self.MOCK_WAIT)
@@ -1804,6 +1932,417 @@ class TestTelemetryServer(unittest.IsolatedAsyncioTestCase):
 
         await self.run_test(test)
 
+    async def test_stream_sample_shared_sampler(self):
+        received = []
+
+        def notif_callback(xpath, notif_type, notif, ts, priv):
+            if notif["type"] == "UPDATE":
+                received.append((notif["request-id"], notif["path"]))
+
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Subscribe notification.
+                    sess.subscribe_notification(
+                        "goldstone-telemetry",
+                        "/goldstone-telemetry:telemetry-notify-event",
+                        notif_callback,
+                        asyncio_register=False,
+                    )
+
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add identical subscriptions.
+                    interval = 5 * 1000 * 1000 * 1000
+                    for rid in [1, 2]:
+                        params = {
+                            "id": rid,
+                            "mode": "STREAM",
+                            "updates-only": True,
+                            "subscriptions": [
+                                {
+                                    "id": 1,
+                                    "path": path,
+                                    "mode": "SAMPLE",
+                                    "sample-interval": interval,
+                                    "suppress-redundant": False,
+                                    "heartbeat-interval": None,
+                                }
+                            ],
+                        }
+                        config_subscription(sess, params)
+                    self.assertEqual(len(self.server._samplers), 1)
+
+                    # Both subscriptions receive notifications from the shared sampler.
+                    time.sleep(interval / 1000 / 1000 / 1000 + self.NOTIFICATION_WAIT)
+                    self.assertIn((1, path), received)
+                    self.assertIn((2, path), received)
+
+                    # The sampler stops with the last subscription.
+                    sess.switch_datastore("running")
+                    for rid in [1, 2]:
+                        sess.delete_item(
+                            f"/goldstone-telemetry:subscribe-requests/subscribe-request[id='{rid}']"
+                        )
+                        sess.apply_changes()
+                        expected = 1 if rid == 1 else 0
+                        self.assertEqual(len(self.server._samplers), expected)
+
+        await self.run_test(test)
+
+    async def test_stream_on_change_pushed_by_config_change(self):
+        received = []
+
+        def notif_callback(xpath, notif_type, notif, ts, priv):
+            if notif["type"] == "UPDATE":
+                received.append((notif["path"], notif["json-data"]))
+
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Subscribe notification.
+                    sess.subscribe_notification(
+                        "goldstone-telemetry",
+                        "/goldstone-telemetry:telemetry-notify-event",
+                        notif_callback,
+                        asyncio_register=False,
+                    )
+
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add a subscription.
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": True,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "ON_CHANGE",
+                                "sample-interval": None,
+                                "suppress-redundant": None,
+                                "heartbeat-interval": None,
+                            }
+                        ],
+                    }
+                    config_subscription(sess, params)
+                    time.sleep(self.NOTIFICATION_WAIT)
+
+                    # A configuration path is not polled.
+                    self.assertEqual(len(self.server._samplers), 1)
+                    for sampler in self.server._samplers._samplers.values():
+                        self.assertFalse(sampler.polling)
+
+                    # The change is notified well before the update interval.
+                    sess.switch_datastore("running")
+                    sess.set_item(path, "DOWN")
+                    sess.apply_changes()
+                    time.sleep(self.NOTIFICATION_WAIT * 5)
+                    self.assertEqual(received, [(path, '"DOWN"')])
+
+        await self.run_test(test)
+
+    async def test_stream_bulk_updates(self):
+        received = []
+
+        def notif_callback(xpath, notif_type, notif, ts, priv):
+            received.append(notif)
+
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Subscribe notification.
+                    sess.subscribe_notification(
+                        "goldstone-telemetry",
+                        "/goldstone-telemetry:telemetry-bulk-notify-event",
+                        notif_callback,
+                        asyncio_register=False,
+                    )
+
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path_prefix + "/config/admin-status", "UP")
+                    sess.set_item(path_prefix + "/config/description", "port1")
+                    sess.apply_changes()
+
+                    # Add a subscription.
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": False,
+                        "bulk-updates": True,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path_prefix + "/config",
+                                "mode": "ON_CHANGE",
+                                "sample-interval": None,
+                                "suppress-redundant": None,
+                                "heartbeat-interval": None,
+                            }
+                        ],
+                    }
+                    config_subscription(sess, params)
+
+                    # The initial data is sent as a notification.
+                    time.sleep(self.NOTIFICATION_WAIT)
+                    self.assertEqual(len(received), 1)
+                    self.assertEqual(received[0]["request-id"], 1)
+                    self.assertEqual(received[0]["subscription-id"], 1)
+                    updates = {
+                        update["path"]: update["json-data"]
+                        for update in received[0]["update"]
+                    }
+                    expected = {
+                        path_prefix + "/config/name": '"Interface1/0/1"',
+                        path_prefix + "/config/admin-status": '"UP"',
+                        path_prefix + "/config/description": '"port1"',
+                    }
+                    for path, value in expected.items():
+                        self.assertEqual(updates[path], value)
+                    received.clear()
+
+                    # Changes are sent as a notification.
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/admin-status", "DOWN")
+                    sess.delete_item(path_prefix + "/config/description")
+                    sess.apply_changes()
+                    time.sleep(self.NOTIFICATION_WAIT * 5)
+                    self.assertEqual(len(received), 1)
+                    self.assertEqual(
+                        received[0]["update"],
+                        [
+                            {
+                                "path": path_prefix + "/config/admin-status",
+                                "json-data": '"DOWN"',
+                            }
+                        ],
+                    )
+                    self.assertEqual(
+                        received[0]["delete"], [path_prefix + "/config/description"]
+                    )
+
+        await self.run_test(test)
+
+    async def test_stream_sample_statistics(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add subscriptions for the same path due at the same time.
+                    interval = 5 * 1000 * 1000 * 1000
+                    for rid, suppress_redundant in [(1, False), (2, True)]:
+                        params = {
+                            "id": rid,
+                            "mode": "STREAM",
+                            "updates-only": True,
+                            "subscriptions": [
+                                {
+                                    "id": 1,
+                                    "path": path,
+                                    "mode": "SAMPLE",
+                                    "sample-interval": interval,
+                                    "suppress-redundant": suppress_redundant,
+                                    "heartbeat-interval": None,
+                                }
+                            ],
+                        }
+                        config_subscription(sess, params)
+                    self.assertEqual(len(self.server._samplers), 2)
+                    self.assertEqual(len(self.server._scheduler), 2)
+
+                    # Wait sample interval.
+                    time.sleep(interval / 1000 / 1000 / 1000 + self.NOTIFICATION_WAIT)
+
+                    # Both subscriptions are sampled once without missing deadlines.
+                    sess.switch_datastore("operational")
+                    data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    srs = list(data["subscribe-requests"]["subscribe-request"])
+                    self.assertEqual(len(srs), 2)
+                    for sr in srs:
+                        state = sr["subscriptions"]["subscription"][0]["state"]
+                        self.assertEqual(state["samples"], 1)
+                        self.assertEqual(state["missed-deadlines"], 0)
+                        self.assertLessEqual(state["last-jitter"], state["max-jitter"])
+
+        await self.run_test(test)
+
+    async def test_oper_scoped_subscribe_request(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    path = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']/config/admin-status"
+                    for rid in [1, 2]:
+                        params = {
+                            "id": rid,
+                            "mode": "ONCE",
+                            "updates-only": None,
+                            "subscriptions": [
+                                {
+                                    "id": 1,
+                                    "path": path,
+                                    "mode": None,
+                                    "sample-interval": None,
+                                    "suppress-redundant": None,
+                                    "heartbeat-interval": None,
+                                }
+                            ],
+                        }
+                        config_subscription(sess, params)
+
+                    # Only the requested subscribe-request is built.
+                    sess.switch_datastore("operational")
+                    with unittest.mock.patch.object(
+                        self.ss.get(1), "get_state", side_effect=AssertionError
+                    ):
+                        data = sess.get_data(
+                            "/goldstone-telemetry:subscribe-requests/subscribe-request[id='2']/state"
+                        )
+                    srs = list(data["subscribe-requests"]["subscribe-request"])
+                    self.assertEqual(len(srs), 1)
+                    expected = {"id": 2, "mode": "ONCE", "updates-only": False}
+                    self.assertEqual(srs[0]["state"], expected)
+
+        await self.run_test(test)
+
+    async def test_stream_sample_costs(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add a subscription.
+                    interval = 5 * 1000 * 1000 * 1000
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": True,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "SAMPLE",
+                                "sample-interval": interval,
+                                "suppress-redundant": False,
+                                "heartbeat-interval": None,
+                            }
+                        ],
+                    }
+                    config_subscription(sess, params)
+
+                    # Wait sample interval.
+                    time.sleep(interval / 1000 / 1000 / 1000 + self.NOTIFICATION_WAIT)
+
+                    # Costs of the sample are accounted.
+                    sess.switch_datastore("operational")
+                    data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                    srs = list(data["subscribe-requests"]["subscribe-request"])
+                    self.assertEqual(len(srs), 1)
+                    state = srs[0]["state"]
+                    self.assertEqual(state["leaves"], 1)
+                    self.assertEqual(state["notifications"], 1)
+                    self.assertGreater(state["retrieve-time"], 0)
+                    self.assertGreater(state["diff-time"], 0)
+                    self.assertGreater(state["notify-time"], 0)
+                    self.assertGreater(state["notification-rate"], 0)
+                    self.assertEqual(state["overruns"], 0)
+
+        await self.run_test(test)
+
+    async def test_stream_sample_adaptive(self):
+        def test():
+            time.sleep(self.MOCK_WAIT)
+            with sysrepo.SysrepoConnection() as conn:
+                with conn.start_session() as sess:
+                    # Set initial data.
+                    path_prefix = "/goldstone-interfaces:interfaces/interface[name='Interface1/0/1']"
+                    path = path_prefix + "/config/admin-status"
+                    sess.switch_datastore("running")
+                    sess.set_item(path_prefix + "/config/name", "Interface1/0/1")
+                    sess.set_item(path, "UP")
+                    sess.apply_changes()
+
+                    # Add an adaptive subscription.
+                    interval = 5 * 1000 * 1000 * 1000
+                    params = {
+                        "id": 1,
+                        "mode": "STREAM",
+                        "updates-only": True,
+                        "subscriptions": [
+                            {
+                                "id": 1,
+                                "path": path,
+                                "mode": "SAMPLE",
+                                "sample-interval": interval,
+                                "suppress-redundant": False,
+                                "heartbeat-interval": None,
+                                "max-sample-interval": interval * 4,
+                            }
+                        ],
+                    }
+                    config_subscription(sess, params)
+                    sampler = list(self.server._samplers._samplers.values())[0]
+
+                    def effective_interval():
+                        data = sess.get_data("/goldstone-telemetry:subscribe-requests")
+                        sr = list(data["subscribe-requests"]["subscribe-request"])[0]
+                        state = sr["subscriptions"]["subscription"][0]["state"]
+                        self.assertEqual(state["max-sample-interval"], interval * 4)
+                        return state["effective-interval"]
+
+                    sess.switch_datastore("operational")
+                    self.assertEqual(effective_interval(), interval)
+
+                    # Slow samples stretch the interval up to the ceiling.
+                    sampler.record(0, 0, interval)
+                    self.assertEqual(effective_interval(), interval * 2)
+                    sampler.record(0, 0, interval * 2)
+                    self.assertEqual(effective_interval(), interval * 4)
+                    sampler.record(0, 0, interval * 4)
+                    self.assertEqual(effective_interval(), interval * 4)
+
+                    # Fast samples restore the requested interval step by step.
+                    for expected in [interval * 2, interval]:
+                        for _ in range(sampler.RECOVERY_SAMPLES):
+                            sampler.record(0, 0, 0)
+                        self.assertEqual(effective_interval(), expected)
+
+        await self.run_test(test)
+
 
 if __name__ == "__main__":
     unittest.main()